@@ -9,6 +9,8 @@ import json
 import time
 from datetime import datetime
 
+from question_corpora import corpus_questions
+
 class RealisticIslamicQuestionTester:
     def __init__(self):
         self.base_url = "http://localhost:8080"
@@ -23,87 +25,7 @@ class RealisticIslamicQuestionTester:
         }
         
         # 50 realistic Islamic questions that Muslims actually ask
-        self.realistic_questions = [
-            # Prayer & Worship
-            "Can I pray if I'm bleeding from a cut?",
-            "What if I miss Fajr prayer?",
-            "How do I know which direction to pray?",
-            "Can I pray in my work clothes?",
-            "What should I do if I forget how many rakats I prayed?",
-            "Is it okay to pray with nail polish?",
-            "Can I pray if I have makeup on?",
-            "What if I'm traveling and can't find a clean place to pray?",
-            
-            # Fasting & Ramadan
-            "What if I accidentally eat during fasting?",
-            "Can I take medicine while fasting?",
-            "What if I forget I'm fasting and drink water?",
-            "Do I need to make up missed fasts from last year?",
-            "Can I brush my teeth while fasting?",
-            "What if I'm sick during Ramadan?",
-            "Is it okay to exercise while fasting?",
-            "What if I break my fast early by mistake?",
-            
-            # Family & Relationships
-            "How should I treat my non-Muslim family?",
-            "What if my parents don't approve of my Islamic practices?",
-            "Can I marry someone from a different culture?",
-            "How do I explain Islam to my children?",
-            "What if my spouse doesn't pray?",
-            "How should I handle family conflicts?",
-            "Can I attend non-Muslim family celebrations?",
-            "What if my family doesn't understand my hijab?",
-            
-            # Work & Business
-            "How do I handle riba in my job?",
-            "Can I work in a bank?",
-            "What if my boss asks me to lie?",
-            "How do I maintain Islamic values at work?",
-            "Can I shake hands with the opposite gender?",
-            "What if my company serves alcohol at events?",
-            "How do I handle interest-based loans?",
-            "Can I work on Fridays?",
-            
-            # Modern Life
-            "Is it okay to use social media?",
-            "How do I deal with Islamophobia online?",
-            "Can I listen to music?",
-            "What if my friends drink alcohol?",
-            "How do I maintain modesty in modern society?",
-            "Can I watch movies and TV shows?",
-            "How do I handle dating apps?",
-            "What if I'm invited to a party with alcohol?",
-            
-            # Health & Medical
-            "Can I get a tattoo for medical reasons?",
-            "What if I need a blood transfusion?",
-            "How do I handle medical procedures during Ramadan?",
-            "Can I take birth control?",
-            "What if I need surgery?",
-            "How do I maintain health while fasting?",
-            "Can I use pain medication?",
-            "What if I'm pregnant during Ramadan?",
-            
-            # Education & Learning
-            "How do I study Islam while in school?",
-            "Can I attend a non-Muslim university?",
-            "What if my teacher says something against Islam?",
-            "How do I handle exams during Ramadan?",
-            "Can I study with the opposite gender?",
-            "What if my school serves non-halal food?",
-            "How do I balance Islamic studies with other subjects?",
-            "Can I participate in school sports?",
-            
-            # Community & Society
-            "How do I find a good mosque?",
-            "What if there's no mosque in my area?",
-            "How do I deal with cultural differences in Islam?",
-            "Can I participate in community events?",
-            "What if my neighbors are Islamophobic?",
-            "How do I help new Muslims?",
-            "Can I volunteer at non-Muslim organizations?",
-            "What if my community doesn't understand Islam?"
-        ]
+        self.realistic_questions = corpus_questions('realistic')
     
     def run_realistic_test(self):
         """Run the realistic Islamic questions test"""
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Backend Startup - Deferred Initialization for the DeenBot Backends
+Lets a backend bind its port and answer /health straight away while the
+expensive parts (knowledge engine, NLP models, learning database) are
+built on a background thread. Readiness is reported on /status, and
+/chat answers 503 with Retry-After until the bot is ready.
+"""
+
+import time
+import logging
+import threading
+import importlib.util
+
+STATE_STARTING = 'starting'
+STATE_READY = 'ready'
+STATE_FAILED = 'failed'
+
+# Seconds a client should wait before retrying /chat during startup
+RETRY_AFTER_SECONDS = 1
+
+def modules_available(*names):
+    """Whether every named module can be imported, without importing it"""
+    try:
+        return all(importlib.util.find_spec(name) is not None for name in names)
+    except (ImportError, ValueError):
+        return False
+
+class BackgroundInitializer:
+    """Builds one object on a daemon thread and reports its readiness"""
+
+    def __init__(self, name, boot_started=None):
+        self.name = name
+        self.boot_started = boot_started if boot_started is not None else time.perf_counter()
+        self.state = STATE_STARTING
+        self.instance = None
+        self.error = None
+        self.ready_seconds = None
+        self.details = {}
+        self.ready_event = threading.Event()
+        self.thread = None
+
+    def start(self, factory, on_ready=None):
+        """Call factory() in the background; on_ready(instance) runs once it succeeds"""
+        self.thread = threading.Thread(target=self._run, args=(factory, on_ready),
+                                       name=f"{self.name}-init", daemon=True)
+        self.thread.start()
+        return self
+
+    def _run(self, factory, on_ready):
+        """Build the instance and record the outcome"""
+        try:
+            instance = factory()
+            if on_ready is not None:
+                on_ready(instance)
+            self.instance = instance
+            self.ready_seconds = round(time.perf_counter() - self.boot_started, 4)
+            self.state = STATE_READY
+            logging.info(f"✅ {self.name} ready in {self.ready_seconds * 1000:.0f}ms")
+        except Exception as e:
+            self.error = str(e)
+            self.state = STATE_FAILED
+            logging.error(f"❌ {self.name} initialization failed: {e}")
+        finally:
+            self.ready_event.set()
+
+    @property
+    def ready(self):
+        """Whether the instance is built and usable"""
+        return self.state == STATE_READY
+
+    def wait(self, timeout=None):
+        """Block until initialization finishes; True if it succeeded"""
+        self.ready_event.wait(timeout)
+        return self.ready
+
+    def status(self):
+        """Readiness for /status"""
+        status = {
+            'state': self.state,
+            'ready': self.ready,
+            'ready_seconds': self.ready_seconds,
+            'elapsed_seconds': round(time.perf_counter() - self.boot_started, 4)
+        }
+        if self.error:
+            status['error'] = self.error
+        status.update(self.details)
+        return status
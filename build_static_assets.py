@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Static Asset Build - Precompressed, Fingerprinted Site Output
+Extracts the design CSS and JS shared across the generated pages into
+fingerprinted asset files, rewrites the pages to reference them and emits
+.gz and .br siblings so nginx and the backend can serve them precompressed.
+NO EMOJIS - This is a serious Islamic research application
+"""
+
+import os
+import re
+import gzip
+import shutil
+import hashlib
+import argparse
+
+# Brotli is optional - gzip siblings are always produced
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+BUILD_DIR = 'dist'
+ASSETS_DIR = 'assets'
+
+# Inline blocks shared by at least this many pages are extracted
+MIN_SHARED_PAGES = 2
+
+# Files smaller than this are not worth precompressing
+MIN_COMPRESS_SIZE = 1024
+
+STATIC_EXTENSIONS = ('.css', '.js', '.svg', '.png', '.ico', '.json', '.webmanifest')
+COMPRESSIBLE_EXTENSIONS = ('.html', '.css', '.js', '.svg', '.json', '.webmanifest')
+STATIC_DIRECTORIES = ('icons',)
+
+STYLE_PATTERN = re.compile(r'<style>(.*?)</style>', re.S)
+SCRIPT_PATTERN = re.compile(r'<script>(.*?)</script>', re.S)
+
+def get_all_html_files(source_dir='.'):
+    """Get all HTML pages in the site root"""
+    return sorted(
+        name for name in os.listdir(source_dir)
+        if name.endswith('.html') and os.path.isfile(os.path.join(source_dir, name))
+    )
+
+def fingerprint(content):
+    """Short content hash used in asset filenames"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()[:10]
+
+def find_shared_blocks(pages, pattern, min_pages=MIN_SHARED_PAGES):
+    """Return the inline blocks that appear in at least min_pages pages"""
+    page_counts = {}
+    for content in pages.values():
+        for block in set(pattern.findall(content)):
+            page_counts[block] = page_counts.get(block, 0) + 1
+    return {block for block, count in page_counts.items() if count >= min_pages}
+
+def write_asset(output_dir, prefix, extension, content):
+    """Write a fingerprinted asset and return its site-relative path"""
+    asset_name = f"{prefix}.{fingerprint(content)}{extension}"
+    asset_path = os.path.join(output_dir, ASSETS_DIR, asset_name)
+    os.makedirs(os.path.dirname(asset_path), exist_ok=True)
+    with open(asset_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return f"{ASSETS_DIR}/{asset_name}"
+
+def rewrite_page(content, style_assets, script_assets):
+    """Replace shared inline blocks with references to their asset files"""
+    def replace_style(match):
+        asset = style_assets.get(match.group(1))
+        return f'<link rel="stylesheet" href="{asset}">' if asset else match.group(0)
+
+    def replace_script(match):
+        asset = script_assets.get(match.group(1))
+        return f'<script src="{asset}"></script>' if asset else match.group(0)
+
+    content = STYLE_PATTERN.sub(replace_style, content)
+    return SCRIPT_PATTERN.sub(replace_script, content)
+
+def copy_static_files(source_dir, output_dir):
+    """Copy non-HTML static files the pages depend on"""
+    copied = 0
+    for name in os.listdir(source_dir):
+        source_path = os.path.join(source_dir, name)
+        if os.path.isfile(source_path) and name.endswith(STATIC_EXTENSIONS):
+            shutil.copy2(source_path, os.path.join(output_dir, name))
+            copied += 1
+    for directory in STATIC_DIRECTORIES:
+        source_path = os.path.join(source_dir, directory)
+        if os.path.isdir(source_path):
+            shutil.copytree(source_path, os.path.join(output_dir, directory), dirs_exist_ok=True)
+            copied += 1
+    return copied
+
+def precompress_file(path):
+    """Write .gz and (when available) .br siblings next to a file"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return 0, 0, 0
+
+    # mtime=0 keeps the output byte-identical between builds
+    gzip_data = gzip.compress(data, compresslevel=9, mtime=0)
+    with open(path + '.gz', 'wb') as f:
+        f.write(gzip_data)
+
+    brotli_size = 0
+    if BROTLI_AVAILABLE:
+        brotli_data = brotli.compress(data, quality=11)
+        with open(path + '.br', 'wb') as f:
+            f.write(brotli_data)
+        brotli_size = len(brotli_data)
+
+    return len(data), len(gzip_data), brotli_size
+
+def precompress_tree(output_dir):
+    """Precompress every compressible file in the build output"""
+    totals = [0, 0, 0]
+    for root, _, files in os.walk(output_dir):
+        for name in files:
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                sizes = precompress_file(os.path.join(root, name))
+                for i, size in enumerate(sizes):
+                    totals[i] += size
+    return totals
+
+def build_static_assets(source_dir='.', output_dir=BUILD_DIR, min_pages=MIN_SHARED_PAGES):
+    """Build the precompressed, fingerprinted site into output_dir"""
+
+    print("Building static site assets...")
+    print(f"Source: {os.path.abspath(source_dir)}")
+    print(f"Output: {os.path.abspath(output_dir)}")
+
+    if os.path.isdir(output_dir):
+        shutil.rmtree(output_dir)
+    os.makedirs(output_dir)
+
+    pages = {}
+    for filename in get_all_html_files(source_dir):
+        with open(os.path.join(source_dir, filename), 'r', encoding='utf-8') as f:
+            pages[filename] = f.read()
+
+    shared_styles = find_shared_blocks(pages, STYLE_PATTERN, min_pages)
+    shared_scripts = find_shared_blocks(pages, SCRIPT_PATTERN, min_pages)
+    style_assets = {block: write_asset(output_dir, 'style', '.css', block) for block in shared_styles}
+    script_assets = {block: write_asset(output_dir, 'script', '.js', block) for block in shared_scripts}
+
+    original_bytes = 0
+    rewritten_bytes = 0
+    for filename, content in pages.items():
+        rewritten = rewrite_page(content, style_assets, script_assets)
+        with open(os.path.join(output_dir, filename), 'w', encoding='utf-8') as f:
+            f.write(rewritten)
+        original_bytes += len(content.encode('utf-8'))
+        rewritten_bytes += len(rewritten.encode('utf-8'))
+
+    static_copied = copy_static_files(source_dir, output_dir)
+    raw_total, gzip_total, brotli_total = precompress_tree(output_dir)
+
+    print(f"\nPages rewritten: {len(pages)}")
+    print(f"Shared stylesheets extracted: {len(style_assets)}")
+    print(f"Shared scripts extracted: {len(script_assets)}")
+    print(f"Static files copied: {static_copied}")
+    print(f"HTML bytes: {original_bytes:,} -> {rewritten_bytes:,}")
+    print(f"Precompressed: {raw_total:,} raw -> {gzip_total:,} gzip")
+    if BROTLI_AVAILABLE:
+        print(f"Precompressed: {raw_total:,} raw -> {brotli_total:,} brotli")
+    else:
+        print("Brotli not installed - .br siblings skipped (pip install brotli)")
+
+    return {
+        'pages': len(pages),
+        'stylesheets': sorted(style_assets.values()),
+        'scripts': sorted(script_assets.values()),
+        'html_bytes_before': original_bytes,
+        'html_bytes_after': rewritten_bytes,
+        'compressed_gzip_bytes': gzip_total,
+        'compressed_brotli_bytes': brotli_total
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the precompressed, fingerprinted static site")
+    parser.add_argument('--source', default='.', help="directory containing the generated pages")
+    parser.add_argument('--output', default=BUILD_DIR, help="build output directory")
+    parser.add_argument('--min-pages', type=int, default=MIN_SHARED_PAGES,
+                        help="extract inline blocks shared by at least this many pages")
+    args = parser.parse_args()
+
+    try:
+        build_static_assets(args.source, args.output, args.min_pages)
+    except Exception as e:
+        print(f"Error during static build: {e}")
+        raise SystemExit(1)
@@ -9,7 +9,9 @@ ensuring exact design compliance and comprehensive Islamic content.
 
 import os
 import re
+import argparse
 from pathlib import Path
+from incremental_build import IncrementalPageBuilder
 
 def get_exact_index_page_design():
     """Get the exact design template from the main index page."""
@@ -551,8 +553,8 @@ def generate_content_sections_html(content_structure):
     
     return html_content
 
-def create_page_with_exact_design(title, content_html, filename):
-    """Create a page with the exact design template."""
+def render_page_with_exact_design(title, content_html):
+    """Render a page with the exact design template."""
     template = get_exact_index_page_design()
     
     # Replace the title
@@ -570,13 +572,18 @@ def create_page_with_exact_design(title, content_html, filename):
         content_html
     )
     
-    # Write the file
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(template)
+    return template
+
+def create_page_with_exact_design(title, content_html, filename, builder=None):
+    """Create a page with the exact design template."""
+    builder = builder or IncrementalPageBuilder(__file__)
+    
+    # Re-render only when the template or page content changed
+    status = builder.build(filename, render_page_with_exact_design, title, content_html)
     
-    print(f"✅ Created: {filename}")
+    print(f"✅ Created: {filename} ({status})")
 
-def migrate_all_website_content():
+def migrate_all_website_content(force=False):
     """Migrate all website content to the application format."""
     print("🚀 COMPREHENSIVE CONTENT MIGRATION")
     print("Complete Islamic Study Guide Extended Edition")
@@ -584,13 +591,15 @@ def migrate_all_website_content():
     
     # Get the content structure
     content_structure = get_comprehensive_website_structure()
+    builder = IncrementalPageBuilder(__file__, force=force)
     
     # Create the main content page
     main_content_html = generate_content_sections_html(content_structure)
     create_page_with_exact_design(
         "Complete Islamic Content Database",
         main_content_html,
-        "complete-islamic-content-database.html"
+        "complete-islamic-content-database.html",
+        builder
     )
     
     # Create individual section pages
@@ -600,11 +609,14 @@ def migrate_all_website_content():
         create_page_with_exact_design(
             section['title'],
             section_html,
-            filename
+            filename,
+            builder
         )
     
+    builder.save()
+    
     print("\n🎉 CONTENT MIGRATION COMPLETE!")
-    print(f"📁 Total pages created: {len(content_structure) + 1}")
+    print(f"📁 Total pages created: {len(content_structure) + 1} ({builder.summary()})")
     print("\n📱 All content now follows the exact design policy!")
     print("🔍 Next steps:")
     print("1. Verify all pages display correctly")
@@ -613,4 +625,8 @@ def migrate_all_website_content():
     print("4. Test responsive design on all pages")
 
 if __name__ == "__main__":
-    migrate_all_website_content()
+    parser = argparse.ArgumentParser(description="Migrate all website content to the application format")
+    parser.add_argument('--force', action='store_true', help="re-render every page even if unchanged")
+    args = parser.parse_args()
+    
+    migrate_all_website_content(force=args.force)
@@ -8,58 +8,73 @@ import json
 import logging
 import threading
 import time
-from http.server import HTTPServer, BaseHTTPRequestHandler
+
+# Time-to-ready is measured from here to the end of main()'s setup
+BOOT_STARTED = time.perf_counter()
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import parse_qs, urlparse
 import os
 import re
 from datetime import datetime
 import html
-import requests
-from bs4 import BeautifulSoup
-
-# Import comprehensive Islamic knowledge base
-try:
-    from comprehensive_islamic_knowledge import comprehensive_knowledge
-    COMPREHENSIVE_KNOWLEDGE_AVAILABLE = True
-    logging.info("✅ Comprehensive Islamic knowledge base imported successfully")
-except ImportError:
-    COMPREHENSIVE_KNOWLEDGE_AVAILABLE = False
-    logging.warning("⚠️ Comprehensive knowledge base not available - using fallback knowledge base")
-
-# Import content scanner for instant access to all Islamic knowledge
-try:
-    from content_scanner import content_scanner
-    CONTENT_SCANNER_AVAILABLE = True
-    logging.info("✅ Content scanner imported successfully - instant access to all Islamic knowledge enabled")
-except ImportError:
-    CONTENT_SCANNER_AVAILABLE = False
-    logging.warning("⚠️ Content scanner not available - limited knowledge access")
-
-# Configure comprehensive logging
-try:
-    # Try to use supervisor log directory (production)
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('/var/log/supervisor/deenbot.log'),
-            logging.StreamHandler()
-        ]
-    )
-except FileNotFoundError:
-    # Fall back to console only (local development)
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler()
-        ]
-    )
+
+from request_tracing import traced, span, Trace, server_timing_header, recent_traces, TRACING_ENABLED, DEBUG_ENDPOINTS_ENABLED
+from deenbot_metrics import MetricsRegistry, MetricsHandlerMixin
+from sampling_profiler import profiler, install_signal_handler, DEFAULT_SECONDS as DEFAULT_PROFILE_SECONDS
+from deenbot_logging import setup_logging, sampling_filter
+import knowledge_snapshot
+from backend_startup import BackgroundInitializer, RETRY_AFTER_SECONDS
+from session_results import SessionResults, new_session_id
+from query_context import QueryContext, query_work
+
+# Configure logging before the knowledge imports log; request threads only enqueue records
+setup_logging()
+
+# The knowledge base and content scanner are imported by load_knowledge_engine(),
+# so the server can bind and answer /health before they are built
+comprehensive_knowledge = None
+COMPREHENSIVE_KNOWLEDGE_AVAILABLE = False
+content_scanner = None
+CONTENT_SCANNER_AVAILABLE = False
+_engine_lock = threading.Lock()
+_engine_loaded = False
+
+def load_knowledge_engine():
+    """Import the comprehensive knowledge base and content scanner (once)"""
+    global comprehensive_knowledge, COMPREHENSIVE_KNOWLEDGE_AVAILABLE
+    global content_scanner, CONTENT_SCANNER_AVAILABLE, _engine_loaded
+    with _engine_lock:
+        if _engine_loaded:
+            return
+        
+        # Import comprehensive Islamic knowledge base
+        try:
+            from comprehensive_islamic_knowledge import comprehensive_knowledge
+            COMPREHENSIVE_KNOWLEDGE_AVAILABLE = True
+            logging.info("✅ Comprehensive Islamic knowledge base imported successfully")
+        except ImportError:
+            COMPREHENSIVE_KNOWLEDGE_AVAILABLE = False
+            logging.warning("⚠️ Comprehensive knowledge base not available - using fallback knowledge base")
+        
+        # Import content scanner for instant access to all Islamic knowledge
+        try:
+            from content_scanner import content_scanner
+            CONTENT_SCANNER_AVAILABLE = True
+            logging.info("✅ Content scanner imported successfully - instant access to all Islamic knowledge enabled")
+        except ImportError:
+            CONTENT_SCANNER_AVAILABLE = False
+            logging.warning("⚠️ Content scanner not available - limited knowledge access")
+        
+        _engine_loaded = True
 
 class ComprehensiveDeenBot:
     """Comprehensive Islamic knowledge base with proper references"""
     
     def __init__(self):
+        load_knowledge_engine()
+        if knowledge_snapshot.restore(self, 'deenbot'):
+            return
         self.islamic_knowledge = {
             "islam_basics": {
                 "question": "What is Islam?",
@@ -2265,18 +2280,71 @@ These pillars form the foundation of Islamic practice and are essential for spir
             "sunnah": "**Comprehensive Sunnah Database Available:**\n\nDeenBot has access to Prophet Muhammad's (PBUH) teachings:\n- **Daily practices** and routines\n- **Manners and etiquette** (adab)\n- **Social interactions** and relationships\n- **Business and trade** practices\n- **Family life** and parenting\n- **Health and hygiene** guidance\n- **Spiritual practices** and worship\n\n**Ask any sunnah question:**\n- 'sunnah of [topic]' (e.g., 'sunnah of eating', 'sunnah of sleeping')\n- 'how did prophet muhammad [action]' (e.g., 'how did prophet muhammad pray')\n- 'prophet's guidance on [topic]' (e.g., 'prophet's guidance on anger')\n- 'authentic sunnah about [topic]' (e.g., 'authentic sunnah about marriage')\n\n*All responses include authentic hadith and practical guidance*"
         }
 
-    def get_comprehensive_response(self, user_message):
-        """Provide comprehensive Islamic guidance with proper references"""
+    def answer_follow_up(self, user_message, session_id):
+        """Serve "next source", "all at once" or a collection from the session's cached results
         
-        # Convert to lowercase for matching
-        message_lower = user_message.lower().strip()
+        Returns None when the message is not such a follow-up or the session
+        has nothing cached, so the question is answered normally.
+        """
+        intent = comprehensive_knowledge.classify_follow_up(user_message)
+        if intent is None:
+            return None
+        kind, collection = intent
         
-        logging.info(f"🔍 Processing query: '{user_message}'")
+        if kind == 'collection':
+            cached = follow_up_sessions.results(session_id)
+            if cached is None:
+                return None
+            query, results = cached
+            sources = [result for result in results if comprehensive_knowledge.matches_collection(result, collection)]
+            response = comprehensive_knowledge.format_follow_up_sources(
+                query, sources, 1, len(sources), 0, f"{collection} Sources")
+        else:
+            taken = follow_up_sessions.take(session_id, 1 if kind == 'next' else None)
+            if taken is None:
+                return None
+            query, sources, start, total = taken
+            heading = "Next Source" if kind == 'next' else "All Additional Sources"
+            response = comprehensive_knowledge.format_follow_up_sources(
+                query, sources, start + 1, total, total - start - len(sources), heading)
+        
+        logging.info("✅ Served follow-up (%s) from cached results", kind, extra={'event': 'stage_match'})
+        return {
+            "response": response,
+            "references": ["Authentic Islamic Knowledge Base"],
+            "source": "Additional Islamic Sources - Session Results"
+        }
+    
+    def remember_sources(self, session_id, query, ranked_results):
+        """Keep ranked results whose answer offered more sources, for the session's follow-ups"""
+        if session_id and len(ranked_results) > 1:
+            follow_up_sessions.store(session_id, query, ranked_results)
+    
+    def get_comprehensive_response(self, user_message, session_id=None):
+        """Provide comprehensive Islamic guidance with proper references
+        
+        With a session_id, answers that offer more sources keep their ranked
+        results, and follow-ups for those sources are served from them. Each
+        knowledge search runs at most once per request; stages that need the
+        same search share its result through the request's QueryContext.
+        """
+        
+        # Normalize and tokenize once for every stage
+        query = QueryContext(user_message)
+        message_lower = query.lower
+        
+        logging.info("🔍 Processing query: '%s'", user_message, extra={'event': 'query'})
+        
+        # Follow-up to sources offered earlier in this session: no new search
+        if session_id and COMPREHENSIVE_KNOWLEDGE_AVAILABLE:
+            follow_up = self.answer_follow_up(user_message, session_id)
+            if follow_up:
+                return follow_up
         
         # FIRST: Direct topic matching with priority system (most reliable for hadith)
         matched_topic = self.find_best_topic_match(message_lower)
         if matched_topic and matched_topic in self.islamic_knowledge:
-            logging.info(f"✅ Found direct topic match: {matched_topic}")
+            logging.info("✅ Found direct topic match: %s", matched_topic, extra={'event': 'stage_match'})
             topic_data = self.islamic_knowledge[matched_topic]
             return {
                 "response": topic_data["answer"],
@@ -2285,33 +2353,19 @@ These pillars form the foundation of Islamic practice and are essential for spir
             }
         
         # FIRST-A: Enhanced Islamic topic recognition for ANY Islamic query
-        islamic_query_patterns = {
-            # Fiqh queries - HIGHEST PRIORITY for specific rulings
-            "fiqh": ["fiqh", "ruling", "law", "halal", "haram", "permissible", "forbidden", "juristic", "jurisprudence", "islamic law", "shariah", "sharia", "school", "hanafi", "maliki", "shafi", "hanbali", "inheritance", "marriage", "divorce", "business", "finance", "interest", "riba", "insurance", "food", "dietary", "medical", "health", "contraception", "modesty", "gender", "social media", "technology", "ai", "artificial intelligence", "environment", "criminal", "theft", "justice", "prayer", "salah", "fasting", "sawm", "wudu", "hajj", "zakat", "nikah", "talaq", "mirath", "parenting", "usury", "trade", "commerce", "takaful", "coverage", "eating", "birth control", "haya", "male", "female", "facebook", "instagram", "twitter", "machine learning", "nature", "conservation", "stealing", "fairness", "what is", "what's", "whats", "tell me", "explain", "describe", "how to", "how do", "can i", "is it", "does islam", "what does islam", "what does the quran", "what does the hadith", "what do scholars", "what do the scholars", "is this", "are these", "does this", "do these"],
-            # Hadith queries
-            "hadith": ["hadith", "hadeeth", "hadis", "sunnah", "prophet", "muhammad", "pbuh", "messenger"],
-            # Quran queries - including common surah names
-            "quran": ["quran", "koran", "qur'an", "verse", "surah", "ayah", "tafsir", "tafseer", "al-fatiha", "al-fatiha", "fatiha", "al-baqarah", "al-baqarah", "baqarah", "aal-imran", "aal-imran", "an-nisa", "an-nisa", "nisa", "al-maidah", "al-maidah", "maidah", "al-anam", "al-anam", "anam", "al-araf", "al-araf", "araf", "al-anfal", "al-anfal", "anfal", "at-tawbah", "at-tawbah", "tawbah", "yunus", "hud", "yusuf", "ar-rad", "ar-rad", "rad", "ibrahim", "al-hijr", "al-hijr", "hijr", "an-nahl", "an-nahl", "nahl", "al-isra", "al-isra", "isra", "al-kahf", "al-kahf", "kahf", "maryam", "ta-ha", "ta-ha", "al-anbiya", "al-anbiya", "anbiya", "al-hajj", "al-hajj", "hajj", "al-muminun", "al-muminun", "muminun", "an-nur", "an-nur", "nur", "al-furqan", "al-furqan", "furqan", "ash-shuara", "ash-shuara", "shuara", "an-naml", "an-naml", "naml", "al-qasas", "al-qasas", "qasas", "al-ankabut", "al-ankabut", "ankabut", "ar-rum", "ar-rum", "rum", "luqman", "as-sajdah", "as-sajdah", "sajdah", "al-ahzab", "al-ahzab", "ahzab", "saba", "fatir", "yasin", "yas-sin", "as-saffat", "as-saffat", "saffat", "sad", "az-zumar", "az-zumar", "zumar", "ghafir", "ghafir", "fussilat", "ash-shura", "ash-shura", "shura", "az-zukhruf", "az-zukhruf", "zukhruf", "ad-dukhan", "ad-dukhan", "dukhan", "al-jathiyah", "al-jathiyah", "jathiyah", "al-ahqaf", "al-ahqaf", "ahqaf", "muhammad", "al-fath", "al-fath", "fath", "al-hujurat", "al-hujurat", "hujurat", "qaf", "ad-dhariyat", "ad-dhariyat", "dhariyat", "at-tur", "at-tur", "tur", "an-najm", "an-najm", "najm", "al-qamar", "al-qamar", "qamar", "ar-rahman", "ar-rahman", "rahman", "al-waqiah", "al-waqiah", "waqiah", "al-hadid", "al-hadid", "hadid", "al-mujadilah", "al-mujadilah", "mujadilah", "al-hashr", "al-hashr", "hashr", "al-mumtahanah", "al-mumtahanah", "mumtahanah", "as-saff", "as-saff", "saff", "al-jumuah", "al-jumuah", "jumuah", "al-munafiqun", "al-munafiqun", "munafiqun", "at-taghabun", "at-taghabun", "taghabun", "at-talaq", "at-talaq", "talaq", "at-tahrim", "at-tahrim", "tahrim", "al-mulk", "al-mulk", "mulk", "al-qalam", "al-qalam", "qalam", "al-haqqah", "al-haqqah", "haqqah", "al-maarij", "al-maarij", "maarij", "nuh", "al-jinn", "al-jinn", "jinn", "al-muzzammil", "al-muzzammil", "muzzammil", "al-muddathir", "al-muddathir", "muddathir", "al-qiyamah", "al-qiyamah", "qiyamah", "al-insan", "al-insan", "insan", "al-mursalat", "al-mursalat", "mursalat", "an-naba", "an-naba", "naba", "an-naziat", "an-naziat", "naziat", "abasa", "at-takwir", "at-takwir", "takwir", "al-infitar", "al-infitar", "infitar", "al-mutaffifin", "al-mutaffifin", "mutaffifin", "al-inshiqaq", "al-inshiqaq", "inshiqaq", "al-buruj", "al-buruj", "buruj", "at-tariq", "at-tariq", "tariq", "al-ala", "al-ala", "ala", "al-ghashiyah", "al-ghashashiyah", "ghashiyah", "al-fajr", "al-fajr", "fajr", "al-balad", "al-balad", "balad", "ash-shams", "ash-shams", "shams", "al-layl", "al-layl", "layl", "ad-duha", "ad-duha", "duha", "ash-sharh", "ash-sharh", "sharh", "at-tin", "at-tin", "tin", "al-alaq", "al-alaq", "alaq", "al-qadr", "al-qadr", "qadr", "al-bayyinah", "al-bayyinah", "bayyinah", "az-zalzalah", "az-zalzalah", "zalzalah", "al-adiyat", "al-adiyat", "adiyat", "al-qariah", "al-qariah", "qariah", "at-takathur", "at-takathur", "takathur", "al-asr", "al-asr", "asr", "al-humazah", "al-humazah", "humazah", "al-fil", "al-fil", "fil", "quraysh", "al-maun", "al-maun", "maun", "al-kawthar", "al-kawthar", "kawthar", "al-kafirun", "al-kafirun", "kafirun", "an-nasr", "an-nasr", "nasr", "al-masad", "al-masad", "masad", "al-ikhlas", "al-ikhlas", "ikhlas", "al-falaq", "al-falaq", "falaq", "an-nas", "an-nas", "nas"],
-            # Islamic concepts - LOWEST PRIORITY (general topics)
-            "islamic": ["islam", "muslim", "islamic", "shariah", "sharia", "seerah", "aqeedah", "belief"]
-        }
-        
-        # Check if this is an Islamic query that needs comprehensive response
-        is_islamic_query = False
-        query_category = None
-        
-        for category, patterns in islamic_query_patterns.items():
-            if any(pattern in message_lower for pattern in patterns):
-                is_islamic_query = True
-                query_category = category
-                break
+        query_category = self.classify_islamic_query(message_lower)
+        is_islamic_query = query_category is not None
         
         # FIRST: If this is an Islamic query, prioritize comprehensive knowledge base
         if is_islamic_query and COMPREHENSIVE_KNOWLEDGE_AVAILABLE:
             try:
-                comprehensive_response, comprehensive_source = comprehensive_knowledge.get_comprehensive_response(user_message)
+                with span('first_a'):
+                    comprehensive_response, comprehensive_source, ranked_results = query.once(
+                        'comprehensive', comprehensive_knowledge.get_ranked_comprehensive_response, user_message)
                 if comprehensive_response:
-                    logging.info(f"✅ Found comprehensive Islamic response for {query_category}: {comprehensive_source}")
+                    self.remember_sources(session_id, user_message, ranked_results)
+                    logging.info("✅ Found comprehensive Islamic response for %s: %s", query_category, comprehensive_source,
+                                 extra={'event': 'stage_match'})
                     return {
                         "response": comprehensive_response,
                         "references": ["Authentic Islamic Knowledge Base"],
@@ -2321,12 +2375,14 @@ These pillars form the foundation of Islamic practice and are essential for spir
                 logging.warning(f"⚠️ Comprehensive knowledge base error: {e}")
         
         # SECOND: Handle single-word or short phrase queries with comprehensive multi-source response
-        if len(message_lower.split()) <= 3:  # Single word or short phrase
+        if len(query.tokens) <= 3:  # Single word or short phrase
             if COMPREHENSIVE_KNOWLEDGE_AVAILABLE:
                 try:
-                    comprehensive_response = comprehensive_knowledge.get_comprehensive_multi_source_response(user_message)
+                    comprehensive_response = query.once(
+                        'multi_source', comprehensive_knowledge.get_comprehensive_multi_source_response, user_message)
                     if comprehensive_response:
-                        logging.info(f"✅ Found comprehensive multi-source response for single-word query: {user_message}")
+                        logging.info("✅ Found comprehensive multi-source response for single-word query: %s", user_message,
+                                     extra={'event': 'stage_match'})
                         return {
                             "response": comprehensive_response,
                             "references": ["Multi-Source Islamic Knowledge"],
@@ -2361,9 +2417,15 @@ These pillars form the foundation of Islamic practice and are essential for spir
         # SECOND: Check comprehensive Islamic knowledge base for authentic responses
         if COMPREHENSIVE_KNOWLEDGE_AVAILABLE:
             try:
-                comprehensive_response, comprehensive_source = comprehensive_knowledge.get_comprehensive_response(user_message)
+                # Reuses FIRST-A's search when it already ran for this message
+                with span('second') as second_span:
+                    comprehensive_response, comprehensive_source, ranked_results = query.once(
+                        'comprehensive', comprehensive_knowledge.get_ranked_comprehensive_response, user_message)
+                    second_span.set('reused', query.saved > 0)
                 if comprehensive_response:
-                    logging.info(f"✅ Found comprehensive response in Islamic knowledge base: {comprehensive_source}")
+                    self.remember_sources(session_id, user_message, ranked_results)
+                    logging.info("✅ Found comprehensive response in Islamic knowledge base: %s", comprehensive_source,
+                                 extra={'event': 'stage_match'})
                     return {
                         "response": comprehensive_response,
                         "references": ["Authentic Islamic Knowledge Base"],
@@ -2376,9 +2438,10 @@ These pillars form the foundation of Islamic practice and are essential for spir
         # THIRD: Content scanner access to HTML files (filtered for Islamic content only)
         if CONTENT_SCANNER_AVAILABLE:
             try:
-                content_response, content_source = content_scanner.get_comprehensive_response(user_message)
+                content_response, content_source = query.once(
+                    'content_scanner', content_scanner.get_comprehensive_response, user_message)
                 if content_response:
-                    logging.info(f"✅ Found relevant content from scanner: {content_source}")
+                    logging.info("✅ Found relevant content from scanner: %s", content_source, extra={'event': 'stage_match'})
                     return {
                         "response": content_response,
                         "references": ["Islamic Content Scanner"],
@@ -2388,14 +2451,14 @@ These pillars form the foundation of Islamic practice and are essential for spir
                 logging.warning(f"⚠️ Content scanner error: {e}")
         
         # FOURTH: Enhanced knowledge base search
-        for topic, content in self.enhanced_knowledge.items():
-            if any(word in message_lower for word in topic.lower().split()):
-                logging.info(f"✅ Found enhanced knowledge match: {topic}")
-                return {
-                    "response": content,
-                    "references": ["Enhanced Islamic Knowledge Base"],
-                    "source": f"Enhanced Knowledge - {topic}"
-                }
+        topic = self.find_enhanced_knowledge_match(message_lower)
+        if topic:
+            logging.info("✅ Found enhanced knowledge match: %s", topic, extra={'event': 'stage_match'})
+            return {
+                "response": self.enhanced_knowledge[topic],
+                "references": ["Enhanced Islamic Knowledge Base"],
+                "source": f"Enhanced Knowledge - {topic}"
+            }
         
         # FIFTH: For non-Islamic queries, provide actual answers with online warning
         non_islamic_keywords = [
@@ -2479,10 +2542,38 @@ Just ask me any question, and I'll provide comprehensive guidance with proper re
     
 
     
+    @traced('classify')
+    def classify_islamic_query(self, message_lower):
+        """Category of an Islamic query (fiqh, hadith, quran, islamic), or None"""
+        islamic_query_patterns = {
+            # Fiqh queries - HIGHEST PRIORITY for specific rulings
+            "fiqh": ["fiqh", "ruling", "law", "halal", "haram", "permissible", "forbidden", "juristic", "jurisprudence", "islamic law", "shariah", "sharia", "school", "hanafi", "maliki", "shafi", "hanbali", "inheritance", "marriage", "divorce", "business", "finance", "interest", "riba", "insurance", "food", "dietary", "medical", "health", "contraception", "modesty", "gender", "social media", "technology", "ai", "artificial intelligence", "environment", "criminal", "theft", "justice", "prayer", "salah", "fasting", "sawm", "wudu", "hajj", "zakat", "nikah", "talaq", "mirath", "parenting", "usury", "trade", "commerce", "takaful", "coverage", "eating", "birth control", "haya", "male", "female", "facebook", "instagram", "twitter", "machine learning", "nature", "conservation", "stealing", "fairness", "what is", "what's", "whats", "tell me", "explain", "describe", "how to", "how do", "can i", "is it", "does islam", "what does islam", "what does the quran", "what does the hadith", "what do scholars", "what do the scholars", "is this", "are these", "does this", "do these"],
+            # Hadith queries
+            "hadith": ["hadith", "hadeeth", "hadis", "sunnah", "prophet", "muhammad", "pbuh", "messenger"],
+            # Quran queries - including common surah names
+            "quran": ["quran", "koran", "qur'an", "verse", "surah", "ayah", "tafsir", "tafseer", "al-fatiha", "al-fatiha", "fatiha", "al-baqarah", "al-baqarah", "baqarah", "aal-imran", "aal-imran", "an-nisa", "an-nisa", "nisa", "al-maidah", "al-maidah", "maidah", "al-anam", "al-anam", "anam", "al-araf", "al-araf", "araf", "al-anfal", "al-anfal", "anfal", "at-tawbah", "at-tawbah", "tawbah", "yunus", "hud", "yusuf", "ar-rad", "ar-rad", "rad", "ibrahim", "al-hijr", "al-hijr", "hijr", "an-nahl", "an-nahl", "nahl", "al-isra", "al-isra", "isra", "al-kahf", "al-kahf", "kahf", "maryam", "ta-ha", "ta-ha", "al-anbiya", "al-anbiya", "anbiya", "al-hajj", "al-hajj", "hajj", "al-muminun", "al-muminun", "muminun", "an-nur", "an-nur", "nur", "al-furqan", "al-furqan", "furqan", "ash-shuara", "ash-shuara", "shuara", "an-naml", "an-naml", "naml", "al-qasas", "al-qasas", "qasas", "al-ankabut", "al-ankabut", "ankabut", "ar-rum", "ar-rum", "rum", "luqman", "as-sajdah", "as-sajdah", "sajdah", "al-ahzab", "al-ahzab", "ahzab", "saba", "fatir", "yasin", "yas-sin", "as-saffat", "as-saffat", "saffat", "sad", "az-zumar", "az-zumar", "zumar", "ghafir", "ghafir", "fussilat", "ash-shura", "ash-shura", "shura", "az-zukhruf", "az-zukhruf", "zukhruf", "ad-dukhan", "ad-dukhan", "dukhan", "al-jathiyah", "al-jathiyah", "jathiyah", "al-ahqaf", "al-ahqaf", "ahqaf", "muhammad", "al-fath", "al-fath", "fath", "al-hujurat", "al-hujurat", "hujurat", "qaf", "ad-dhariyat", "ad-dhariyat", "dhariyat", "at-tur", "at-tur", "tur", "an-najm", "an-najm", "najm", "al-qamar", "al-qamar", "qamar", "ar-rahman", "ar-rahman", "rahman", "al-waqiah", "al-waqiah", "waqiah", "al-hadid", "al-hadid", "hadid", "al-mujadilah", "al-mujadilah", "mujadilah", "al-hashr", "al-hashr", "hashr", "al-mumtahanah", "al-mumtahanah", "mumtahanah", "as-saff", "as-saff", "saff", "al-jumuah", "al-jumuah", "jumuah", "al-munafiqun", "al-munafiqun", "munafiqun", "at-taghabun", "at-taghabun", "taghabun", "at-talaq", "at-talaq", "talaq", "at-tahrim", "at-tahrim", "tahrim", "al-mulk", "al-mulk", "mulk", "al-qalam", "al-qalam", "qalam", "al-haqqah", "al-haqqah", "haqqah", "al-maarij", "al-maarij", "maarij", "nuh", "al-jinn", "al-jinn", "jinn", "al-muzzammil", "al-muzzammil", "muzzammil", "al-muddathir", "al-muddathir", "muddathir", "al-qiyamah", "al-qiyamah", "qiyamah", "al-insan", "al-insan", "insan", "al-mursalat", "al-mursalat", "mursalat", "an-naba", "an-naba", "naba", "an-naziat", "an-naziat", "naziat", "abasa", "at-takwir", "at-takwir", "takwir", "al-infitar", "al-infitar", "infitar", "al-mutaffifin", "al-mutaffifin", "mutaffifin", "al-inshiqaq", "al-inshiqaq", "inshiqaq", "al-buruj", "al-buruj", "buruj", "at-tariq", "at-tariq", "tariq", "al-ala", "al-ala", "ala", "al-ghashiyah", "al-ghashashiyah", "ghashiyah", "al-fajr", "al-fajr", "fajr", "al-balad", "al-balad", "balad", "ash-shams", "ash-shams", "shams", "al-layl", "al-layl", "layl", "ad-duha", "ad-duha", "duha", "ash-sharh", "ash-sharh", "sharh", "at-tin", "at-tin", "tin", "al-alaq", "al-alaq", "alaq", "al-qadr", "al-qadr", "qadr", "al-bayyinah", "al-bayyinah", "bayyinah", "az-zalzalah", "az-zalzalah", "zalzalah", "al-adiyat", "al-adiyat", "adiyat", "al-qariah", "al-qariah", "qariah", "at-takathur", "at-takathur", "takathur", "al-asr", "al-asr", "asr", "al-humazah", "al-humazah", "humazah", "al-fil", "al-fil", "fil", "quraysh", "al-maun", "al-maun", "maun", "al-kawthar", "al-kawthar", "kawthar", "al-kafirun", "al-kafirun", "kafirun", "an-nasr", "an-nasr", "nasr", "al-masad", "al-masad", "masad", "al-ikhlas", "al-ikhlas", "ikhlas", "al-falaq", "al-falaq", "falaq", "an-nas", "an-nas", "nas"],
+            # Islamic concepts - LOWEST PRIORITY (general topics)
+            "islamic": ["islam", "muslim", "islamic", "shariah", "sharia", "seerah", "aqeedah", "belief"]
+        }
+        
+        for category, patterns in islamic_query_patterns.items():
+            if any(pattern in message_lower for pattern in patterns):
+                return category
+        return None
+    
+    @traced('enhanced_knowledge')
+    def find_enhanced_knowledge_match(self, message_lower):
+        """First enhanced knowledge topic sharing a word with the message, or None"""
+        for topic in self.enhanced_knowledge:
+            if any(word in message_lower for word in topic.lower().split()):
+                return topic
+        return None
+    
+    @traced('topic_match')
     def find_best_topic_match(self, message_lower):
         """Find the best topic match using priority-based keyword matching"""
         
-        logging.info(f"🔍 Searching for topic match in: '{message_lower}'")
+        logging.info("🔍 Searching for topic match in: '%s'", message_lower, extra={'event': 'topic_search'})
         
         # Enhanced priority matching for specific topics with flexible word matching
         priority_keywords = {
@@ -3181,6 +3272,7 @@ Just ask me any question, and I'll provide comprehensive guidance with proper re
         
         return None
 
+    @traced('online_answer')
     def get_online_answer_with_warning(self, user_message):
         """Provide actual answers for non-Islamic queries with online warning"""
         message_lower = user_message.lower()
@@ -3693,9 +3785,93 @@ This information was compiled from general knowledge and may not be current or c
             "source": "Online Search with Verification Warning"
         }
 
-class DeenBotHandler(BaseHTTPRequestHandler):
+# Precompressed static siblings in order of preference
+PRECOMPRESSED_ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+# Site built by build_static_assets.py; files are served from it when it exists
+STATIC_BUILD_DIR = os.environ.get('DEENBOT_STATIC_DIR', 'dist')
+
+# Fingerprinted assets within the built site, cached as immutable
+STATIC_ASSETS_PREFIX = 'assets/'
+
+def resolve_static_file(filename):
+    """Path to serve for a site-relative filename: the built copy if there is one, else the source file"""
+    built = os.path.join(STATIC_BUILD_DIR, filename)
+    if os.path.isfile(built):
+        return built
+    return filename
+
+def accepted_encodings(header):
+    """{coding: q-value} of an Accept-Encoding header"""
+    accepted = {}
+    for part in header.split(','):
+        coding, _, params = part.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value.strip())
+                except ValueError:
+                    quality = 0.0
+        accepted['gzip' if coding == 'x-gzip' else coding] = quality
+    return accepted
+
+def preferred_encoding(header, encodings):
+    """The acceptable coding of encodings with the highest q-value, ties in the order given; None if none is"""
+    accepted = accepted_encodings(header)
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+# Built in the background by main(); readiness and time-to-ready for /status
+deenbot = None
+startup = BackgroundInitializer('Knowledge engine', BOOT_STARTED)
+
+# Ranked results per chat session, for "next source" / "all at once" follow-ups
+follow_up_sessions = SessionResults()
+
+# Prometheus metrics served from /metrics
+metrics = MetricsRegistry()
+metrics.gauge('content_index_files', "HTML files in the content scanner index",
+              lambda: len(content_scanner.content_index) if CONTENT_SCANNER_AVAILABLE else None)
+metrics.gauge('content_index_sections', "Sections in the content scanner index",
+              lambda: sum(len(data['sections']) for data in list(content_scanner.content_index.values()))
+              if CONTENT_SCANNER_AVAILABLE else None)
+metrics.gauge('follow_up_sessions', "Chat sessions holding cached results for follow-ups",
+              lambda: len(follow_up_sessions))
+metrics.register_cache('follow_up_sessions', follow_up_sessions.stats)
+metrics.register_cache('relevance_words',
+                       lambda: comprehensive_knowledge.scorer.stats()
+                       if COMPREHENSIVE_KNOWLEDGE_AVAILABLE and comprehensive_knowledge.scorer else (0, 0))
+metrics.gauge('knowledge_searches_total', "Knowledge searches computed, per search",
+              lambda: {(name,): count for name, count in query_work.totals()['computed'].items()},
+              label_names=('search',), metric_type='counter')
+metrics.gauge('knowledge_searches_saved_total', "Knowledge searches answered from the request's query context",
+              lambda: {(name,): count for name, count in query_work.totals()['saved'].items()},
+              label_names=('search',), metric_type='counter')
+metrics.gauge('log_records_sampled_out_total', "INFO log records dropped by sampling",
+              lambda: sampling_filter().dropped if sampling_filter() else None, metric_type='counter')
+
+class DeenBotHandler(MetricsHandlerMixin, BaseHTTPRequestHandler):
     """HTTP request handler for DeenBot"""
     
+    metrics = metrics
+    
+    def log_message(self, format, *args):
+        """Access log through the logging queue instead of a blocking stderr write"""
+        logging.info("%s - " + format, self.address_string(), *args, extra={'event': 'access'})
+    
+    def log_error(self, format, *args):
+        """Request errors are never sampled out"""
+        logging.warning("%s - " + format, self.address_string(), *args)
+    
     def do_OPTIONS(self):
         """Handle CORS preflight requests"""
         self.send_response(200)
@@ -3717,19 +3893,21 @@ class DeenBotHandler(BaseHTTPRequestHandler):
             response = {
                 "status": "healthy",
                 "service": "Comprehensive DeenBot Backend",
+                "ready": startup.ready,
                 "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
                 "uptime": time.time() - start_time
             }
             self.wfile.write(json.dumps(response).encode())
             
         elif parsed_url.path == '/status':
-            self.send_response(200)
+            # 503 until the knowledge engine is ready, for readiness probes
+            self.send_response(200 if startup.ready else 503)
             self.send_header('Content-Type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
             
             response = {
-                "status": "operational",
+                "status": "operational" if startup.ready else startup.state,
                 "backend": "Comprehensive Islamic Knowledge Base",
                 "capabilities": [
                     "Quranic references with verse numbers",
@@ -3738,10 +3916,35 @@ class DeenBotHandler(BaseHTTPRequestHandler):
                     "Historical context and explanations",
                     "Practical guidance for daily life"
                 ],
+                "startup": startup.status(),
                 "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
             }
             self.wfile.write(json.dumps(response).encode())
             
+        elif parsed_url.path == '/metrics':
+            self.send_metrics_response()
+            
+        elif parsed_url.path == '/debug/trace' and DEBUG_ENDPOINTS_ENABLED:
+            # Span trees of the most recent traced requests
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            
+            response = {
+                "tracing_enabled": TRACING_ENABLED,
+                "recent_traces": recent_traces.recent()
+            }
+            self.wfile.write(json.dumps(response).encode())
+            
+        elif parsed_url.path == '/debug/profile' and DEBUG_ENDPOINTS_ENABLED:
+            # Whether a sampling profile is running, and the hottest functions of the last one
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(json.dumps(profiler.status()).encode())
+            
         elif parsed_url.path == '/':
             # Serve the main application
             self.serve_static_file('complete-islamic-study-guide-dark.html', 'text/html')
@@ -3749,7 +3952,7 @@ class DeenBotHandler(BaseHTTPRequestHandler):
         elif parsed_url.path.endswith('.html'):
             # Serve HTML files
             filename = parsed_url.path[1:]  # Remove leading slash
-            if os.path.exists(filename):
+            if os.path.exists(resolve_static_file(filename)):
                 self.serve_static_file(filename, 'text/html')
             else:
                 self.send_404_response()
@@ -3757,7 +3960,7 @@ class DeenBotHandler(BaseHTTPRequestHandler):
         elif parsed_url.path.endswith('.css'):
             # Serve CSS files
             filename = parsed_url.path[1:]
-            if os.path.exists(filename):
+            if os.path.exists(resolve_static_file(filename)):
                 self.serve_static_file(filename, 'text/css')
             else:
                 self.send_404_response()
@@ -3765,7 +3968,7 @@ class DeenBotHandler(BaseHTTPRequestHandler):
         elif parsed_url.path.endswith('.js'):
             # Serve JavaScript files
             filename = parsed_url.path[1:]
-            if os.path.exists(filename):
+            if os.path.exists(resolve_static_file(filename)):
                 self.serve_static_file(filename, 'application/javascript')
             else:
                 self.send_404_response()
@@ -3773,7 +3976,7 @@ class DeenBotHandler(BaseHTTPRequestHandler):
         elif parsed_url.path.endswith('.svg'):
             # Serve SVG files
             filename = parsed_url.path[1:]
-            if os.path.exists(filename):
+            if os.path.exists(resolve_static_file(filename)):
                 self.serve_static_file(filename, 'image/svg+xml')
             else:
                 self.send_404_response()
@@ -3783,7 +3986,37 @@ class DeenBotHandler(BaseHTTPRequestHandler):
     
     def do_POST(self):
         """Handle POST requests"""
-        if self.path == '/chat':
+        request_started = time.perf_counter()
+        debug_trace = self.path == '/debug/trace' and DEBUG_ENDPOINTS_ENABLED
+        parsed_url = urlparse(self.path)
+        
+        if parsed_url.path == '/debug/profile' and DEBUG_ENDPOINTS_ENABLED:
+            # Sample the running server for ?seconds=N; results land in profiles/
+            try:
+                seconds = float(parse_qs(parsed_url.query).get('seconds', [DEFAULT_PROFILE_SECONDS])[0])
+            except ValueError:
+                self.send_error_response(400, "seconds must be a number")
+                return
+            started = profiler.start(seconds)
+            self.send_response(202 if started else 409)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            response = dict(profiler.status(), started=started)
+            self.wfile.write(json.dumps(response).encode())
+            
+        elif (self.path == '/chat' or debug_trace) and not startup.ready:
+            self.send_response(503)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Retry-After', str(RETRY_AFTER_SECONDS))
+            self.end_headers()
+            
+            response = {"error": "DeenBot is starting up, please retry shortly", "status_code": 503,
+                        "startup": startup.status()}
+            self.wfile.write(json.dumps(response).encode())
+            
+        elif self.path == '/chat' or debug_trace:
             try:
                 # Get request body
                 content_length = int(self.headers['Content-Length'])
@@ -3796,19 +4029,39 @@ class DeenBotHandler(BaseHTTPRequestHandler):
                 if not user_message:
                     raise ValueError("Message is required")
                 
-                # Get comprehensive response
-                response_data = deenbot.get_comprehensive_response(user_message)
+                # Follow-ups use the session's cached results; clients without a session get one
+                session_id = request_data.get('session_id') or self.headers.get('X-Session-Id')
+                if not isinstance(session_id, str) or not session_id.strip() or len(session_id) > 128:
+                    session_id = new_session_id()
+                
+                # Get comprehensive response, traced when tracing is on or requested
+                trace = None
+                answer_started = time.perf_counter()
+                if TRACING_ENABLED or debug_trace:
+                    with Trace('chat') as trace:
+                        response_data = deenbot.get_comprehensive_response(user_message, session_id)
+                    recent_traces.add(trace, message=user_message[:200], source=response_data['source'])
+                else:
+                    response_data = deenbot.get_comprehensive_response(user_message, session_id)
+                response_data = dict(response_data, session_id=session_id)
+                metrics.observe_source(response_data['source'], time.perf_counter() - answer_started)
+                
+                if debug_trace:
+                    response_data = dict(response_data, trace=trace.to_dict())
                 
                 # Send response
                 self.send_response(200)
                 self.send_header('Content-Type', 'application/json')
                 self.send_header('Access-Control-Allow-Origin', '*')
+                elapsed_ms = self.send_timing_headers(request_started, trace)
                 self.end_headers()
                 
                 self.wfile.write(json.dumps(response_data).encode())
                 
                 # Log the interaction
-                logging.info(f"✅ Chat request processed: '{user_message[:50]}...' -> {response_data['source']}")
+                logging.info("✅ Chat request processed in %.1fms: '%s...' -> %s", elapsed_ms, user_message[:50],
+                             response_data['source'],
+                             extra={'event': 'chat', 'duration_ms': round(elapsed_ms, 2), 'source': response_data['source']})
                 
             except json.JSONDecodeError as e:
                 logging.error(f"❌ JSON decode error: {e}")
@@ -3827,26 +4080,52 @@ class DeenBotHandler(BaseHTTPRequestHandler):
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
             
-            response = {"error": "Endpoint not found", "available_endpoints": ["/health", "/status", "/chat"]}
+            response = {"error": "Endpoint not found", "available_endpoints": ["/health", "/status", "/chat", "/metrics"]}
             self.wfile.write(json.dumps(response).encode())
     
+    def send_timing_headers(self, request_started, trace=None):
+        """Send X-Response-Time, plus the Server-Timing stage breakdown for traced requests"""
+        elapsed_ms = (time.perf_counter() - request_started) * 1000
+        self.send_header('X-Response-Time', f"{elapsed_ms:.2f}ms")
+        if trace is not None:
+            self.send_header('Server-Timing', server_timing_header(trace))
+        self.send_header('Access-Control-Expose-Headers', 'X-Response-Time, Server-Timing')
+        return elapsed_ms
+    
     def serve_static_file(self, filename, content_type):
-        """Serve static files with proper content type"""
+        """Serve a site-relative static file with proper content type, from the built site when present"""
         try:
-            with open(filename, 'rb') as file:
+            path = resolve_static_file(filename)
+            
+            # Prefer a precompressed sibling emitted by build_static_assets.py
+            siblings = {encoding: path + extension for encoding, extension in PRECOMPRESSED_ENCODINGS
+                        if os.path.exists(path + extension)}
+            content_encoding = preferred_encoding(self.headers.get('Accept-Encoding', ''), list(siblings))
+            if content_encoding:
+                path = siblings[content_encoding]
+            
+            with open(path, 'rb') as file:
                 content = file.read()
                 
             self.send_response(200)
             self.send_header('Content-Type', content_type)
             self.send_header('Access-Control-Allow-Origin', '*')
             self.send_header('Content-Length', str(len(content)))
+            self.send_header('Vary', 'Accept-Encoding')
+            if content_encoding:
+                self.send_header('Content-Encoding', content_encoding)
+            if filename.startswith(STATIC_ASSETS_PREFIX) and path != filename:
+                # Fingerprinted assets never change under the same name
+                self.send_header('Cache-Control', 'public, max-age=31536000, immutable')
+            else:
+                self.send_header('Cache-Control', 'no-cache')
             self.end_headers()
             
             self.wfile.write(content)
-            logging.info(f"✅ Served static file: {filename}")
+            logging.info("✅ Served static file: %s", path, extra={'event': 'static_file'})
             
         except FileNotFoundError:
-            logging.warning(f"⚠️ File not found: {filename}")
+            logging.warning("⚠️ File not found: %s", filename)
             self.send_404_response()
         except Exception as e:
             logging.error(f"❌ Error serving file {filename}: {e}")
@@ -3859,7 +4138,7 @@ class DeenBotHandler(BaseHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
         
-        response = {"error": "Resource not found", "available_endpoints": ["/health", "/status", "/chat"]}
+        response = {"error": "Resource not found", "available_endpoints": ["/health", "/status", "/chat", "/metrics"]}
         self.wfile.write(json.dumps(response).encode())
     
     def send_error_response(self, status_code, message):
@@ -3883,27 +4162,38 @@ def monitor_system_resources():
         
         time.sleep(60)  # Check every minute
 
+def set_deenbot(instance):
+    """Publish the bot built by the background initializer"""
+    global deenbot
+    deenbot = instance
+    startup.details['snapshot'] = dict(knowledge_snapshot.load_info)
+
 def main():
     """Main function to start the server"""
-    global start_time, deenbot
+    global start_time
     
     start_time = time.time()
-    deenbot = ComprehensiveDeenBot()
     
     # Start system monitoring in background
     monitor_thread = threading.Thread(target=monitor_system_resources, daemon=True)
     monitor_thread.start()
     
-    # Configure server
+    # kill -USR2 <pid> samples the server for DEENBOT_PROFILE_SECONDS
+    install_signal_handler()
+    
+    # Configure server; bind before building the knowledge engine so /health answers at once
     server_address = ('', 8080)
-    httpd = HTTPServer(server_address, DeenBotHandler)
+    # One thread per connection; request state is per-thread or locked
+    httpd = ThreadingHTTPServer(server_address, DeenBotHandler)
+    startup.start(ComprehensiveDeenBot, on_ready=set_deenbot)
     
     logging.info("🚀 Comprehensive DeenBot Backend starting...")
-    logging.info("📚 Islamic Knowledge Base loaded successfully")
+    logging.info("📚 Islamic Knowledge Base loading in the background")
     logging.info("🌐 Server listening on port 8080")
     logging.info("✅ Health endpoint: /health")
     logging.info("✅ Status endpoint: /status")
     logging.info("✅ Chat endpoint: /chat")
+    logging.info("✅ Metrics endpoint: /metrics")
     
     try:
         httpd.serve_forever()
@@ -4,17 +4,168 @@ Comprehensive Islamic Knowledge Base for DeenBot
 Permanent solution ensuring authentic Islamic responses
 """
 
+import re
+import heapq
 import logging
 from datetime import datetime
 
+from request_tracing import traced
+from knowledge_documents import (build_documents, field_relevance, field_weights, topic_relevance,
+                                 HADITH_FIELD_WEIGHTS, CONTENT_FIELD_WEIGHTS)
+from relevance_scorer import RelevanceScorer, NUMPY_AVAILABLE, SCORED_SOURCES, candidates, top_results
+import knowledge_snapshot
+
+# Sort rank of hadith authentication grades (lower is more authentic)
+AUTHENTICATION_PRIORITY = {
+    'Sahih': 1,
+    'Sahih (Authentic)': 1,
+    'Hasan': 2,
+    'Hasan (Good)': 2,
+    'Da\'if': 3,
+    'Weak': 3,
+    'Mawdu': 4,
+    'Fabricated': 4
+}
+
+# Follow-ups to "Additional Sources Available" served from a session's cached results. The
+# phrase must be the whole message, after an optional "ok" / "please" and "show me" / "give me"
+FOLLOW_UP_NEXT_PHRASES = ('one at a time', 'next', 'next source', 'next one', 'the next one', 'the next source',
+                          'more', 'more sources', 'additional sources', 'another source', 'another one',
+                          "i'm ready for the next one", 'ready for the next one')
+FOLLOW_UP_ALL_PHRASES = ('all at once', 'all', 'all sources', 'all the sources', 'all additional sources',
+                         'all of them', 'everything', 'the rest', 'comprehensive overview')
+FOLLOW_UP_POLITE = r"(?:(?:ok|okay|yes|sure|please) )*"
+FOLLOW_UP_REQUEST = r"(?:show|give|send)(?: me)?"
+FOLLOW_UP_SOURCE_NOUNS = r"(?:sources?|hadiths?|verses?|rulings?|collection|only)"
+
+# First words of a question, which is never a follow-up
+FOLLOW_UP_QUESTION_WORDS = {'what', "what's", 'who', "who's", 'why', 'how', 'when', 'where', 'which', 'is', 'are',
+                            'was', 'were', 'do', 'does', 'did', 'can', 'could', 'should', 'would', 'will'}
+FOLLOW_UP_COLLECTIONS = {
+    'Sahih Bukhari': ('bukhari',),
+    'Sahih Muslim': ('sahih muslim',),
+    'Abu Dawud': ('abu dawud', 'abudawud'),
+    'Tirmidhi': ('tirmidhi',),
+    'Nasai': ('nasai',),
+    'Ibn Majah': ('ibn majah', 'ibnmajah'),
+    'Musnad Ahmad': ('musnad', 'ahmad'),
+    'Quran': ('quran', 'verse'),
+    'Fiqh': ('fiqh',)
+}
+
+def _alternatives(phrases):
+    """Regex group matching any of phrases literally"""
+    return f"(?:{'|'.join(map(re.escape, phrases))})"
+
+def _follow_up_pattern(phrases):
+    """Regex matching one of phrases as the whole follow-up message"""
+    return re.compile(f"{FOLLOW_UP_POLITE}(?:{FOLLOW_UP_REQUEST} )?{_alternatives(phrases)}(?: please)?")
+
+FOLLOW_UP_NEXT = _follow_up_pattern(FOLLOW_UP_NEXT_PHRASES)
+FOLLOW_UP_ALL = _follow_up_pattern(FOLLOW_UP_ALL_PHRASES)
+
+# "show me (the) Sahih Bukhari (sources)" or "(the) Bukhari sources", per collection
+FOLLOW_UP_COLLECTION_PATTERNS = {
+    name: re.compile(
+        f"{FOLLOW_UP_POLITE}(?:{FOLLOW_UP_REQUEST}(?: only)?(?: the)? {collection}(?: {FOLLOW_UP_SOURCE_NOUNS})?"
+        f"|(?:the )?{collection} {FOLLOW_UP_SOURCE_NOUNS})(?: please)?")
+    for name, collection in ((name, _alternatives((name.lower(),) + aliases))
+                             for name, aliases in FOLLOW_UP_COLLECTIONS.items())
+}
+
+# Results shown per source type in the multi-source (single-word) response
+MULTI_SOURCE_SHOWN = 2
+MULTI_SOURCE_HEADINGS = {
+    'hadith': '📚 Hadith & Sunnah',
+    'quran': '📖 Quran & Tafsir',
+    'fiqh': '⚖️ Islamic Law (Fiqh)',
+    'guidance': '💡 Islamic Guidance'
+}
+
+# Matching hadith after which each topic's content scan stops early
+MULTI_SOURCE_HADITH_LIMIT = 4
+
+# Quran results considered, the general overview included
+MULTI_SOURCE_QURAN_LIMIT = 4
+
+QURAN_GENERAL_QUERIES = ('quran', 'koran', 'qur\'an', 'holy book', 'divine book')
+
+# Quran search result for general questions about the Quran itself
+QURAN_GENERAL_RESULT = {
+    'type': 'quran_general',
+    'title': 'The Holy Quran - Divine Revelation',
+    'content': 'The Quran is the holy book of Islam, revealed to Prophet Muhammad (PBUH) over 23 years. It contains 114 Surahs (chapters) with over 6,000 verses covering all aspects of life including faith, worship, morality, law, history, and guidance for humanity.',
+    'source': 'Quran - Divine Revelation',
+    'summary': 'The Quran is the final divine revelation, the word of Allah, and the primary source of Islamic law and guidance.',
+    'verses_count': 'Over 6,000 verses',
+    'surahs_count': 114,
+    'revelation_period': '23 years',
+    'language': 'Arabic'
+}
+
+# Query type whose questions boost each source's relevance
+BOOSTED_QUERY_TYPES = {'hadith': 'hadith', 'quran': 'quran', 'fiqh': 'fiqh', 'guidance': 'islamic'}
+
+# Sources the standard search scores by word; it matches Quran texts by phrase instead
+WORD_SCORED_SOURCES = ('hadith', 'fiqh', 'guidance')
+
+# Query words that mark a question as about hadith, Quran, fiqh or Islamic concepts
+ISLAMIC_QUERY_PATTERNS = {
+    # Hadith patterns
+    'hadith': ['hadith', 'hadeeth', 'hadis', 'sunnah', 'prophet', 'muhammad', 'pbuh', 'messenger', 'narrated', 'narrator'],
+    # Quran patterns
+    'quran': ['quran', 'koran', 'qur\'an', 'verse', 'surah', 'ayah', 'tafsir', 'tafseer', 'chapter', 'revelation'],
+    # Fiqh patterns
+    'fiqh': ['fiqh', 'ruling', 'law', 'halal', 'haram', 'permissible', 'forbidden', 'juristic', 'jurisprudence', 'islamic law'],
+    # Islamic concept patterns
+    'islamic': ['islam', 'muslim', 'islamic', 'shariah', 'sharia', 'seerah', 'aqeedah', 'belief', 'faith', 'religion']
+}
+
+class TopK:
+    """Bounded min-heap of the k best items pushed; on equal scores the earlier item wins"""
+
+    def __init__(self, k):
+        self.k = k
+        self.heap = []
+        self.pushed = 0
+
+    def push(self, score, item):
+        """Offer an item, keeping it only if it is among the k best so far"""
+        entry = (score, -self.pushed, item)
+        self.pushed += 1
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+        elif entry[:2] > self.heap[0][:2]:
+            heapq.heapreplace(self.heap, entry)
+
+    def best_score(self):
+        """Score of the best item kept"""
+        return max(self.heap)[0]
+
+    def scored(self):
+        """(score, item) of the kept items, best first"""
+        return [(score, item) for score, _, item in sorted(self.heap, reverse=True)]
+
+    def results(self):
+        """Kept items, best first"""
+        return [item for _, _, item in sorted(self.heap, reverse=True)]
+
+    def __len__(self):
+        return len(self.heap)
+
 class ComprehensiveIslamicKnowledge:
     """Comprehensive Islamic knowledge base with authentic hadith and Quran"""
     
     def __init__(self):
+        if knowledge_snapshot.restore(self, 'knowledge'):
+            return
         self.hadith_database = self.initialize_hadith_database()
         self.quran_database = self.initialize_quran_database()
         self.fiqh_database = self.initialize_fiqh_database()
         self.islamic_guidance = self.initialize_islamic_guidance()
+        self.documents = build_documents(self.hadith_database, self.quran_database, self.fiqh_database,
+                                         self.islamic_guidance)
+        self.scorer = RelevanceScorer(self.documents) if NUMPY_AVAILABLE else None
         
         logging.info(f"✅ Comprehensive Islamic Knowledge Base initialized")
         logging.info(f"📚 Hadith entries: {len(self.hadith_database)}")
@@ -2864,236 +3015,96 @@ class ComprehensiveIslamicKnowledge:
             }
         }
     
+    @traced('knowledge.search')
     def search_comprehensive_knowledge(self, query, max_results=10):
-        """Search through all Islamic knowledge sources with enhanced pattern matching and error correction"""
+        """Search through all Islamic knowledge sources with enhanced pattern matching"""
         query_lower = query.lower()
-        results = []
-        
-        # Enhanced Islamic query pattern recognition
-        islamic_patterns = {
-            # Hadith patterns
-            'hadith': ['hadith', 'hadeeth', 'hadis', 'sunnah', 'prophet', 'muhammad', 'pbuh', 'messenger', 'narrated', 'narrator'],
-            # Quran patterns
-            'quran': ['quran', 'koran', 'qur\'an', 'verse', 'surah', 'ayah', 'tafsir', 'tafseer', 'chapter', 'revelation'],
-            # Fiqh patterns
-            'fiqh': ['fiqh', 'ruling', 'law', 'halal', 'haram', 'permissible', 'forbidden', 'juristic', 'jurisprudence', 'islamic law'],
-            # Islamic concept patterns
-            'islamic': ['islam', 'muslim', 'islamic', 'shariah', 'sharia', 'seerah', 'aqeedah', 'belief', 'faith', 'religion']
-        }
-        
-        # Common misspellings and variations for fiqh terms
-        fiqh_variations = {
-            # Worship & Rituals
-            'prayer': ['prayer', 'pray', 'salah', 'salat', 'namaz', 'namz', 'prayr', 'preyer', 'sala', 'salat'],
-            'fasting': ['fasting', 'fast', 'sawm', 'saum', 'ramadan', 'ramzan', 'ramdan', 'fastng', 'fsting', 'sawm'],
-            'wudu': ['wudu', 'wudhu', 'ablution', 'ablutn', 'wudoo', 'wudhuu', 'ablu', 'wud', 'wudoo'],
-            'hajj': ['hajj', 'haj', 'pilgrimage', 'pilgrim', 'hajj', 'haj', 'pilgrmage', 'pilgrm', 'haj'],
-            'zakat': ['zakat', 'zakat', 'charity', 'charity', 'zakat', 'zakah', 'zakat', 'charity'],
-            
-            # Family Law
-            'marriage': ['marriage', 'marry', 'nikah', 'nikah', 'wedding', 'wedding', 'marriage', 'marry', 'nikah'],
-            'divorce': ['divorce', 'talaq', 'talaq', 'separation', 'separation', 'divorce', 'talaq', 'talaq'],
-            'inheritance': ['inheritance', 'mirath', 'mirath', 'heritage', 'heritage', 'inheritance', 'mirath', 'mirath'],
-            'parenting': ['parenting', 'parent', 'children', 'children', 'parenting', 'parent', 'children'],
-            
-            # Business & Finance
-            'interest': ['interest', 'riba', 'riba', 'usury', 'usury', 'interest', 'riba', 'riba'],
-            'business': ['business', 'trade', 'commerce', 'commerce', 'business', 'trade', 'commerce'],
-            'insurance': ['insurance', 'takaful', 'takaful', 'coverage', 'coverage', 'insurance', 'takaful'],
-            
-            # Food & Dietary
-            'halal': ['halal', 'halal', 'permissible', 'permissible', 'halal', 'halal', 'permissible'],
-            'haram': ['haram', 'haram', 'forbidden', 'forbidden', 'haram', 'haram', 'forbidden'],
-            'food': ['food', 'food', 'eating', 'eating', 'food', 'food', 'eating'],
-            
-            # Medical & Health
-            'medical': ['medical', 'medical', 'health', 'health', 'medical', 'medical', 'health'],
-            'contraception': ['contraception', 'birth control', 'birth control', 'contraception', 'birth control'],
-            
-            # Social Interactions
-            'modesty': ['modesty', 'haya', 'haya', 'modest', 'modest', 'modesty', 'haya'],
-            'gender': ['gender', 'gender', 'male', 'male', 'female', 'female', 'gender'],
-            
-            # Technology
-            'social media': ['social media', 'social media', 'facebook', 'facebook', 'instagram', 'instagram', 'twitter', 'twitter'],
-            'artificial intelligence': ['artificial intelligence', 'ai', 'ai', 'machine learning', 'machine learning', 'artificial intelligence'],
-            
-            # Environmental
-            'environment': ['environment', 'environment', 'nature', 'nature', 'environment', 'environment', 'nature'],
-            'protection': ['protection', 'protection', 'conservation', 'conservation', 'protection', 'protection', 'conservation'],
-            
-            # Criminal Law
-            'theft': ['theft', 'theft', 'stealing', 'stealing', 'theft', 'theft', 'stealing'],
-            'justice': ['justice', 'justice', 'fairness', 'fairness', 'justice', 'justice', 'fairness']
-        }
-        
-        # Common misspellings and typos
-        common_typos = {
-            'halal': ['halal', 'halal', 'halal', 'halal', 'halal', 'halal', 'halal', 'halal', 'halal', 'halal'],
-            'haram': ['haram', 'haram', 'haram', 'haram', 'haram', 'haram', 'haram', 'haram', 'haram', 'haram'],
-            'fiqh': ['fiqh', 'fiqh', 'fiqh', 'fiqh', 'fiqh', 'fiqh', 'fiqh', 'fiqh', 'fiqh', 'fiqh'],
-            'islam': ['islam', 'islam', 'islam', 'islam', 'islam', 'islam', 'islam', 'islam', 'islam', 'islam'],
-            'quran': ['quran', 'quran', 'quran', 'quran', 'quran', 'quran', 'quran', 'quran', 'quran', 'quran'],
-            'hadith': ['hadith', 'hadith', 'hadith', 'hadith', 'hadith', 'hadith', 'hadith', 'hadith', 'hadith', 'hadith']
-        }
-        
-        # Common question patterns for fiqh queries
-        fiqh_question_patterns = [
-            "what is the ruling on",
-            "what's the ruling on", 
-            "whats the ruling on",
-            "what is said on",
-            "what's said on",
-            "whats said on",
-            "what is the law on",
-            "what's the law on",
-            "whats the law on",
-            "what does islam say about",
-            "what does the quran say about",
-            "what does the hadith say about",
-            "what do scholars say about",
-            "what do the scholars say about",
-            "tell me about",
-            "explain",
-            "describe",
-            "how to",
-            "how do",
-            "can i",
-            "is it",
-            "does islam",
-            "is this",
-            "are these",
-            "does this",
-            "do these"
-        ]
+        words = query_lower.split()
         
         # Determine query type for better search
         query_type = None
-        for pattern_type, patterns in islamic_patterns.items():
+        for pattern_type, patterns in ISLAMIC_QUERY_PATTERNS.items():
             if any(pattern in query_lower for pattern in patterns):
                 query_type = pattern_type
                 break
         
+        if self.scorer is not None:
+            results = self._scored_search(query_lower, words, query_type, max_results)
+        else:
+            results = self._looped_search(query_lower, words, query_type, max_results)
+        
+        # If no results found, try broader search with lower threshold
+        if results is None:
+            logging.info("🔍 No results found with standard threshold, trying broader search", extra={'event': 'broad_search'})
+            return self.search_comprehensive_knowledge_broad(query, max_results)
+        return results
+    
+    def _scored_search(self, query_lower, words, query_type, max_results):
+        """Top results scored through the term matrix, ranked as _looped_search ranks them; None if nothing matches"""
+        scorer = self.scorer
+        scores = scorer.scores(words)
+        for source in WORD_SCORED_SOURCES:
+            if query_type == BOOSTED_QUERY_TYPES[source]:
+                scores[scorer.spans[source]] *= 1.5
+        hadith, fiqh, guidance = (scores[scorer.spans[source]] for source in WORD_SCORED_SOURCES)
+        
+        # Hadith only count under topics matching the query
+        topics = scorer.in_topics([topic_relevance(query_lower, words, topic.name, topic.words) > 0.1
+                                   for topic in self.documents['hadith']])
+        quran = self._quran_matches(query_lower)
+        if query_type == 'quran':
+            quran = [(relevance * 1.5, templates) for relevance, templates in quran]
+        
+        return top_results([
+            (hadith, topics & (hadith > 0.1), scorer.templates['result']['hadith']),
+            candidates([relevance for relevance, _ in quran], [entry for _, (_, entry) in quran]),
+            (fiqh, fiqh > 0.05, scorer.templates['result']['fiqh']),
+            (guidance, guidance > 0.1, scorer.templates['result']['guidance'])
+        ], max_results)
+    
+    def _looped_search(self, query_lower, words, query_type, max_results):
+        """Top results scored record by record, without NumPy; None if nothing matches"""
+        results = []
+        
         # Search hadith database with enhanced relevance
-        for topic, topic_data in self.hadith_database.items():
+        for topic in self.documents['hadith']:
             # Check topic name
-            topic_relevance = self.calculate_topic_relevance(query_lower, topic)
-            if topic_relevance > 0.1:  # Lower threshold for better coverage
-                for hadith in topic_data["hadiths"]:
-                    relevance = self.calculate_hadith_relevance(query_lower, hadith)
+            if topic_relevance(query_lower, words, topic.name, topic.words) > 0.1:  # Lower threshold for better coverage
+                for hadith in topic.hadiths:
+                    relevance = field_relevance(words, hadith.fields)
                     # Boost relevance for hadith queries
                     if query_type == 'hadith':
                         relevance *= 1.5
                     if relevance > 0.1:
-                        results.append({
-                            'title': f"Hadith {hadith['number']}",
-                            'content': f"{hadith['translation']} - {hadith['context']}",
-                            'source': f"{hadith['source']} - {hadith['narrator']}",
-                            'relevance': relevance,
-                            'type': 'hadith',
-                            'arabic': hadith.get('arabic', ''),
-                            'authentication': hadith.get('authentication', '')
-                        })
+                        results.append(dict(hadith.result, relevance=relevance))
         
         # Search Quran database with comprehensive search
-        quran_results = self.search_quran_comprehensive(query)
-        for quran_result in quran_results:
+        for relevance, (_, entry) in self._quran_matches(query_lower):
             # Boost relevance for Quran queries
             if query_type == 'quran':
-                quran_result['relevance'] *= 1.5
-            
-            if quran_result['type'] == 'quran_general':
-                results.append({
-                    'title': quran_result['title'],
-                    'content': quran_result['content'],
-                    'source': quran_result['source'],
-                    'relevance': quran_result['relevance'],
-                    'type': 'quran_general',
-                    'summary': quran_result['summary'],
-                    'verses_count': quran_result['verses_count'],
-                    'surahs_count': quran_result['surahs_count'],
-                    'revelation_period': quran_result['revelation_period'],
-                    'language': quran_result['language']
-                })
-            elif quran_result['type'] == 'quran_surah':
-                results.append({
-                    'title': f"Quran - {quran_result['surah_name']} ({quran_result['arabic_name']})",
-                    'content': f"{quran_result['translation']} - {quran_result['summary']}",
-                    'source': f"Quran {quran_result['surah_number']} - {quran_result['surah_name']}",
-                    'relevance': quran_result['relevance'],
-                    'type': 'quran_surah',
-                    'surah_info': {
-                        'number': quran_result['surah_number'],
-                        'name': quran_result['surah_name'],
-                        'arabic_name': quran_result['arabic_name'],
-                        'verses': quran_result['verses'],
-                        'revelation': quran_result['revelation']
-                    }
-                })
-            elif quran_result['type'] == 'quran_verse':
-                results.append({
-                    'title': f"Quran {quran_result['surah_number']}:{quran_result['ayah']} - {quran_result['surah_name']}",
-                    'content': f"{quran_result['translation']} - {quran_result['tafsir']}",
-                    'source': quran_result['source'],
-                    'relevance': quran_result['relevance'],
-                    'type': 'quran_verse',
-                    'arabic': quran_result['arabic'],
-                    'transliteration': quran_result['transliteration'],
-                    'verse_info': {
-                        'surah': quran_result['surah_number'],
-                        'ayah': quran_result['ayah'],
-                        'surah_name': quran_result['surah_name']
-                    }
-                })
+                relevance *= 1.5
+            results.append(dict(entry, relevance=relevance))
         
-        # Search fiqh database with enhanced relevance and error correction
-        for topic, topic_data in self.fiqh_database.items():
-            # Enhanced topic matching with error correction
-            topic_relevance = self.calculate_topic_relevance(query_lower, topic)
-            
-            # Check for variations and misspellings
-            corrected_relevance = self._check_fiqh_variations(query_lower, topic, fiqh_variations)
-            topic_relevance = max(topic_relevance, corrected_relevance)
-            
-            # Check for common question patterns
-            question_pattern_relevance = self._check_fiqh_question_patterns(query_lower, topic, fiqh_question_patterns)
-            topic_relevance = max(topic_relevance, question_pattern_relevance)
-            
-            relevance = self.calculate_content_relevance(query_lower, topic_data)
+        # Search fiqh database with enhanced relevance
+        for entry in self.documents['fiqh']:
+            relevance = field_relevance(words, entry.fields)
             # Boost relevance for fiqh queries
             if query_type == 'fiqh':
                 relevance *= 1.5
             if relevance > 0.05:  # Lower threshold for error correction
-                results.append({
-                    'title': topic_data['title'],
-                    'content': topic_data['content'],
-                    'source': topic_data['source'],
-                    'relevance': relevance,
-                    'type': 'fiqh',
-                    'category': topic_data.get('category', ''),
-                    'schools': topic_data.get('schools', []),
-                    'ruling': topic_data.get('ruling', '')
-                })
+                results.append(dict(entry.result, relevance=relevance))
         
         # Search Islamic guidance with enhanced relevance
-        for topic, topic_data in self.islamic_guidance.items():
-            relevance = self.calculate_content_relevance(query_lower, topic_data)
+        for entry in self.documents['guidance']:
+            relevance = field_relevance(words, entry.fields)
             # Boost relevance for Islamic concept queries
             if query_type == 'islamic':
                 relevance *= 1.5
             if relevance > 0.1:
-                results.append({
-                    'title': topic_data['title'],
-                    'content': topic_data['content'],
-                    'source': f"Islamic Guidance - {', '.join(topic_data['sources'])}",
-                    'relevance': relevance,
-                    'type': 'guidance'
-                })
+                results.append(dict(entry.result, relevance=relevance))
         
-        # If no results found, try broader search with lower threshold
         if not results:
-            logging.info(f"🔍 No results found with standard threshold, trying broader search")
-            return self.search_comprehensive_knowledge_broad(query, max_results)
+            return None
         
         # Sort by relevance and return top results
         results.sort(key=lambda x: x['relevance'], reverse=True)
@@ -3101,30 +3112,7 @@ class ComprehensiveIslamicKnowledge:
     
     def calculate_hadith_relevance(self, query, hadith):
         """Calculate relevance score for hadith"""
-        score = 0
-        
-        # Check translation
-        if 'translation' in hadith:
-            translation_lower = hadith['translation'].lower()
-            for word in query.split():
-                if word in translation_lower:
-                    score += 0.3
-        
-        # Check context
-        if 'context' in hadith:
-            context_lower = hadith['context'].lower()
-            for word in query.split():
-                if word in context_lower:
-                    score += 0.2
-        
-        # Check category
-        if 'category' in hadith:
-            category_lower = hadith['category'].lower()
-            for word in query.split():
-                if word in category_lower:
-                    score += 0.3
-        
-        return score
+        return field_relevance(query.split(), field_weights(hadith, HADITH_FIELD_WEIGHTS))
     
     def calculate_quran_relevance(self, query, verse):
         """Calculate relevance score for Quran verse"""
@@ -3146,329 +3134,197 @@ class ComprehensiveIslamicKnowledge:
         
         return score
     
-    def _check_fiqh_variations(self, query, topic, fiqh_variations):
-        """Check for fiqh term variations and misspellings"""
-        max_relevance = 0
-        
-        # Check if topic has variations
-        if topic in fiqh_variations:
-            variations = fiqh_variations[topic]
-            for variation in variations:
-                if variation in query:
-                    max_relevance = max(max_relevance, 0.8)  # High relevance for exact match
-                elif self._fuzzy_match(query, variation):
-                    max_relevance = max(max_relevance, 0.6)  # Medium relevance for fuzzy match
-        
-        # Check for common misspellings
-        for word in query.split():
-            if self._is_common_typo(word):
-                max_relevance = max(max_relevance, 0.7)  # High relevance for corrected typos
-        
-        return max_relevance
-    
-    def _check_fiqh_question_patterns(self, query, topic, fiqh_question_patterns):
-        """Check for common fiqh question patterns"""
-        max_relevance = 0
-        
-        # Check if query contains question patterns
-        for pattern in fiqh_question_patterns:
-            if pattern in query:
-                # If the topic is mentioned after the question pattern, boost relevance
-                if topic in query:
-                    max_relevance = max(max_relevance, 0.9)  # Very high relevance
-                else:
-                    max_relevance = max(max_relevance, 0.6)  # Medium relevance for question patterns
-        
-        # Check for specific question formats
-        if any(word in query for word in ["ruling", "law", "said", "say", "about"]):
-            if topic in query:
-                max_relevance = max(max_relevance, 0.8)  # High relevance
-        
-        return max_relevance
-    
-    def _fuzzy_match(self, query, target):
-        """Fuzzy string matching for misspelled words"""
-        if len(target) <= 3:
-            return target in query
-        
-        # Simple fuzzy matching (can be enhanced with more sophisticated algorithms)
-        if target in query:
-            return True
-        
-        # Check for similar words (one character difference)
-        for word in query.split():
-            if len(word) >= 4 and self._levenshtein_similarity(word, target) > 0.7:
-                return True
-        
-        return False
-    
-    def _levenshtein_similarity(self, word1, word2):
-        """Calculate similarity between two words using Levenshtein distance"""
-        if word1 == word2:
-            return 1.0
-        
-        if len(word1) < len(word2):
-            word1, word2 = word2, word1
-        
-        if len(word2) == 0:
-            return 0.0
-        
-        previous_row = list(range(len(word2) + 1))
-        for i, c1 in enumerate(word1):
-            current_row = [i + 1]
-            for j, c2 in enumerate(word2):
-                insertions = previous_row[j + 1] + 1
-                deletions = current_row[j] + 1
-                substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
-            previous_row = current_row
-        
-        max_len = max(len(word1), len(word2))
-        if max_len == 0:
-            return 1.0
-        
-        similarity = 1 - (previous_row[-1] / max_len)
-        return similarity
-    
-    def _is_common_typo(self, word):
-        """Check if word is a common typo"""
-        common_typos = {
-            'halal': ['halal', 'halal', 'halal', 'halal', 'halal'],
-            'haram': ['haram', 'haram', 'haram', 'haram', 'haram'],
-            'fiqh': ['fiqh', 'fiqh', 'fiqh', 'fiqh', 'fiqh'],
-            'islam': ['islam', 'islam', 'islam', 'islam', 'islam'],
-            'quran': ['quran', 'quran', 'quran', 'quran', 'quran'],
-            'hadith': ['hadith', 'hadith', 'hadith', 'hadith', 'hadith']
-        }
-        
-        word_lower = word.lower()
-        for correct, typos in common_typos.items():
-            if word_lower in typos:
-                return True
-        return False
-    
     def calculate_content_relevance(self, query, content_data):
         """Calculate relevance score for content"""
-        score = 0
-        
-        # Check title
-        if 'title' in content_data:
-            title_lower = content_data['title'].lower()
-            for word in query.split():
-                if word in title_lower:
-                    score += 0.5
-        
-        # Check content
-        if 'content' in content_data:
-            content_lower = content_data['content'].lower()
-            for word in query.split():
-                if word in content_lower:
-                    score += 0.1
-        
-        return score
+        return field_relevance(query.split(), field_weights(content_data, CONTENT_FIELD_WEIGHTS))
     
     def calculate_topic_relevance(self, query, topic):
         """Calculate relevance score for topic names"""
-        score = 0
-        topic_lower = topic.lower()
-        
-        # Check if query words are in topic name
-        for word in query.split():
-            if word in topic_lower:
-                score += 0.3
-        
-        # Check if topic words are in query
-        topic_words = topic_lower.split('_')
-        for word in topic_words:
-            if word in query:
-                score += 0.2
-        
-        return score
+        name = topic.lower()
+        return topic_relevance(query, query.split(), name, name.split('_'))
     
+    @traced('knowledge.broad_search')
     def search_comprehensive_knowledge_broad(self, query, max_results=10):
         """Broader search with lower thresholds for comprehensive coverage"""
         query_lower = query.lower()
-        results = []
+        words = query_lower.split()
         
         # Search with very low threshold for maximum coverage
-        for topic, topic_data in self.hadith_database.items():
-            for hadith in topic_data["hadiths"]:
-                relevance = self.calculate_hadith_relevance(query_lower, hadith)
-                if relevance > 0.05:  # Very low threshold
-                    results.append({
-                        'title': f"Hadith {hadith['number']}",
-                        'content': f"{hadith['translation']} - {hadith['context']}",
-                        'source': f"{hadith['source']} - {hadith['narrator']}",
-                        'relevance': relevance,
-                        'type': 'hadith',
-                        'arabic': hadith.get('arabic', ''),
-                        'authentication': hadith.get('authentication', '')
-                    })
+        if self.scorer is not None:
+            scores = self.scorer.scores(words)
+            return top_results([(scores[self.scorer.spans[source]], scores[self.scorer.spans[source]] > 0.05,
+                                 self.scorer.templates['broad'][source]) for source in SCORED_SOURCES],
+                               max_results) or []
         
-        for topic, topic_data in self.quran_database.items():
-            for verse in topic_data["verses"]:
-                relevance = self.calculate_quran_relevance(query_lower, verse)
+        results = []
+        for topic in self.documents['hadith']:
+            for hadith in topic.hadiths:
+                relevance = field_relevance(words, hadith.fields)
                 if relevance > 0.05:  # Very low threshold
-                    results.append({
-                        'title': f"Quran {verse['source']}",
-                        'content': f"{verse['translation']} - {verse['tafsir']}",
-                        'source': verse['source'],
-                        'relevance': relevance,
-                        'type': 'quran',
-                        'arabic': verse.get('arabic', '')
-                    })
+                    results.append(dict(hadith.result, relevance=relevance))
         
-        for topic, topic_data in self.fiqh_database.items():
-            relevance = self.calculate_content_relevance(query_lower, topic_data)
-            if relevance > 0.05:  # Very low threshold
-                results.append({
-                    'title': topic_data['title'],
-                    'content': topic_data['content'],
-                    'source': topic_data['source'],
-                    'relevance': relevance,
-                    'type': 'fiqh'
-                })
+        for surah in self.documents['quran']:
+            for verse in surah.verses:
+                relevance = field_relevance(words, verse.fields)
+                if relevance > 0.05:  # Very low threshold
+                    results.append(dict(verse.broad, relevance=relevance))
         
-        for topic, topic_data in self.islamic_guidance.items():
-            relevance = self.calculate_content_relevance(query_lower, topic_data)
+        for entry in self.documents['fiqh'] + self.documents['guidance']:
+            relevance = field_relevance(words, entry.fields)
             if relevance > 0.05:  # Very low threshold
-                results.append({
-                    'title': topic_data['title'],
-                    'content': topic_data['content'],
-                    'source': f"Islamic Guidance - {', '.join(topic_data['sources'])}",
-                    'relevance': relevance,
-                    'type': 'guidance'
-                })
+                results.append(dict(entry.broad, relevance=relevance))
         
         # Sort by relevance and return top results
         results.sort(key=lambda x: x['relevance'], reverse=True)
         return results[:max_results]
     
+    @traced('knowledge.response')
+    def rank_comprehensive_results(self, query):
+        """Search results for query, most authentic first (then by relevance)"""
+        search_results = self.search_comprehensive_knowledge(query, max_results=10)
+        if search_results:
+            search_results.sort(key=lambda x: (self._authentication_priority(x), -x['relevance']))
+        return search_results
+    
+    def _authentication_priority(self, result):
+        """Sort rank of a result's authentication (Sahih > Hasan > Da'if > Other)"""
+        if result['type'] == 'hadith' and 'authentication' in result:
+            auth = result['authentication']
+            for key, priority in AUTHENTICATION_PRIORITY.items():
+                if key in auth:
+                    return priority
+        return 5  # Default priority for non-hadith or unknown authentication
+    
+    def _format_source(self, result, heading):
+        """One source as shown in an answer"""
+        response = f"**{heading}**\n" if heading else ""
+        response += f"**{result['title']}**\n"
+        
+        if result['type'] == 'hadith':
+            response += f"*{result['authentication']}*\n"
+            if result['arabic']:
+                response += f"*Arabic: {result['arabic']}*\n"
+        
+        if result['type'] == 'quran':
+            if result['arabic']:
+                response += f"*Arabic: {result['arabic']}*\n"
+        
+        response += f"{result['content']}\n"
+        response += f"*Source: {result['source']}*\n\n"
+        return response
+    
+    def format_comprehensive_response(self, search_results):
+        """Answer text and source for ranked results; (None, None) if there are none"""
+        if not search_results:
+            return None, None
+        
+        # Get the most authentic result
+        most_authentic = search_results[0]
+        additional_sources = search_results[1:] if len(search_results) > 1 else []
+        
+        # Format primary response with most authentic source
+        response = f"**Most Authentic Source Found:**\n\n"
+        response += self._format_source(most_authentic, None)
+        
+        # If there are additional sources, offer them with user choice
+        if additional_sources:
+            response += f"**Additional Sources Available ({len(additional_sources)} more):**\n\n"
+            response += f"Would you like me to show you:\n"
+            response += f"• **One additional source at a time** (recommended for detailed study)\n"
+            response += f"• **All additional sources at once** (comprehensive overview)\n"
+            response += f"• **Specific source** (e.g., 'show me Sahih Bukhari' or 'show me Quran verse')\n\n"
+            response += f"Just let me know your preference!"
+        
+        return response, most_authentic['source']
+    
     def get_comprehensive_response(self, query):
         """Get comprehensive response from all Islamic knowledge sources with authentication prioritization"""
+        response, source, _ = self.get_ranked_comprehensive_response(query)
+        return response, source
+    
+    def get_ranked_comprehensive_response(self, query):
+        """get_comprehensive_response plus the ranked results behind it, kept for follow-ups"""
         try:
-            # Search through all knowledge sources
-            search_results = self.search_comprehensive_knowledge(query, max_results=10)
-            
-            if search_results:
-                # Sort by authentication level (Sahih > Hasan > Da'if > Other)
-                authentication_priority = {
-                    'Sahih': 1,
-                    'Sahih (Authentic)': 1,
-                    'Hasan': 2,
-                    'Hasan (Good)': 2,
-                    'Da\'if': 3,
-                    'Weak': 3,
-                    'Mawdu': 4,
-                    'Fabricated': 4
-                }
-                
-                def get_auth_priority(result):
-                    if result['type'] == 'hadith' and 'authentication' in result:
-                        auth = result['authentication']
-                        for key, priority in authentication_priority.items():
-                            if key in auth:
-                                return priority
-                    return 5  # Default priority for non-hadith or unknown authentication
-                
-                # Sort results by authentication priority and relevance
-                search_results.sort(key=lambda x: (get_auth_priority(x), -x['relevance']))
-                
-                # Get the most authentic result
-                most_authentic = search_results[0]
-                additional_sources = search_results[1:] if len(search_results) > 1 else []
-                
-                # Format primary response with most authentic source
-                response = f"**Most Authentic Source Found:**\n\n"
-                response += f"**{most_authentic['title']}**\n"
-                
-                if most_authentic['type'] == 'hadith':
-                    response += f"*{most_authentic['authentication']}*\n"
-                    if most_authentic['arabic']:
-                        response += f"*Arabic: {most_authentic['arabic']}*\n"
-                
-                if most_authentic['type'] == 'quran':
-                    if most_authentic['arabic']:
-                        response += f"*Arabic: {most_authentic['arabic']}*\n"
-                
-                response += f"{most_authentic['content']}\n"
-                response += f"*Source: {most_authentic['source']}*\n\n"
-                
-                # If there are additional sources, offer them with user choice
-                if additional_sources:
-                    response += f"**Additional Sources Available ({len(additional_sources)} more):**\n\n"
-                    response += f"Would you like me to show you:\n"
-                    response += f"• **One additional source at a time** (recommended for detailed study)\n"
-                    response += f"• **All additional sources at once** (comprehensive overview)\n"
-                    response += f"• **Specific source** (e.g., 'show me Sahih Bukhari' or 'show me Quran verse')\n\n"
-                    response += f"Just let me know your preference!"
-                
-                return response, most_authentic['source']
-            
-            return None, None
-            
+            search_results = self.rank_comprehensive_results(query)
+            response, source = self.format_comprehensive_response(search_results)
+            return response, source, search_results
         except Exception as e:
             logging.error(f"❌ Comprehensive search error: {e}")
-            return None, None
+            return None, None, []
+    
+    def classify_follow_up(self, user_message):
+        """What a follow-up asks for: ('next', None), ('all', None), ('collection', name) or None
+        
+        The whole message must be follow-up wording such as "next source",
+        "all at once" or "show me Sahih Bukhari". Questions ("What is the
+        Quran?") and messages naming a topic ("show me Bukhari on patience")
+        are new questions, even when they mention a collection.
+        """
+        message_lower = ' '.join(re.sub(r"[^\w\s']", ' ', user_message.lower()).split())
+        if not message_lower or message_lower.split()[0] in FOLLOW_UP_QUESTION_WORDS:
+            return None
+        for name, pattern in FOLLOW_UP_COLLECTION_PATTERNS.items():
+            if pattern.fullmatch(message_lower):
+                return 'collection', name
+        if FOLLOW_UP_ALL.fullmatch(message_lower):
+            return 'all', None
+        if FOLLOW_UP_NEXT.fullmatch(message_lower):
+            return 'next', None
+        return None
+    
+    def matches_collection(self, result, collection):
+        """Whether a ranked result belongs to a follow-up collection"""
+        if collection in ('Quran', 'Fiqh'):
+            return result['type'] == collection.lower()
+        text = f"{result['source']} {result['title']}".lower()
+        return any(alias in text for alias in FOLLOW_UP_COLLECTIONS[collection])
+    
+    def format_follow_up_sources(self, query, sources, first_number, total, remaining, heading):
+        """Answer text for sources served from a session's cached results"""
+        if not sources:
+            response = f"**{heading}**\n\nNo further sources for \"{query}\" match this request.\n\n"
+        else:
+            response = f"**{heading}** (for \"{query}\")\n\n"
+            for offset, result in enumerate(sources):
+                response += self._format_source(result, f"Source {first_number + offset} of {total}:")
+        if remaining:
+            response += f"**{remaining} more source{'s' if remaining != 1 else ''} available.** "
+            response += f"Say \"next source\" for the next one or \"all at once\" for the rest."
+        return response
     
+    @traced('knowledge.multi_source')
     def get_comprehensive_multi_source_response(self, query):
-        """Get comprehensive response from all Islamic knowledge sources for single-word queries"""
+        """Get comprehensive response from all Islamic knowledge sources for single-word queries
+
+        Each source is scanned once, keeping only the results it can show in
+        a bounded heap; sources are listed in order of their best result.
+        """
         try:
             query_lower = query.lower().strip()
-            all_results = []
+            words = query_lower.split()
             
             # Search through all knowledge sources
-            hadith_results = self._search_hadith_for_single_word(query_lower)
-            quran_results = self._search_quran_for_single_word(query_lower)
-            fiqh_results = self._search_fiqh_for_single_word(query_lower)
-            guidance_results = self._search_guidance_for_single_word(query_lower)
-            
-            # Combine all results
-            all_results.extend(hadith_results)
-            all_results.extend(quran_results)
-            all_results.extend(fiqh_results)
-            all_results.extend(guidance_results)
+            sources = [
+                ('hadith', self._search_hadith_for_single_word(query_lower, words)),
+                ('quran', self._search_quran_for_single_word(query_lower)),
+                ('fiqh', self._search_fiqh_for_single_word(query_lower, words)),
+                ('guidance', self._search_guidance_for_single_word(query_lower, words))
+            ]
+            sources = [(source_type, top) for source_type, top in sources if top]
             
-            if all_results:
-                # Sort by relevance
-                all_results.sort(key=lambda x: x['relevance'], reverse=True)
+            if sources:
+                # Sort by best relevance; ties keep the order above
+                sources.sort(key=lambda source: source[1].best_score(), reverse=True)
                 
                 # Create comprehensive response
                 response = f"**Comprehensive Islamic Information for '{query.title()}':**\n\n"
                 
-                # Group by source type
-                source_groups = {}
-                for result in all_results:
-                    source_type = result['type']
-                    if source_type not in source_groups:
-                        source_groups[source_type] = []
-                    source_groups[source_type].append(result)
-                
                 # Present information by source type
-                for source_type, results in source_groups.items():
-                    if source_type == 'hadith':
-                        response += f"**📚 Hadith & Sunnah:**\n"
-                        for result in results[:2]:  # Show top 2 hadith
-                            response += f"• {result['content'][:150]}...\n"
-                            response += f"  *Source: {result['source']}*\n\n"
-                    
-                    elif source_type == 'quran':
-                        response += f"**📖 Quran & Tafsir:**\n"
-                        for result in results[:2]:  # Show top 2 Quran verses
-                            response += f"• {result['content'][:150]}...\n"
-                            response += f"  *Source: {result['source']}*\n\n"
-                    
-                    elif source_type == 'fiqh':
-                        response += f"**⚖️ Islamic Law (Fiqh):**\n"
-                        for result in results[:2]:  # Show top 2 fiqh rulings
-                            response += f"• {result['content'][:150]}...\n"
-                            response += f"  *Source: {result['source']}*\n\n"
-                    
-                    elif source_type == 'guidance':
-                        response += f"**💡 Islamic Guidance:**\n"
-                        for result in results[:2]:  # Show top 2 guidance items
-                            response += f"• {result['content'][:150]}...\n"
-                            response += f"  *Source: {result['source']}*\n\n"
+                for source_type, top in sources:
+                    response += f"**{MULTI_SOURCE_HEADINGS[source_type]}:**\n"
+                    for result in top.results():
+                        response += f"• {result['content'][:150]}...\n"
+                        response += f"  *Source: {result['source']}*\n\n"
                 
                 # Ask user for specific preference
                 response += f"**🤔 What specific information would you like to explore?**\n\n"
@@ -3483,191 +3339,94 @@ class ComprehensiveIslamicKnowledge:
                 return response
             
             # If no results found, provide a helpful response
-            if not all_results:
-                return f"**I couldn't find specific Islamic information for '{query.title()}'**\n\n**🤔 What would you like to know about?**\n\nYou can ask me about:\n• **Islamic concepts** (prayer, fasting, charity, etc.)\n• **Islamic practices** (halal, haram, sunnah, etc.)\n• **Islamic values** (patience, kindness, honesty, etc.)\n• **Islamic rulings** (marriage, business, family, etc.)\n\n**Try asking:**\n• 'What is the ruling on [topic]?'\n• 'Tell me about [Islamic concept]'\n• 'What does Islam say about [topic]?'\n\n**Or ask about specific topics like:**\n• Prayer, fasting, zakat, hajj\n• Marriage, family, business\n• Halal, haram, sunnah\n• Patience, kindness, forgiveness"
-            
-            return response
+            return f"**I couldn't find specific Islamic information for '{query.title()}'**\n\n**🤔 What would you like to know about?**\n\nYou can ask me about:\n• **Islamic concepts** (prayer, fasting, charity, etc.)\n• **Islamic practices** (halal, haram, sunnah, etc.)\n• **Islamic values** (patience, kindness, honesty, etc.)\n• **Islamic rulings** (marriage, business, family, etc.)\n\n**Try asking:**\n• 'What is the ruling on [topic]?'\n• 'Tell me about [Islamic concept]'\n• 'What does Islam say about [topic]?'\n\n**Or ask about specific topics like:**\n• Prayer, fasting, zakat, hajj\n• Marriage, family, business\n• Halal, haram, sunnah\n• Patience, kindness, forgiveness"
             
         except Exception as e:
             logging.error(f"❌ Multi-source response error: {e}")
             return None
     
-    def _search_hadith_for_single_word(self, query):
-        """Search hadith database for single-word queries"""
-        results = []
-        for topic, topic_data in self.hadith_database.items():
+    def _search_hadith_for_single_word(self, query, words):
+        """Best hadith for single-word queries"""
+        top = TopK(MULTI_SOURCE_SHOWN)
+        for topic in self.documents['hadith']:
             # Check topic name
-            if query in topic.lower():
-                for hadith in topic_data.get('hadiths', [])[:2]:  # Limit to 2 hadith per topic
-                    relevance = self.calculate_hadith_relevance(query, hadith)
+            if query in topic.name:
+                for hadith in topic.hadiths[:2]:  # Limit to 2 hadith per topic
+                    relevance = field_relevance(words, hadith.fields)
                     if relevance > 0.1:
-                        results.append({
-                            'title': f"Hadith {hadith['number']}",
-                            'content': f"{hadith['translation']} - {hadith['context']}",
-                            'source': f"{hadith['source']} - {hadith['narrator']}",
-                            'relevance': relevance,
-                            'type': 'hadith'
-                        })
+                        top.push(relevance, hadith.result)
             
             # Check hadith content more thoroughly
-            for hadith in topic_data.get('hadiths', []):
-                hadith_text = f"{hadith.get('translation', '')} {hadith.get('context', '')}".lower()
-                if query in hadith_text:
-                    relevance = self.calculate_hadith_relevance(query, hadith)
+            for hadith in topic.hadiths:
+                if query in hadith.text:
+                    relevance = field_relevance(words, hadith.fields)
                     if relevance > 0.05:  # Lower threshold for content search
-                        results.append({
-                            'title': f"Hadith {hadith['number']}",
-                            'content': f"{hadith['translation']} - {hadith['context']}",
-                            'source': f"{hadith['source']} - {hadith['narrator']}",
-                            'relevance': relevance,
-                            'type': 'hadith'
-                        })
-                        if len(results) >= 4:  # Limit total results
+                        top.push(relevance, hadith.result)
+                        if top.pushed >= MULTI_SOURCE_HADITH_LIMIT:  # Limit total results
                             break
-        return results
+        return top
     
     def _search_quran_for_single_word(self, query):
-        """Search Quran database for single-word queries using comprehensive search"""
-        # Use the comprehensive Quran search for single words
-        quran_results = self.search_quran_comprehensive(query)
-        
-        # Convert to the expected format for single-word search
-        results = []
-        for quran_result in quran_results[:4]:  # Limit to 4 results for single-word queries
-            if quran_result['type'] == 'quran_verse':
-                results.append({
-                    'title': f"Quran {quran_result['surah_number']}:{quran_result['ayah']} - {quran_result['surah_name']}",
-                    'content': f"{quran_result['translation']} - {quran_result['tafsir']}",
-                    'source': quran_result['source'],
-                    'relevance': quran_result['relevance'],
-                    'type': 'quran',
-                    'arabic': quran_result['arabic']
-                })
-            elif quran_result['type'] == 'quran_surah':
-                results.append({
-                    'title': f"Quran - {quran_result['surah_name']} ({quran_result['arabic_name']})",
-                    'content': f"{quran_result['translation']} - {quran_result['summary']}",
-                    'source': f"Quran {quran_result['surah_number']} - {quran_result['surah_name']}",
-                    'relevance': quran_result['relevance'],
-                    'type': 'quran'
-                })
-        
-        return results
+        """Best surahs and verses among the top Quran results for single-word queries"""
+        top = TopK(MULTI_SOURCE_SHOWN)
+        for relevance, (_, entry) in self._quran_matches(query, MULTI_SOURCE_QURAN_LIMIT):
+            if entry['type'] != 'quran_general':
+                top.push(relevance, entry)
+        return top
     
-    def _search_fiqh_for_single_word(self, query):
-        """Search fiqh database for single-word queries"""
-        results = []
-        for topic, topic_data in self.fiqh_database.items():
-            # Check topic name
-            if query in topic.lower():
-                relevance = self.calculate_content_relevance(query, topic_data)
-                if relevance > 0.1:
-                    results.append({
-                        'title': topic_data['title'],
-                        'content': topic_data['content'],
-                        'source': topic_data['source'],
-                        'relevance': relevance,
-                        'type': 'fiqh'
-                    })
-            
-            # Check content more thoroughly
-            content_text = f"{topic_data.get('title', '')} {topic_data.get('content', '')}".lower()
-            if query in content_text:
-                relevance = self.calculate_content_relevance(query, topic_data)
-                if relevance > 0.05:  # Lower threshold for content search
-                    results.append({
-                        'title': topic_data['title'],
-                        'content': topic_data['content'],
-                        'source': topic_data['source'],
-                        'relevance': relevance,
-                        'type': 'fiqh'
-                    })
-        return results
+    def _search_fiqh_for_single_word(self, query, words):
+        """Best fiqh rulings for single-word queries"""
+        top = TopK(MULTI_SOURCE_SHOWN)
+        for entry in self.documents['fiqh']:
+            # Check topic name, then content more thoroughly
+            in_topic = query in entry.name
+            in_text = query in entry.text
+            if in_topic or in_text:
+                relevance = field_relevance(words, entry.fields)
+                if in_topic and relevance > 0.1:
+                    top.push(relevance, entry.result)
+                if in_text and relevance > 0.05:  # Lower threshold for content search
+                    top.push(relevance, entry.result)
+        return top
     
-    def _search_guidance_for_single_word(self, query):
-        """Search Islamic guidance for single-word queries"""
-        results = []
-        for topic, topic_data in self.islamic_guidance.items():
-            if query in topic.lower() or query in topic_data.get('content', '').lower():
-                relevance = self.calculate_content_relevance(query, topic_data)
+    def _search_guidance_for_single_word(self, query, words):
+        """Best Islamic guidance for single-word queries"""
+        top = TopK(MULTI_SOURCE_SHOWN)
+        for entry in self.documents['guidance']:
+            if query in entry.name or query in entry.text:
+                relevance = field_relevance(words, entry.fields)
                 if relevance > 0.1:
-                    results.append({
-                        'title': topic_data['title'],
-                        'content': topic_data['content'],
-                        'source': f"Islamic Guidance - {', '.join(topic_data['sources'])}",
-                        'relevance': relevance,
-                        'type': 'guidance'
-                    })
-        return results
+                    top.push(relevance, entry.result)
+        return top
     
-    def search_quran_comprehensive(self, query):
-        """Comprehensive Quran search across all Surahs and verses"""
-        results = []
-        query_lower = query.lower()
-        
+    @traced('knowledge.quran_search')
+    def _quran_matches(self, query_lower, limit=10):
+        """Best (relevance, (search_quran_comprehensive result, search_comprehensive_knowledge result))"""
         # Handle general Quran queries
-        if query_lower in ['quran', 'koran', 'qur\'an', 'holy book', 'divine book']:
-            # Return general Quran information
-            results.append({
-                'type': 'quran_general',
-                'title': 'The Holy Quran - Divine Revelation',
-                'content': 'The Quran is the holy book of Islam, revealed to Prophet Muhammad (PBUH) over 23 years. It contains 114 Surahs (chapters) with over 6,000 verses covering all aspects of life including faith, worship, morality, law, history, and guidance for humanity.',
-                'source': 'Quran - Divine Revelation',
-                'relevance': 1.0,
-                'summary': 'The Quran is the final divine revelation, the word of Allah, and the primary source of Islamic law and guidance.',
-                'verses_count': 'Over 6,000 verses',
-                'surahs_count': 114,
-                'revelation_period': '23 years',
-                'language': 'Arabic'
-            })
+        general = []
+        if query_lower in QURAN_GENERAL_QUERIES:
+            general.append((1.0, (QURAN_GENERAL_RESULT, QURAN_GENERAL_RESULT)))
+        if self.scorer is not None:
+            return general + self.scorer.quran_matches(query_lower, limit - len(general))
         
-        for surah_key, surah_data in self.quran_database.items():
+        top = TopK(limit)
+        for relevance, templates in general:
+            top.push(relevance, templates)
+        for surah in self.documents['quran']:
             # Search in surah name and translation
-            surah_name = surah_data.get('surah_name', '').lower()
-            surah_translation = surah_data.get('translation', '').lower()
-            arabic_name = surah_data.get('arabic_name', '')
-            
-            if (query_lower in surah_name or 
-                query_lower in surah_translation or 
-                query_lower in surah_key.lower()):
-                
-                # Add surah-level result
-                results.append({
-                    'type': 'quran_surah',
-                    'surah_number': surah_data.get('surah_number'),
-                    'surah_name': surah_data.get('surah_name'),
-                    'arabic_name': arabic_name,
-                    'translation': surah_data.get('translation'),
-                    'verses': surah_data.get('verses'),
-                    'revelation': surah_data.get('revelation'),
-                    'summary': surah_data.get('summary'),
-                    'relevance': 0.9,
-                    'source': f"Quran - {surah_data.get('surah_name')}"
-                })
+            if query_lower in surah.name or query_lower in surah.translation or query_lower in surah.key:
+                top.push(0.9, (surah.result, surah.entry))
             
             # Search in individual verses
-            verses_data = surah_data.get('verses_data', [])
-            for verse in verses_data:
-                verse_text = f"{verse.get('translation', '')} {verse.get('transliteration', '')} {verse.get('tafsir', '')}".lower()
-                
-                if query_lower in verse_text:
-                    results.append({
-                        'type': 'quran_verse',
-                        'surah_number': surah_data.get('surah_number'),
-                        'surah_name': surah_data.get('surah_name'),
-                        'arabic_name': arabic_name,
-                        'ayah': verse.get('ayah'),
-                        'arabic': verse.get('arabic'),
-                        'transliteration': verse.get('transliteration'),
-                        'translation': verse.get('translation'),
-                        'tafsir': verse.get('tafsir'),
-                        'relevance': 0.8,
-                        'source': f"Quran {surah_data.get('surah_number')}:{verse.get('ayah')} - {surah_data.get('surah_name')}"
-                    })
-        
-        # Sort by relevance and return top results
-        results.sort(key=lambda x: x['relevance'], reverse=True)
-        return results[:10]  # Return top 10 results
+            for verse in surah.verses:
+                if query_lower in verse.text:
+                    top.push(0.8, (verse.result, verse.entry))
+        return top.scored()
+    
+    def search_quran_comprehensive(self, query):
+        """Comprehensive Quran search across all Surahs and verses"""
+        # Top 10 results, most relevant first
+        return [dict(result, relevance=relevance) for relevance, (result, _) in self._quran_matches(query.lower())]
     
     def search_quran_by_topic(self, topic):
         """Search Quran for specific topics or themes"""
@@ -3695,28 +3454,12 @@ class ComprehensiveIslamicKnowledge:
                 matching_topics.append(main_topic)
         
         # Search in Quran database for these topics
-        for surah_key, surah_data in self.quran_database.items():
-            verses_data = surah_data.get('verses_data', [])
-            for verse in verses_data:
-                verse_text = f"{verse.get('translation', '')} {verse.get('tafsir', '')}".lower()
-                
+        for surah in self.documents['quran']:
+            for verse in surah.verses:
                 # Check if verse relates to any matching topic
                 for matching_topic in matching_topics:
-                    if matching_topic in verse_text:
-                        results.append({
-                            'type': 'quran_verse',
-                            'surah_number': surah_data.get('surah_number'),
-                            'surah_name': surah_data.get('surah_name'),
-                            'arabic_name': surah_data.get('arabic_name'),
-                            'ayah': verse.get('ayah'),
-                            'arabic': verse.get('arabic'),
-                            'transliteration': verse.get('transliteration'),
-                            'translation': verse.get('translation'),
-                            'tafsir': verse.get('tafsir'),
-                            'topic': matching_topic,
-                            'relevance': 0.9,
-                            'source': f"Quran {surah_data.get('surah_number')}:{verse.get('ayah')} - {surah_data.get('surah_name')}"
-                        })
+                    if matching_topic in verse.topic_text:
+                        results.append(dict(verse.result, topic=matching_topic, relevance=0.9))
         
         # Sort by relevance and return top results
         results.sort(key=lambda x: x['relevance'], reverse=True)
@@ -3746,6 +3489,7 @@ class ComprehensiveIslamicKnowledge:
                         }
         return None
     
+    @traced('knowledge.follow_up')
     def get_follow_up_sources(self, user_message):
         """Handle follow-up requests for additional sources"""
         try:
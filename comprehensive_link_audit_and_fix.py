@@ -9,7 +9,10 @@ with proper Islamic content to ensure every link leads to fully populated conten
 
 import os
 import re
+import time
+import argparse
 from pathlib import Path
+from parallel_render import default_jobs, job_count, render_pages, failed_pages, print_render_timings
 
 def get_exact_index_page_design():
     """Get the exact CSS design from the index page"""
@@ -744,7 +747,7 @@ def create_content_page(filename, title, description, content_type):
     
     return html_content
 
-def main():
+def main(jobs=None):
     """Main function to audit and fix all missing links"""
     print("🔍 COMPREHENSIVE LINK AUDIT AND FIX")
     print("Complete Islamic Study Guide Extended Edition")
@@ -752,37 +755,41 @@ def main():
     
     # Get missing files audit
     missing_files = get_missing_files_audit()
+    if jobs is None:
+        jobs = default_jobs()
     
     print(f"📊 Found {len(missing_files)} missing files that need to be created")
     print()
     
-    # Create each missing file
-    created_count = 0
+    # Collect each missing file for the render pool
+    pages = []
     for filename, file_info in missing_files.items():
         if not os.path.exists(filename):
             print(f"🔨 Creating: {filename}")
             print(f"   Title: {file_info['title']}")
             print(f"   Type: {file_info['content_type']}")
             
-            # Create the content
-            content = create_content_page(
+            pages.append((filename, create_content_page, (
                 filename, 
                 file_info['title'], 
                 file_info['description'], 
                 file_info['content_type']
-            )
-            
-            # Write the file
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
-            print(f"   ✅ Created successfully")
-            created_count += 1
+            )))
         else:
             print(f"✅ Already exists: {filename}")
         
         print()
     
+    # Render in parallel and write the files in bulk
+    started = time.perf_counter()
+    results = render_pages(pages, jobs=jobs)
+    failures = failed_pages(results)
+    for filename, error in failures:
+        print(f"❌ Error creating {filename}: {error}")
+    print_render_timings(results, time.perf_counter() - started, jobs)
+    created_count = len(results) - len(failures)
+    print()
+    
     print("=" * 60)
     print(f"🎉 LINK AUDIT COMPLETE!")
     print(f"📁 Files created: {created_count}")
@@ -797,4 +804,8 @@ def main():
     print("📱 All missing content files have been created with proper Islamic content!")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Audit links and create missing content files")
+    parser.add_argument('--jobs', type=job_count, default=default_jobs(), help="number of render processes")
+    args = parser.parse_args()
+    
+    main(jobs=args.jobs)
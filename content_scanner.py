@@ -8,11 +8,13 @@ import os
 import re
 import json
 from datetime import datetime
-from bs4 import BeautifulSoup
 import logging
 import threading
 import time
 
+from request_tracing import traced
+import knowledge_snapshot
+
 class IslamicContentScanner:
     """Comprehensive scanner for all Islamic knowledge content files"""
     
@@ -21,6 +23,9 @@ class IslamicContentScanner:
         self.file_paths = []
         self.scan_complete = False
         self.scan_thread = None
+        if knowledge_snapshot.restore(self, 'content_scanner'):
+            logging.info(f"⚡ Content index restored from snapshot: {len(self.content_index)} knowledge sources")
+            return
         # Start with immediate scan for testing
         self.scan_all_content_sync()
     
@@ -36,10 +41,7 @@ class IslamicContentScanner:
             logging.info("📚 Starting synchronous Islamic content scan...")
             
             # Get all HTML files in the current directory
-            html_files = []
-            for file in os.listdir('.'):
-                if file.endswith('.html') and not file.startswith('test-') and not file.startswith('deenbot-'):
-                    html_files.append(file)
+            html_files = knowledge_snapshot.content_files('.')
             
             logging.info(f"📖 Found {len(html_files)} content files to scan")
             
@@ -65,7 +67,8 @@ class IslamicContentScanner:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            # Parse HTML content
+            # Parse HTML content (bs4 is only needed for a rescan, not a snapshot restore)
+            from bs4 import BeautifulSoup
             soup = BeautifulSoup(content, 'html.parser')
             
             # Extract text content
@@ -126,6 +129,7 @@ class IslamicContentScanner:
         except Exception as e:
             return ""
     
+    @traced('scanner.search')
     def search_content(self, query, max_results=5):
         """Search through all scanned content for relevant Islamic knowledge"""
         if not self.scan_complete:
@@ -237,6 +241,7 @@ class IslamicContentScanner:
         except Exception as e:
             return 0
     
+    @traced('scanner.response')
     def get_comprehensive_response(self, query):
         """Get comprehensive response from scanned Islamic content"""
         try:
@@ -21,7 +21,8 @@ class DeenBotStabilitySystem {
             lastHealthCheck: 0,
             isReconnecting: false,
             fallbackResponses: [],
-            connectionHistory: []
+            connectionHistory: [],
+            sessionId: null  // issued by the backend; lets "next source" follow-ups use cached results
         };
         
         this.healthCheckTimer = null;
@@ -256,12 +257,15 @@ class DeenBotStabilitySystem {
                     headers: {
                         'Content-Type': 'application/json',
                     },
-                    body: JSON.stringify({ message: message }),
+                    body: JSON.stringify({ message: message, session_id: this.state.sessionId }),
                     timeout: this.config.timeout
                 });
                 
                 if (response.ok) {
                     const data = await response.json();
+                    if (data.session_id) {
+                        this.state.sessionId = data.session_id;
+                    }
                     this.logConnectionEvent('message_sent_success', { attempt });
                     return data;
                 } else {
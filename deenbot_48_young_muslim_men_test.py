@@ -10,70 +10,12 @@ import time
 import random
 from datetime import datetime
 
+from question_corpora import corpus_questions
+
 class DeenBotYoungMenTest:
     def __init__(self):
         self.base_url = "http://localhost:8080"
-        self.test_questions = [
-            # Identity and Faith (8 questions)
-            "How can I strengthen my iman as a young Muslim man?",
-            "What should I do when I feel disconnected from my faith?",
-            "How do I balance being Muslim with modern life?",
-            "What are the most important duas for young men?",
-            "How can I be a good role model for other young Muslims?",
-            "What should I do when friends question my Islamic practices?",
-            "How do I explain my faith to non-Muslim classmates?",
-            "What are the signs of weak iman and how to fix them?",
-            
-            # Education and Career (8 questions)
-            "How should I choose my career path as a Muslim?",
-            "What does Islam say about pursuing higher education?",
-            "How do I maintain Islamic values in a competitive work environment?",
-            "What should I do if my job conflicts with prayer times?",
-            "How can I be successful while staying true to Islamic principles?",
-            "What does Islam say about entrepreneurship and business?",
-            "How do I handle workplace discrimination as a Muslim?",
-            "What are the Islamic guidelines for financial planning?",
-            
-            # Relationships and Marriage (8 questions)
-            "What should I look for in a potential spouse?",
-            "How do I approach marriage as a young Muslim man?",
-            "What are my responsibilities towards my future wife?",
-            "How do I handle family pressure about marriage?",
-            "What does Islam say about dating before marriage?",
-            "How should I interact with women in professional settings?",
-            "What are the rights and duties in an Islamic marriage?",
-            "How do I prepare financially for marriage?",
-            
-            # Social Life and Friendships (8 questions)
-            "How do I make Muslim friends in a new city?",
-            "What should I do when friends want to do haram activities?",
-            "How do I handle peer pressure to drink or party?",
-            "What are good social activities for young Muslim men?",
-            "How do I maintain friendships with non-Muslims?",
-            "What should I do if I'm the only Muslim in my group?",
-            "How do I handle social media as a Muslim?",
-            "What are Islamic guidelines for social gatherings?",
-            
-            # Physical and Mental Health (8 questions)
-            "How should I take care of my physical health as a Muslim?",
-            "What does Islam say about mental health and seeking help?",
-            "How do I deal with stress and anxiety?",
-            "What are the Islamic guidelines for exercise and sports?",
-            "How should I handle anger and frustration?",
-            "What does Islam say about depression and sadness?",
-            "How do I maintain a healthy lifestyle while being busy?",
-            "What are the benefits of fasting beyond Ramadan?",
-            
-            # Technology and Modern Life (8 questions)
-            "How do I use technology responsibly as a Muslim?",
-            "What are the Islamic guidelines for social media use?",
-            "How do I avoid wasting time on the internet?",
-            "What does Islam say about online relationships?",
-            "How do I protect my privacy online as a Muslim?",
-            "What are good apps for Islamic learning?",
-            "How do I balance gaming with Islamic responsibilities?",
-            "What does Islam say about artificial intelligence and automation?"
-        ]
+        self.test_questions = corpus_questions('young_muslim_men')
         self.results = []
         self.start_time = None
         self.end_time = None
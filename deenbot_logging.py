@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+DeenBot Logging - Non-Blocking Structured Logs for the Backends
+Request threads only put log records on an in-memory queue; a listener
+thread formats them and writes JSON lines to the log file and readable
+lines to the console. High-volume INFO events are sampled, and messages
+are formatted lazily on the listener thread.
+"""
+
+import os
+import json
+import queue
+import atexit
+import logging
+import itertools
+import threading
+import logging.handlers
+from datetime import datetime, timezone
+
+DEFAULT_LOG_FILE = '/var/log/supervisor/deenbot.log'
+CONSOLE_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Keep 1 in N records of these INFO events (set DEENBOT_LOG_SAMPLE_RATE=1 to keep all)
+SAMPLE_RATE = max(int(os.environ.get('DEENBOT_LOG_SAMPLE_RATE', '10')), 1)
+SAMPLED_EVENTS = {'query', 'topic_search', 'broad_search', 'stage_match', 'static_file', 'access'}
+
+# Attributes every LogRecord has; anything else came from extra= and goes into the JSON line
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+class JsonLineFormatter(logging.Formatter):
+    """One JSON object per record: time, level, message and extra= fields"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'thread': record.threadName
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class SamplingFilter(logging.Filter):
+    """Pass 1 in `rate` INFO-or-below records of each sampled event
+
+    Events are tagged with extra={'event': name}; warnings, errors and
+    untagged records always pass.
+    """
+
+    def __init__(self, rate=SAMPLE_RATE, events=SAMPLED_EVENTS):
+        super().__init__()
+        self.rate = rate
+        self.events = set(events)
+        self.counters = {event: itertools.count() for event in self.events}
+        self.dropped = 0
+        self._lock = threading.Lock()  # dropped is counted from every logging thread
+
+    def filter(self, record):
+        event = getattr(record, 'event', None)
+        if self.rate == 1 or event not in self.events or record.levelno > logging.INFO:
+            return True
+        if next(self.counters[event]) % self.rate == 0:
+            record.sample_rate = self.rate
+            return True
+        with self._lock:
+            self.dropped += 1
+        return False
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread
+
+    The stock prepare() formats the message on the calling thread. Records
+    stay in this process, so they can be queued as they are.
+    """
+
+    def prepare(self, record):
+        return record
+
+def setup_logging(log_file=None, level=logging.INFO):
+    """Route the root logger through a queue to file and console handlers
+
+    log_file defaults to DEENBOT_LOG_FILE, then the supervisor log; the
+    file handler is skipped when its directory does not exist. Returns the
+    started QueueListener, which is stopped (and flushed) at exit.
+    """
+    log_file = log_file or os.environ.get('DEENBOT_LOG_FILE', DEFAULT_LOG_FILE)
+
+    handlers = []
+    try:
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setFormatter(JsonLineFormatter())
+        handlers.append(file_handler)
+    except OSError:
+        # No supervisor log directory (local development): console only
+        pass
+
+    console_handler = logging.StreamHandler()
+    if os.environ.get('DEENBOT_LOG_FORMAT', '').lower() == 'json':
+        console_handler.setFormatter(JsonLineFormatter())
+    else:
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+    handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    listener._thread.name = 'deenbot-log-listener'
+    atexit.register(listener.stop)
+    return listener
+
+def sampling_filter():
+    """The SamplingFilter installed by setup_logging, if any"""
+    for handler in logging.getLogger().handlers:
+        for log_filter in handler.filters:
+            if isinstance(log_filter, SamplingFilter):
+                return log_filter
+    return None
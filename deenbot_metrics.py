@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+DeenBot Metrics - Prometheus Text Exposition for the DeenBot Backends
+Request counters, latency histograms per endpoint and routing source,
+in-flight requests, cache hit ratios and process resource gauges, served
+from /metrics
+"""
+
+import os
+import time
+import threading
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; spans in-process lookups (sub-ms) to content scanner worst cases
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Request paths reported as their own endpoint label; everything else is static or other
+KNOWN_ENDPOINTS = {'/', '/health', '/status', '/stats', '/chat', '/metrics', '/debug/trace', '/debug/profile'}
+STATIC_EXTENSIONS = ('.html', '.css', '.js', '.svg', '.png', '.ico', '.json', '.webmanifest')
+
+def routing_branch(source):
+    """Routing branch of a response source, e.g. 'Direct Topic Match - salah' -> 'Direct Topic Match'"""
+    return (source or 'Unknown').split(' - ', 1)[0]
+
+def _escape(value):
+    """Escape a label value for the text format"""
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(labels):
+    """{"a": 1} -> '{a="1"}'"""
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+def _format_value(value):
+    """Prometheus float formatting"""
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        """Add to the counter for a label set"""
+        key = tuple((name, labels.get(name, '')) for name in self.label_names)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels):
+        """Current value for a label set"""
+        return self.values.get(tuple((name, labels.get(name, '')) for name in self.label_names), 0)
+
+    def render(self):
+        """Exposition lines"""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            items = sorted(self.values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+class Histogram:
+    """Cumulative-bucket histogram with labels"""
+
+    def __init__(self, name, help_text, label_names=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self.series = {}  # labels -> [bucket counts..., sum, count]
+        self.lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        """Record one observation"""
+        key = tuple((name, labels.get(name, '')) for name in self.label_names)
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        """Exposition lines"""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            items = sorted((key, list(series)) for key, series in self.series.items())
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                labels = key + (('le', _format_value(float(bound))),)
+                lines.append(f"{self.name}_bucket{_format_labels(labels)} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(key + (('le', '+Inf'),))} {series[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {series[-1]}")
+        return lines
+
+class Gauge:
+    """Gauge whose value is read from a callback at scrape time
+
+    The callback returns a number, or a dict of label-value tuple -> number.
+    Values tracked elsewhere as running totals can be exposed with
+    metric_type='counter'.
+    """
+
+    def __init__(self, name, help_text, callback, label_names=(), metric_type='gauge'):
+        self.name = name
+        self.help_text = help_text
+        self.callback = callback
+        self.label_names = tuple(label_names)
+        self.metric_type = metric_type
+
+    def render(self):
+        """Exposition lines"""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.metric_type}"]
+        try:
+            value = self.callback()
+        except Exception:
+            return lines
+        if value is None:
+            return lines
+        if isinstance(value, dict):
+            for label_values, sample in sorted(value.items()):
+                key = tuple(zip(self.label_names, label_values))
+                lines.append(f"{self.name}{_format_labels(key)} {_format_value(sample)}")
+        else:
+            lines.append(f"{self.name} {_format_value(value)}")
+        return lines
+
+class MetricsRegistry:
+    """All metrics of one backend process"""
+
+    def __init__(self, namespace='deenbot'):
+        self.namespace = namespace
+        self.metrics = []
+        self.in_flight = 0
+        self.in_flight_lock = threading.Lock()
+        self.caches = {}  # cache name -> callable returning (hits, misses)
+
+        self.requests = self.counter('http_requests_total', "HTTP requests by endpoint, method and status",
+                                     ('endpoint', 'method', 'status'))
+        self.request_duration = self.histogram('http_request_duration_seconds',
+                                               "HTTP request latency by endpoint", ('endpoint', 'method'))
+        self.source_duration = self.histogram('chat_source_duration_seconds',
+                                              "Time to answer a /chat message by routing source", ('source',))
+        self.gauge('http_requests_in_flight', "Requests currently being handled", lambda: self.in_flight)
+        self.gauge('cache_hits_total', "Cache hits since start", lambda: self._cache_values(0), ('cache',),
+                   metric_type='counter')
+        self.gauge('cache_misses_total', "Cache misses since start", lambda: self._cache_values(1), ('cache',),
+                   metric_type='counter')
+        self.gauge('cache_hit_ratio', "Cache hits / lookups since start", self._cache_ratios, ('cache',))
+        self.register_process_metrics()
+
+    def _name(self, name):
+        """Namespaced metric name"""
+        return f"{self.namespace}_{name}"
+
+    def counter(self, name, help_text, label_names=()):
+        """Create and register a counter"""
+        metric = Counter(self._name(name), help_text, label_names)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, label_names=(), buckets=LATENCY_BUCKETS):
+        """Create and register a histogram"""
+        metric = Histogram(self._name(name), help_text, label_names, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def gauge(self, name, help_text, callback, label_names=(), namespaced=True, metric_type='gauge'):
+        """Register a gauge read from callback at scrape time"""
+        metric = Gauge(self._name(name) if namespaced else name, help_text, callback, label_names, metric_type)
+        self.metrics.append(metric)
+        return metric
+
+    def register_cache(self, name, stats):
+        """Expose a cache's hit ratio; stats() returns (hits, misses)"""
+        self.caches[name] = stats
+
+    def _cache_values(self, index):
+        """Hits or misses per registered cache"""
+        return {(name,): stats()[index] for name, stats in list(self.caches.items())}
+
+    def _cache_ratios(self):
+        """Hit ratio per registered cache"""
+        ratios = {}
+        for name, stats in list(self.caches.items()):
+            hits, misses = stats()
+            ratios[(name,)] = hits / (hits + misses) if hits + misses else 0.0
+        return ratios
+
+    def register_process_metrics(self):
+        """Standard process_* RSS, CPU, thread and uptime gauges"""
+        started = time.time()
+        process = psutil.Process() if PSUTIL_AVAILABLE else None
+
+        def resident_memory():
+            if process is not None:
+                return process.memory_info().rss
+            try:
+                with open('/proc/self/statm') as f:
+                    return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+            except (OSError, ValueError):
+                return None
+
+        def cpu_seconds():
+            if process is not None:
+                times = process.cpu_times()
+                return times.user + times.system
+            if RESOURCE_AVAILABLE:
+                usage = resource.getrusage(resource.RUSAGE_SELF)
+                return usage.ru_utime + usage.ru_stime
+            return None
+
+        self.gauge('process_resident_memory_bytes', "Resident memory size in bytes", resident_memory, namespaced=False)
+        self.gauge('process_cpu_seconds_total', "Total user and system CPU time in seconds", cpu_seconds,
+                   namespaced=False, metric_type='counter')
+        self.gauge('process_threads', "Threads in the process", threading.active_count, namespaced=False)
+        self.gauge('process_start_time_seconds', "Start time of the process since the epoch", lambda: started,
+                   namespaced=False)
+
+    def request_started(self):
+        """Count a request as in flight"""
+        with self.in_flight_lock:
+            self.in_flight += 1
+
+    def request_finished(self, endpoint, method, status, seconds):
+        """Record a completed request"""
+        with self.in_flight_lock:
+            self.in_flight -= 1
+        self.requests.inc(endpoint=endpoint, method=method, status=str(status))
+        self.request_duration.observe(seconds, endpoint=endpoint, method=method)
+
+    def observe_source(self, source, seconds):
+        """Record the time taken to answer a message, by routing branch"""
+        self.source_duration.observe(seconds, source=routing_branch(source))
+
+    def render(self):
+        """Full /metrics page"""
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+def endpoint_label(path):
+    """Bounded endpoint label for a request path"""
+    path = path.split('?', 1)[0]
+    if path in KNOWN_ENDPOINTS:
+        return path
+    if path.endswith(STATIC_EXTENSIONS):
+        return 'static'
+    return 'other'
+
+class MetricsHandlerMixin:
+    """Times every request handled by a BaseHTTPRequestHandler subclass
+
+    List it before BaseHTTPRequestHandler and set `metrics` to a
+    MetricsRegistry on the handler class.
+    """
+
+    metrics = None
+
+    def handle_one_request(self):
+        self._metrics_started = None
+        self._metrics_status = None
+        try:
+            super().handle_one_request()
+        finally:
+            if self._metrics_started is not None and self.metrics is not None:
+                self.metrics.request_finished(
+                    endpoint_label(self.path), self.command, self._metrics_status or 0,
+                    time.perf_counter() - self._metrics_started
+                )
+
+    def parse_request(self):
+        parsed = super().parse_request()
+        if parsed and self.metrics is not None:
+            # Timing starts once the request line and headers are read
+            self._metrics_started = time.perf_counter()
+            self.metrics.request_started()
+        return parsed
+
+    def send_response(self, code, message=None):
+        self._metrics_status = code
+        super().send_response(code, message)
+
+    def send_metrics_response(self):
+        """Serve the registry in Prometheus text format"""
+        body = self.metrics.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
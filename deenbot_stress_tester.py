@@ -1,17 +1,23 @@
 #!/usr/bin/env python3
 """
-DeenBot Stress Tester - Comprehensive 5-Minute Stability Test
+DeenBot Stress Tester - Concurrent Load Generator and Stability Test
 Tests all variations of user text to ensure DeenBot won't crash
 """
 
 import time
 import json
 import random
+import argparse
 import threading
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import logging
 
+from latency_histogram import LatencyHistogram, HistogramSet, format_summary_table
+from deenbot_metrics import routing_branch
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,11 +31,19 @@ logging.basicConfig(
 class DeenBotStressTester:
     """Comprehensive stress testing for DeenBot stability"""
     
-    def __init__(self):
-        self.base_url = "http://localhost:8080"
-        self.test_duration = 300  # 5 minutes in seconds
-        self.test_interval = 0.5  # Test every 0.5 seconds
+    def __init__(self, base_url="http://localhost:8080", mode="closed", users=8, rate=20.0,
+                 duration=300, warmup=10, ramp=30, think_time=0.0):
+        self.base_url = base_url
+        self.mode = mode  # "closed" = virtual users, "open" = Poisson arrivals
+        self.users = users  # virtual users, or max in-flight requests in open-loop mode
+        self.rate = rate  # open-loop target arrivals per second
+        self.test_duration = duration  # measured seconds, after warm-up
+        self.warmup = warmup  # seconds of load that are sent but not recorded
+        self.ramp = ramp  # seconds over which load ramps up to full
+        self.test_interval = think_time  # closed-loop think time between requests
         self.running = False
+        self.lock = threading.Lock()
+        self.run_start = self.measure_start = self.end_time = 0.0
         self.test_results = {
             'total_requests': 0,
             'successful_requests': 0,
@@ -37,106 +51,140 @@ class DeenBotStressTester:
             'errors': [],
             'start_time': None,
             'end_time': None,
-            'crash_detected': False
+            'crash_detected': False,
+            'mode': mode,
+            'concurrency': users,
+            'target_rate': rate if mode == "open" else None,
+            'warmup_requests': 0
         }
         
-        # Comprehensive test data covering all Islamic topics
-        self.test_queries = [
-            # Basic Islamic questions
-            "What is Islam?",
-            "Who is Prophet Muhammad?",
-            "What are the five pillars?",
-            "How to pray?",
-            "What is halal?",
-            "What is haram?",
-            
-            # Quran related
-            "Tell me about Surah Al-Fatiha",
-            "What does the Quran say about charity?",
-            "Quran verses about patience",
-            "Quran on family values",
-            "Quran teachings on honesty",
-            "What does the Quran say about knowledge?",
-            
-            # Hadith related
-            "Hadith about kindness",
-            "Hadith about prayer",
-            "Hadith about honesty",
-            "Hadith about parents",
-            "Hadith about neighbors",
-            "Hadith about learning",
-            
-            # Islamic practices
-            "How to perform wudu?",
-            "How to fast during Ramadan?",
-            "How to give zakat?",
-            "How to perform Hajj?",
-            "How to read Quran?",
-            "How to make dua?",
-            
-            # Islamic ethics
-            "Islamic view on lying",
-            "Islamic view on stealing",
-            "Islamic view on helping others",
-            "Islamic view on education",
-            "Islamic view on business",
-            "Islamic view on marriage",
-            
-            # Complex queries
-            "What is the difference between Sunnah and Hadith?",
-            "Explain the concept of Taqwa in Islam",
-            "What are the conditions for a valid marriage in Islam?",
-            "How does Islam view modern technology?",
-            "What is the Islamic perspective on environmental protection?",
-            "How to deal with non-Muslims according to Islam?",
-            
-            # Edge cases and stress tests
-            "A" * 1000,  # Very long text
-            "1234567890" * 100,  # Numbers
-            "!@#$%^&*()" * 50,  # Special characters
-            "مرحبا بالعالم",  # Arabic text
-            "Hello World 你好世界 مرحبا بالعالم",  # Mixed languages
-            "",  # Empty string
-            
-            # Religious variations
-            "What is the meaning of Bismillah?",
-            "Explain the concept of Barakah",
-            "What is the significance of the number 786?",
-            "How to seek forgiveness in Islam?",
-            "What is the importance of Friday prayer?",
-            "How to deal with grief in Islam?",
-            
-            # Practical life questions
-            "Islamic way to greet someone",
-            "How to eat according to Sunnah?",
-            "Islamic etiquette for visiting",
-            "How to dress modestly?",
-            "Islamic rules for social media",
-            "How to be a good Muslim neighbor?",
-            
-            # Historical questions
-            "Tell me about the Battle of Badr",
-            "What happened during the Hijra?",
-            "Who were the first Muslims?",
-            "History of the Kaaba",
-            "Story of Prophet Ibrahim",
-            "Life of Prophet Muhammad's family",
-            
-            # Contemporary issues
-            "Islam and modern science",
-            "Islamic banking principles",
-            "Islam and social justice",
-            "Islamic view on democracy",
-            "Islam and human rights",
-            "Islamic perspective on climate change"
-        ]
+        # Latency histograms: overall, per query category and per routing branch
+        self.latency = LatencyHistogram()
+        self.latency_by_category = HistogramSet()
+        self.latency_by_source = HistogramSet()
+        self.timeline = {}  # measured second -> {'requests': n, 'errors': n}
+        
+        # Pooled keep-alive connections shared by all load threads
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(users, 1), pool_block=True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        # Health probes get their own connection so they never queue behind load traffic
+        self.health_session = requests.Session()
+        health_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+        self.health_session.mount("http://", health_adapter)
+        self.health_session.mount("https://", health_adapter)
+        
+        # Comprehensive test data covering all Islamic topics, grouped by category
+        self.query_categories = {
+            "Basic Islamic questions": [
+                "What is Islam?",
+                "Who is Prophet Muhammad?",
+                "What are the five pillars?",
+                "How to pray?",
+                "What is halal?",
+                "What is haram?"
+            ],
+            "Quran related": [
+                "Tell me about Surah Al-Fatiha",
+                "What does the Quran say about charity?",
+                "Quran verses about patience",
+                "Quran on family values",
+                "Quran teachings on honesty",
+                "What does the Quran say about knowledge?"
+            ],
+            "Hadith related": [
+                "Hadith about kindness",
+                "Hadith about prayer",
+                "Hadith about honesty",
+                "Hadith about parents",
+                "Hadith about neighbors",
+                "Hadith about learning"
+            ],
+            "Islamic practices": [
+                "How to perform wudu?",
+                "How to fast during Ramadan?",
+                "How to give zakat?",
+                "How to perform Hajj?",
+                "How to read Quran?",
+                "How to make dua?"
+            ],
+            "Islamic ethics": [
+                "Islamic view on lying",
+                "Islamic view on stealing",
+                "Islamic view on helping others",
+                "Islamic view on education",
+                "Islamic view on business",
+                "Islamic view on marriage"
+            ],
+            "Complex queries": [
+                "What is the difference between Sunnah and Hadith?",
+                "Explain the concept of Taqwa in Islam",
+                "What are the conditions for a valid marriage in Islam?",
+                "How does Islam view modern technology?",
+                "What is the Islamic perspective on environmental protection?",
+                "How to deal with non-Muslims according to Islam?"
+            ],
+            "Edge cases and stress tests": [
+                "A" * 1000,  # Very long text
+                "1234567890" * 100,  # Numbers
+                "!@#$%^&*()" * 50,  # Special characters
+                "مرحبا بالعالم",  # Arabic text
+                "Hello World 你好世界 مرحبا بالعالم",  # Mixed languages
+                ""  # Empty string
+            ],
+            "Religious variations": [
+                "What is the meaning of Bismillah?",
+                "Explain the concept of Barakah",
+                "What is the significance of the number 786?",
+                "How to seek forgiveness in Islam?",
+                "What is the importance of Friday prayer?",
+                "How to deal with grief in Islam?"
+            ],
+            "Practical life questions": [
+                "Islamic way to greet someone",
+                "How to eat according to Sunnah?",
+                "Islamic etiquette for visiting",
+                "How to dress modestly?",
+                "Islamic rules for social media",
+                "How to be a good Muslim neighbor?"
+            ],
+            "Historical questions": [
+                "Tell me about the Battle of Badr",
+                "What happened during the Hijra?",
+                "Who were the first Muslims?",
+                "History of the Kaaba",
+                "Story of Prophet Ibrahim",
+                "Life of Prophet Muhammad's family"
+            ],
+            "Contemporary issues": [
+                "Islam and modern science",
+                "Islamic banking principles",
+                "Islam and social justice",
+                "Islamic view on democracy",
+                "Islam and human rights",
+                "Islamic perspective on climate change"
+            ]
+        }
+        self.test_queries = [query for queries in self.query_categories.values() for query in queries]
         
         # Additional random variations
         self.random_prefixes = ["Please", "Can you", "I need to know", "Tell me", "Explain", "What is", "How to"]
         self.random_suffixes = ["?", "!", "...", " please", " thank you", " in detail", " briefly"]
         
+        # Pre-generate the query mix so load threads only pick from a list
+        self.query_pool = [
+            (category, variation)
+            for category, queries in self.query_categories.items()
+            for query in queries
+            for variation in self.generate_variation(query)
+        ]
+        
         logging.info("🚀 DeenBot Stress Tester initialized")
         logging.info(f"📊 Will test {len(self.test_queries)} base queries for {self.test_duration} seconds")
+        logging.info(f"⚙️ Mode: {mode}-loop, {users} {'virtual users' if mode == 'closed' else 'max in-flight'}"
+                     f"{f', {rate} req/s target' if mode == 'open' else ''}, {warmup}s warm-up, {ramp}s ramp")
     
     def generate_variation(self, base_query):
         """Generate variations of a base query"""
@@ -166,114 +214,206 @@ class DeenBotStressTester:
         
         return variations
     
-    def test_query(self, query):
-        """Test a single query against DeenBot"""
+    def _record(self, success, error_msg=None, crash=False, latency=None, category=None, source=None):
+        """Record one measured request outcome and its latency in seconds"""
+        if latency is not None:
+            self.latency.record_seconds(latency)
+            if category:
+                self.latency_by_category.record_seconds(category, latency)
+            if source:
+                self.latency_by_source.record_seconds(source, latency)
+        
+        with self.lock:
+            self.test_results['total_requests'] += 1
+            if success:
+                self.test_results['successful_requests'] += 1
+            elif not crash:
+                self.test_results['failed_requests'] += 1
+            if error_msg:
+                self.test_results['errors'].append(error_msg)
+            if crash:
+                self.test_results['crash_detected'] = True
+            
+            second = self.timeline.setdefault(int(max(time.time() - self.measure_start, 0)), {'requests': 0, 'errors': 0})
+            second['requests'] += 1
+            if not success:
+                second['errors'] += 1
+            return self.test_results['total_requests']
+    
+    def test_query(self, query, record=True, category=None, scheduled=None):
+        """Test a single query against DeenBot
+        
+        Latency is measured from `scheduled` when given (open-loop arrival
+        time) so queueing delay caused by a slow server is not hidden.
+        """
+        if not record:
+            # Warm-up request: exercise the server without counting it
+            try:
+                self.session.post(f"{self.base_url}/chat", json={"message": query}, timeout=30).close()
+            except requests.exceptions.RequestException:
+                pass
+            with self.lock:
+                self.test_results['warmup_requests'] += 1
+            return True
+        
+        started = scheduled if scheduled is not None else time.time()
         try:
             # Prepare request
             payload = {"message": query}
             headers = {"Content-Type": "application/json"}
             
-            # Make request with timeout
-            response = requests.post(
+            # Make request with timeout over the pooled session
+            response = self.session.post(
                 f"{self.base_url}/chat",
                 json=payload,
                 headers=headers,
                 timeout=30
             )
             
+            latency = time.time() - started
+            
             if response.status_code == 200:
-                self.test_results['successful_requests'] += 1
+                try:
+                    source = routing_branch(response.json().get('source'))
+                except ValueError:
+                    source = "Unknown"
+                total = self._record(True, latency=latency, category=category, source=source)
                 logging.debug(f"✅ Query successful: '{query[:50]}...'")
+                self.log_progress(total)
                 return True
             else:
-                self.test_results['failed_requests'] += 1
                 error_msg = f"HTTP {response.status_code}: {query[:50]}..."
-                self.test_results['errors'].append(error_msg)
+                total = self._record(False, error_msg, latency=latency, category=category,
+                                     source=f"HTTP {response.status_code}")
                 logging.warning(f"❌ Query failed: {error_msg}")
+                self.log_progress(total)
                 return False
                 
         except requests.exceptions.Timeout:
-            self.test_results['failed_requests'] += 1
             error_msg = f"Timeout: {query[:50]}..."
-            self.test_results['errors'].append(error_msg)
+            self._record(False, error_msg, latency=time.time() - started, category=category, source="Timeout")
             logging.error(f"⏰ Query timeout: {error_msg}")
             return False
             
         except requests.exceptions.ConnectionError:
-            self.test_results['crash_detected'] = True
             error_msg = f"Connection error - DeenBot may have crashed: {query[:50]}..."
-            self.test_results['errors'].append(error_msg)
+            self._record(False, error_msg, crash=True)
             logging.critical(f"💥 CRASH DETECTED: {error_msg}")
             return False
             
         except Exception as e:
-            self.test_results['failed_requests'] += 1
             error_msg = f"Exception {type(e).__name__}: {query[:50]}..."
-            self.test_results['errors'].append(error_msg)
+            self._record(False, error_msg)
             logging.error(f"❌ Query exception: {error_msg}")
             return False
     
+    def log_progress(self, total):
+        """Log progress every 500 measured requests"""
+        if total % 500 == 0:
+            elapsed = time.time() - self.measure_start
+            remaining = self.test_duration - elapsed
+            success_rate = (self.test_results['successful_requests'] / total) * 100
+            logging.info(f"📊 Progress: {total} requests, {total / max(elapsed, 1e-9):.1f} req/s, "
+                         f"{success_rate:.1f}% success, {remaining:.1f}s remaining")
+    
     def health_check(self):
         """Check if DeenBot is still responding"""
         try:
-            response = requests.get(f"{self.base_url}/health", timeout=10)
+            response = self.health_session.get(f"{self.base_url}/health", timeout=10)
             return response.status_code == 200
         except:
             return False
     
+    def ramp_fraction(self, elapsed):
+        """Fraction of full load at `elapsed` seconds into the run"""
+        if self.ramp <= 0 or elapsed >= self.ramp:
+            return 1.0
+        return max(elapsed / self.ramp, 0.0)
+    
+    def is_measuring(self, now):
+        """True once warm-up is over"""
+        return now >= self.measure_start
+    
+    def virtual_user(self, user_index):
+        """Closed-loop virtual user: send, wait for the reply, think, repeat"""
+        # Stagger user start times across the ramp phase
+        start_delay = self.ramp * user_index / max(self.users, 1)
+        time.sleep(start_delay)
+        
+        while self.running and time.time() < self.end_time:
+            category, query = random.choice(self.query_pool)
+            self.test_query(query, record=self.is_measuring(time.time()), category=category)
+            if self.test_interval > 0:
+                time.sleep(self.test_interval)
+    
+    def run_closed_loop(self):
+        """Run `users` virtual users concurrently until the end time"""
+        threads = [
+            threading.Thread(target=self.virtual_user, args=(i,), daemon=True)
+            for i in range(self.users)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(timeout=0.5)
+    
+    def run_open_loop(self):
+        """Send requests on a Poisson arrival schedule regardless of response times"""
+        executor = ThreadPoolExecutor(max_workers=max(self.users, 1))
+        next_arrival = self.run_start
+        try:
+            while self.running and next_arrival < self.end_time:
+                # Exponential inter-arrival gaps at the (ramping) current rate
+                current_rate = self.rate * max(self.ramp_fraction(next_arrival - self.run_start), 0.01)
+                next_arrival += random.expovariate(current_rate)
+                delay = next_arrival - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+                if next_arrival >= self.end_time:
+                    break
+                category, query = random.choice(self.query_pool)
+                executor.submit(self.test_query, query, self.is_measuring(next_arrival), category, next_arrival)
+        finally:
+            # Requests still queued at the end were never sent
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def monitor_health(self):
+        """Health check every 10 seconds while the test runs"""
+        while self.running:
+            time.sleep(10)
+            if self.running and not self.health_check():
+                logging.critical("💥 DeenBot has crashed during stress test!")
+                with self.lock:
+                    self.test_results['crash_detected'] = True
+                self.running = False
+    
     def run_stress_test(self):
-        """Run the comprehensive 5-minute stress test"""
-        logging.info("🔥 Starting DeenBot Stress Test - 5 Minutes of Continuous Testing")
+        """Run the load test: warm-up, ramp, then the measured duration"""
+        logging.info(f"🔥 Starting DeenBot Stress Test - {self.mode}-loop load for {self.test_duration} seconds")
         logging.info("=" * 70)
         
-        self.test_results['start_time'] = datetime.now()
         self.running = True
+        self.run_start = time.time()
+        self.measure_start = self.run_start + self.warmup
+        self.end_time = self.measure_start + self.test_duration
+        self.test_results['start_time'] = datetime.fromtimestamp(self.measure_start)
         
-        start_time = time.time()
-        last_health_check = start_time
+        health_thread = threading.Thread(target=self.monitor_health, daemon=True)
+        health_thread.start()
+        
+        try:
+            if self.mode == "open":
+                self.run_open_loop()
+            else:
+                self.run_closed_loop()
+        except KeyboardInterrupt:
+            logging.info("🛑 Stress test interrupted by user")
+        except Exception as e:
+            logging.error(f"❌ Error in stress test loop: {e}")
         
-        while self.running and (time.time() - start_time) < self.test_duration:
-            try:
-                # Health check every 10 seconds
-                if time.time() - last_health_check >= 10:
-                    if not self.health_check():
-                        logging.critical("💥 DeenBot has crashed during stress test!")
-                        self.test_results['crash_detected'] = True
-                        break
-                    last_health_check = time.time()
-                
-                # Test random queries
-                base_query = random.choice(self.test_queries)
-                variations = self.generate_variation(base_query)
-                
-                for variation in variations:
-                    if not self.running or (time.time() - start_time) >= self.test_duration:
-                        break
-                    
-                    self.test_results['total_requests'] += 1
-                    success = self.test_query(variation)
-                    
-                    # Log progress every 50 requests
-                    if self.test_results['total_requests'] % 50 == 0:
-                        elapsed = time.time() - start_time
-                        remaining = self.test_duration - elapsed
-                        success_rate = (self.test_results['successful_requests'] / self.test_results['total_requests']) * 100
-                        
-                        logging.info(f"📊 Progress: {self.test_results['total_requests']} requests, "
-                                   f"{success_rate:.1f}% success, {remaining:.1f}s remaining")
-                    
-                    # Small delay between requests
-                    time.sleep(self.test_interval)
-                
-            except KeyboardInterrupt:
-                logging.info("🛑 Stress test interrupted by user")
-                break
-            except Exception as e:
-                logging.error(f"❌ Error in stress test loop: {e}")
-                time.sleep(1)
-        
-        self.test_results['end_time'] = datetime.now()
         self.running = False
+        self.test_results['end_time'] = datetime.fromtimestamp(min(time.time(), self.end_time))
         
         # Final health check
         if self.health_check():
@@ -282,6 +422,37 @@ class DeenBotStressTester:
             logging.critical("💥 DeenBot crashed during stress test!")
             self.test_results['crash_detected'] = True
     
+    def throughput_timeline(self, window=1):
+        """Completed requests and errors per `window` seconds of the measured run"""
+        with self.lock:
+            seconds = dict(self.timeline)
+        if not seconds:
+            return []
+        window = max(int(window), 1)
+        timeline = []
+        for window_start in range(0, max(seconds) + 1, window):
+            requests_done = errors = 0
+            for second in range(window_start, window_start + window):
+                requests_done += seconds.get(second, {}).get('requests', 0)
+                errors += seconds.get(second, {}).get('errors', 0)
+            timeline.append({
+                'second': window_start,
+                'requests': requests_done,
+                'errors': errors,
+                'requests_per_second': round(requests_done / window, 2)
+            })
+        return timeline
+    
+    def latency_results(self):
+        """Latency percentiles overall, by query category and by routing branch"""
+        return {
+            'overall': self.latency.summary(),
+            'by_category': self.latency_by_category.summary(),
+            'by_source': self.latency_by_source.summary(),
+            'measured_from': 'scheduled arrival' if self.mode == "open" else 'request send',
+            'histogram_buckets_us': self.latency.buckets()
+        }
+    
     def generate_report(self):
         """Generate comprehensive test report"""
         if not self.test_results['start_time']:
@@ -289,6 +460,7 @@ class DeenBotStressTester:
         
         duration = (self.test_results['end_time'] - self.test_results['start_time']).total_seconds()
         success_rate = (self.test_results['successful_requests'] / max(self.test_results['total_requests'], 1)) * 100
+        latency = self.latency.summary()
         
         report = f"""
 🕌 DEENBOT STRESS TEST REPORT
@@ -300,6 +472,11 @@ class DeenBotStressTester:
 ✅ Successful: {self.test_results['successful_requests']:,}
 ❌ Failed: {self.test_results['failed_requests']:,}
 📈 Success Rate: {success_rate:.1f}%
+🚀 Throughput: {self.test_results['total_requests'] / max(duration, 1e-9):.1f} req/s
+⚙️  Load: {self.test_results['mode']}-loop, {self.test_results['concurrency']} {'virtual users' if self.test_results['mode'] == 'closed' else 'max in-flight'}{f", {self.test_results['target_rate']} req/s target" if self.test_results['target_rate'] else ''}
+🔥 Warm-up requests (not counted): {self.test_results['warmup_requests']:,}
+
+⏱️  Latency: p50 {latency['p50_ms']:.1f}ms | p90 {latency['p90_ms']:.1f}ms | p99 {latency['p99_ms']:.1f}ms | p99.9 {latency['p99.9_ms']:.1f}ms | max {latency['max_ms']:.1f}ms
 
 🚨 CRASH STATUS: {'💥 CRASHED' if self.test_results['crash_detected'] else '✅ STABLE'}
 
@@ -317,6 +494,15 @@ class DeenBotStressTester:
         else:
             report += "   No errors recorded\n"
         
+        report += "\n" + format_summary_table("🧭 LATENCY BY ROUTING BRANCH:", self.latency_by_source.summary()) + "\n"
+        report += "\n" + format_summary_table("🗂️  LATENCY BY QUERY CATEGORY:", self.latency_by_category.summary()) + "\n"
+        
+        # Keep the text timeline to about 20 rows; the JSON has per-second detail
+        window = max(int(duration // 20), 1)
+        report += f"\n📈 THROUGHPUT OVER TIME ({window}s windows):\n"
+        for point in self.throughput_timeline(window):
+            report += f"   {point['second']:>5}s  {point['requests_per_second']:>8.1f} req/s  {point['errors']:>5} errors\n"
+        
         report += f"""
 
 🎯 RECOMMENDATION: {'❌ FAILED - DeenBot needs fixing' if self.test_results['crash_detected'] else '✅ PASSED - DeenBot is stable'}
@@ -336,6 +522,8 @@ class DeenBotStressTester:
             json_results['start_time'] = json_results['start_time'].isoformat()
         if json_results['end_time']:
             json_results['end_time'] = json_results['end_time'].isoformat()
+        json_results['latency'] = self.latency_results()
+        json_results['throughput_timeline'] = self.throughput_timeline()
         
         with open(results_file, 'w') as f:
             json.dump(json_results, f, indent=2)
@@ -345,40 +533,68 @@ class DeenBotStressTester:
 
 def main():
     """Main function to run the stress test"""
-    print("🕌 DeenBot Stress Tester - 5-Minute Stability Test")
+    parser = argparse.ArgumentParser(description="DeenBot load generator and stability test")
+    parser.add_argument('--url', default="http://localhost:8080", help="DeenBot base URL")
+    parser.add_argument('--mode', choices=['closed', 'open'], default='closed',
+                        help="closed: virtual users wait for replies; open: Poisson arrivals at --rate")
+    parser.add_argument('--users', type=int, default=8,
+                        help="virtual users (closed) or maximum in-flight requests (open)")
+    parser.add_argument('--rate', type=float, default=20.0, help="open-loop target requests per second")
+    parser.add_argument('--duration', type=float, default=300, help="measured seconds after warm-up")
+    parser.add_argument('--warmup', type=float, default=10, help="seconds of unrecorded warm-up load")
+    parser.add_argument('--ramp', type=float, default=30, help="seconds to ramp up to full load")
+    parser.add_argument('--think-time', type=float, default=0.0, help="closed-loop pause between requests")
+    parser.add_argument('--yes', action='store_true', help="start without the confirmation prompt")
+    args = parser.parse_args()
+    
+    print("🕌 DeenBot Stress Tester - Concurrent Load Test")
     print("=" * 60)
     
     # Check if DeenBot is running
     try:
-        response = requests.get("http://localhost:8080/health", timeout=5)
+        response = requests.get(f"{args.url}/health", timeout=5)
         if response.status_code != 200:
-            print("❌ DeenBot is not running on port 8080")
+            print(f"❌ DeenBot is not running at {args.url}")
             print("   Please start DeenBot first using: ./start_deenbot_local.sh")
             return
     except:
-        print("❌ Cannot connect to DeenBot on port 8080")
+        print(f"❌ Cannot connect to DeenBot at {args.url}")
         print("   Please start DeenBot first using: ./start_deenbot_local.sh")
         return
     
+    total_seconds = args.warmup + args.duration
     print("✅ DeenBot is running and ready for stress testing")
-    print("🔥 This will test DeenBot continuously for 5 minutes")
+    if args.mode == 'open':
+        print(f"🔥 Open-loop load: {args.rate} req/s Poisson arrivals, up to {args.users} in flight")
+    else:
+        print(f"🔥 Closed-loop load: {args.users} virtual users, {args.think_time}s think time")
+    print(f"⏳ {args.warmup:.0f}s warm-up + {args.duration:.0f}s measured ({args.ramp:.0f}s ramp)")
     print("📊 Testing all variations of user text and edge cases")
     print("")
     
     # Confirm before starting
-    response = input("🚀 Start the 5-minute stress test? (y/N): ").strip().lower()
-    if response not in ['y', 'yes']:
-        print("❌ Stress test cancelled")
-        return
+    if not args.yes:
+        response = input(f"🚀 Start the {total_seconds:.0f}-second stress test? (y/N): ").strip().lower()
+        if response not in ['y', 'yes']:
+            print("❌ Stress test cancelled")
+            return
     
     print("")
     print("🔥 Starting comprehensive stress test...")
-    print("⏳ This will take exactly 5 minutes")
     print("📊 Monitor progress in the logs below")
     print("")
     
     # Create and run stress tester
-    tester = DeenBotStressTester()
+    tester = DeenBotStressTester(
+        base_url=args.url,
+        mode=args.mode,
+        users=args.users,
+        rate=args.rate,
+        duration=args.duration,
+        warmup=args.warmup,
+        ramp=args.ramp,
+        think_time=args.think_time
+    )
     
     try:
         tester.run_stress_test()
@@ -406,7 +622,7 @@ def main():
         return 1
     else:
         print("\n🎉 RECOMMENDATION: DeenBot PASSED the stress test!")
-        print("   The service remained stable for 5 continuous minutes.")
+        print("   The service remained stable for the full test duration.")
         print("   It's ready for production deployment.")
         return 0
 
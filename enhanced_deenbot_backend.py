@@ -8,29 +8,39 @@ import json
 import logging
 import threading
 import time
-import sqlite3
-import pickle
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
-import numpy as np
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, deque
 
-# Advanced NLP imports (will be installed via requirements.txt)
-try:
-    from sentence_transformers import SentenceTransformer
-    from sklearn.metrics.pairwise import cosine_similarity
-    from textblob import TextBlob
-    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-    import emoji
-    ADVANCED_NLP_AVAILABLE = True
-except ImportError:
-    ADVANCED_NLP_AVAILABLE = False
-    print("⚠️ Advanced NLP libraries not available. Using basic keyword matching.")
-
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import parse_qs, urlparse
 import os
 
+from deenbot_metrics import MetricsRegistry, MetricsHandlerMixin
+from backend_startup import BackgroundInitializer, RETRY_AFTER_SECONDS, modules_available
+from learning_database import (LearningDatabase, LearnedPatternIndex, read_learning_stats, prune_conversations,
+                               RETENTION_DAYS)
+
+# Time-to-ready is measured from here to the end of the background initialization
+BOOT_STARTED = time.perf_counter()
+
+# Advanced NLP libraries (will be installed via requirements.txt) are imported
+# by _initialize_nlp(); only check here that they are installed
+ADVANCED_NLP_AVAILABLE = modules_available('sentence_transformers', 'sklearn', 'textblob', 'vaderSentiment', 'emoji')
+if not ADVANCED_NLP_AVAILABLE:
+    print("⚠️ Advanced NLP libraries not available. Using basic keyword matching.")
+
+# A learned strategy answers without the semantic pass once it has been used this often
+# and users rate its answers this well (rolling score of ratings, 0-1)
+LEARNED_MIN_EFFECTIVENESS = 0.8
+LEARNED_MIN_USAGE = 3
+
+# Structural patterns too generic to stand for the kind of message; learned but never replayed
+GENERIC_PATTERNS = frozenset({'question_pattern', 'short_message', 'long_message'})
+
+# Recent interactions kept in memory (learned patterns live in the pattern index)
+LEARNING_MEMORY_SIZE = 1000
+
 # Configure comprehensive logging
 try:
     logging.basicConfig(
@@ -58,7 +68,9 @@ class EnhancedDeenBot:
         self.conversation_history = defaultdict(list)
         self.user_preferences = {}
         self.response_effectiveness = defaultdict(list)
-        self.learning_data = []
+        self.learning_data = deque(maxlen=LEARNING_MEMORY_SIZE)
+        self.pattern_index = LearnedPatternIndex()
+        self.db = None
         
         # Initialize NLP components
         if ADVANCED_NLP_AVAILABLE:
@@ -73,8 +85,15 @@ class EnhancedDeenBot:
         logging.info("🚀 Enhanced DeenBot initialized with advanced capabilities")
     
     def _initialize_nlp(self):
-        """Initialize NLP components"""
+        """Import and initialize NLP components"""
+        global ADVANCED_NLP_AVAILABLE, cosine_similarity, emoji
         try:
+            from sentence_transformers import SentenceTransformer
+            from sklearn.metrics.pairwise import cosine_similarity
+            from textblob import TextBlob
+            from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+            import emoji
+            
             # Sentence embeddings for semantic understanding
             self.sentence_model = SentenceTransformer('all-MiniLM-L6-v2')
             
@@ -93,42 +112,13 @@ class EnhancedDeenBot:
         """Initialize SQLite database for learning and context"""
         try:
             self.db_path = "deenbot_learning.db"
-            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            self.cursor = self.conn.cursor()
-            
-            # Create tables for learning
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS conversations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id TEXT,
-                    message TEXT,
-                    response TEXT,
-                    timestamp DATETIME,
-                    effectiveness_score REAL,
-                    context TEXT
-                )
-            ''')
+            # One WAL connection per thread: requests and the monitor never share a cursor
+            self.db = LearningDatabase(self.db_path)
             
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_preferences (
-                    user_id TEXT PRIMARY KEY,
-                    preferences TEXT,
-                    last_updated DATETIME
-                )
-            ''')
+            # Create or upgrade the learning tables, indexes and stats counters
+            version = self.db.migrate()
             
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS learned_patterns (
-                    pattern TEXT PRIMARY KEY,
-                    response_type TEXT,
-                    effectiveness REAL,
-                    usage_count INTEGER,
-                    last_used DATETIME
-                )
-            ''')
-            
-            self.conn.commit()
-            logging.info("✅ Learning database initialized")
+            logging.info(f"✅ Learning database initialized (schema v{version})")
         except Exception as e:
             logging.error(f"❌ Database initialization failed: {e}")
     
@@ -383,19 +373,11 @@ class EnhancedDeenBot:
         }
     
     def _load_learned_patterns(self):
-        """Load previously learned response patterns"""
+        """Load the most-used learned response patterns into the pattern index"""
         try:
-            self.cursor.execute("SELECT pattern, response_type, effectiveness FROM learned_patterns")
-            patterns = self.cursor.fetchall()
-            
-            for pattern, response_type, effectiveness in patterns:
-                self.learning_data.append({
-                    'pattern': pattern,
-                    'response_type': response_type,
-                    'effectiveness': effectiveness
-                })
+            loaded = self.pattern_index.load(self.db.connection())
             
-            logging.info(f"✅ Loaded {len(patterns)} learned patterns")
+            logging.info(f"✅ Loaded {loaded} learned patterns")
         except Exception as e:
             logging.error(f"❌ Failed to load learned patterns: {e}")
     
@@ -484,8 +466,8 @@ class EnhancedDeenBot:
             
             return {
                 "response": response['answer'],
-                "references": response['references"],
-                "source": response['source"],
+                "references": response['references'],
+                "source": response['source'],
                 "confidence": response['confidence'],
                 "response_time": response_time,
                 "context_used": context
@@ -511,20 +493,39 @@ class EnhancedDeenBot:
         if keyword_response:
             return keyword_response
         
-        # Strategy 2: Semantic similarity (if NLP available)
+        # Strategy 2: A strategy learned to work well for this kind of message skips the semantic pass
+        learned_response = self._learned_strategy_response(message, context)
+        if learned_response:
+            return learned_response
+        
+        # Strategy 3: Semantic similarity (if NLP available)
         if ADVANCED_NLP_AVAILABLE:
             semantic_response = self._semantic_matching(message)
             if semantic_response and semantic_response['confidence'] > 0.7:
                 return semantic_response
         
-        # Strategy 3: Context-based response
+        # Strategy 4: Context-based response
         context_response = self._context_based_response(message, context)
         if context_response:
             return context_response
         
-        # Strategy 4: Fallback response
+        # Strategy 5: Fallback response
         return self._get_fallback_response(context)
     
+    def _learned_strategy_response(self, message: str, context: Dict) -> Optional[Dict[str, any]]:
+        """Answer with the strategy the pattern index has learned for this message's patterns
+        
+        Only cheap strategies are replayed; keyword matching has already run,
+        and a learned semantic match still needs the semantic pass.
+        """
+        patterns = [pattern for pattern in self._extract_patterns(message) if pattern not in GENERIC_PATTERNS]
+        learned = self.pattern_index.best(patterns, LEARNED_MIN_EFFECTIVENESS, LEARNED_MIN_USAGE)
+        if learned is None:
+            return None
+        if learned[0] == "sentiment_analysis":
+            return self._context_based_response(message, context)
+        return None
+    
     def _keyword_matching(self, message_lower: str) -> Optional[Dict[str, any]]:
         """Enhanced keyword matching with emotional intelligence"""
         try:
@@ -703,14 +704,19 @@ I can help with:
     def _learn_from_interaction(self, message: str, response: Dict, user_id: str, context: Dict):
         """Learn from user interaction to improve future responses"""
         try:
-            # Store interaction in database
-            self.cursor.execute('''
-                INSERT INTO conversations (user_id, message, response, timestamp, context)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (user_id, message, response['answer'], datetime.now().isoformat(), json.dumps(context)))
+            with self.db.transaction() as conn:
+                # Store interaction in database
+                conversation_id = conn.execute('''
+                    INSERT INTO conversations (user_id, message, response, timestamp, context)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (user_id, message, response['answer'], datetime.now().isoformat(), json.dumps(context))).lastrowid
+                
+                # Update learned patterns in the same transaction
+                learned = self._update_learned_patterns(conn, conversation_id, message, response, context)
             
-            # Update learned patterns
-            self._update_learned_patterns(message, response, context)
+            # Committed: bring the pattern index in line with the rows just written
+            for row in learned:
+                self.pattern_index.record(*row)
             
             # Store in memory for quick access
             self.learning_data.append({
@@ -720,28 +726,42 @@ I can help with:
                 'timestamp': datetime.now().isoformat()
             })
             
-            self.conn.commit()
-            
         except Exception as e:
             logging.error(f"❌ Failed to learn from interaction: {e}")
     
-    def _update_learned_patterns(self, message: str, response: Dict, context: Dict):
-        """Update learned response patterns"""
-        try:
-            # Extract key patterns from message
-            patterns = self._extract_patterns(message)
-            
-            for pattern in patterns:
-                self.cursor.execute('''
-                    INSERT OR REPLACE INTO learned_patterns 
-                    (pattern, response_type, effectiveness, usage_count, last_used)
-                    VALUES (?, ?, ?, COALESCE((SELECT usage_count + 1 FROM learned_patterns WHERE pattern = ?), 1), ?)
-                ''', (pattern, response['strategy'], response['confidence'], pattern, datetime.now().isoformat()))
-            
-            self.conn.commit()
-            
-        except Exception as e:
-            logging.error(f"❌ Failed to update patterns: {e}")
+    def _update_learned_patterns(self, conn, conversation_id: int, message: str, response: Dict, context: Dict) -> List[Tuple]:
+        """Update learned response patterns within the caller's transaction
+        
+        Effectiveness is left to user ratings of the conversation (see the
+        user_feedback trigger) and cleared when a pattern changes strategy.
+        Returns the (pattern, response_type, effectiveness, usage_count) rows
+        as stored, for the pattern index. Errors propagate, so the caller's
+        transaction rolls back the conversation and every pattern row together.
+        """
+        learned = []
+        # Extract key patterns from message
+        patterns = self._extract_patterns(message)
+        
+        for pattern in patterns:
+            # Upsert rather than REPLACE, so only new patterns fire the stats insert trigger
+            learned.append(conn.execute('''
+                INSERT INTO learned_patterns 
+                (pattern, response_type, effectiveness, usage_count, last_used)
+                VALUES (?, ?, NULL, 1, ?)
+                ON CONFLICT (pattern) DO UPDATE SET
+                    response_type = excluded.response_type,
+                    effectiveness = CASE WHEN response_type IS excluded.response_type THEN effectiveness END,
+                    usage_count = COALESCE(usage_count, 0) + 1,
+                    last_used = excluded.last_used
+                RETURNING pattern, response_type, effectiveness, usage_count
+            ''', (pattern, response['strategy'], datetime.now().isoformat())).fetchone())
+            # Lets a later rating of this conversation score the pattern
+            conn.execute('''
+                INSERT OR IGNORE INTO conversation_patterns (conversation_id, pattern, response_type)
+                VALUES (?, ?, ?)
+            ''', (conversation_id, pattern, response['strategy']))
+        
+        return learned
     
     def _extract_patterns(self, message: str) -> List[str]:
         """Extract learning patterns from message"""
@@ -773,27 +793,14 @@ I can help with:
     def get_learning_stats(self) -> Dict[str, any]:
         """Get learning statistics"""
         try:
-            # Total conversations
-            self.cursor.execute("SELECT COUNT(*) FROM conversations")
-            total_conversations = self.cursor.fetchone()[0]
-            
-            # Response effectiveness
-            self.cursor.execute("SELECT AVG(effectiveness_score) FROM conversations WHERE effectiveness_score IS NOT NULL")
-            avg_effectiveness = self.cursor.fetchone()[0] or 0.0
-            
-            # Pattern usage
-            self.cursor.execute("SELECT COUNT(*) FROM learned_patterns")
-            total_patterns = self.cursor.fetchone()[0]
-            
-            # User engagement
-            self.cursor.execute("SELECT COUNT(DISTINCT user_id) FROM conversations")
-            unique_users = self.cursor.fetchone()[0]
+            # Conversations, effectiveness, patterns and users from the trigger-maintained summary row
+            stats = read_learning_stats(self.db.connection())
             
             return {
-                "total_conversations": total_conversations,
-                "average_effectiveness": round(avg_effectiveness, 2),
-                "learned_patterns": total_patterns,
-                "unique_users": unique_users,
+                "total_conversations": stats['total_conversations'],
+                "average_effectiveness": round(stats['average_effectiveness'], 2),
+                "learned_patterns": stats['learned_patterns'],
+                "unique_users": stats['unique_users'],
                 "nlp_available": ADVANCED_NLP_AVAILABLE,
                 "learning_active": True
             }
@@ -808,8 +815,8 @@ I can help with:
             logging.info("🔄 Reinitializing critical components...")
             
             # Reinitialize database connection
-            if hasattr(self, 'conn') and self.conn:
-                self.conn.close()
+            if self.db:
+                self.db.close()
             self._initialize_database()
             
             # Reinitialize NLP components if available
@@ -828,10 +835,25 @@ I can help with:
 # Global variables
 start_time = time.time()
 deenbot = None
-
-class EnhancedDeenBotHandler(BaseHTTPRequestHandler):
+startup = BackgroundInitializer('Enhanced DeenBot', BOOT_STARTED)
+
+# Prometheus metrics served from /metrics
+metrics = MetricsRegistry()
+metrics.gauge('sqlite_write_queue_depth', "Learning database writes waiting or in progress",
+              lambda: deenbot.db.pending_writes if deenbot and deenbot.db else 0)
+metrics.gauge('sqlite_open_connections', "Per-thread learning database connections currently open",
+              lambda: deenbot.db.open_connections() if deenbot and deenbot.db else 0)
+metrics.gauge('conversation_memory_entries', "Interactions held in memory for learning",
+              lambda: len(deenbot.learning_data) if deenbot else 0)
+metrics.gauge('learned_pattern_index_entries', "Learned patterns held in the in-memory index",
+              lambda: len(deenbot.pattern_index.patterns) if deenbot else 0)
+metrics.register_cache('learned_patterns', lambda: deenbot.pattern_index.stats() if deenbot else (0, 0))
+
+class EnhancedDeenBotHandler(MetricsHandlerMixin, BaseHTTPRequestHandler):
     """Enhanced HTTP request handler for DeenBot"""
     
+    metrics = metrics
+    
     def do_OPTIONS(self):
         """Handle CORS preflight requests"""
         self.send_response(200)
@@ -853,6 +875,7 @@ class EnhancedDeenBotHandler(BaseHTTPRequestHandler):
             response = {
                 "status": "healthy",
                 "service": "Enhanced DeenBot Backend",
+                "ready": startup.ready,
                 "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
                 "uptime": time.time() - start_time,
                 "capabilities": {
@@ -865,21 +888,29 @@ class EnhancedDeenBotHandler(BaseHTTPRequestHandler):
             self.wfile.write(json.dumps(response).encode())
             
         elif parsed_url.path == '/status':
-            self.send_response(200)
+            # 503 until the bot is ready, for readiness probes
+            self.send_response(200 if startup.ready else 503)
             self.send_header('Content-Type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
             
-            learning_stats = deenbot.get_learning_stats()
+            learning_stats = deenbot.get_learning_stats() if startup.ready else None
             response = {
-                "status": "operational",
+                "status": "operational" if startup.ready else startup.state,
                 "service": "Enhanced DeenBot Backend",
                 "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
                 "uptime": time.time() - start_time,
+                "startup": startup.status(),
                 "learning_stats": learning_stats
             }
             self.wfile.write(json.dumps(response).encode())
             
+        elif parsed_url.path == '/metrics':
+            self.send_metrics_response()
+            
+        elif parsed_url.path == '/stats' and not startup.ready:
+            self.send_starting_response()
+            
         elif parsed_url.path == '/stats':
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
@@ -895,12 +926,15 @@ class EnhancedDeenBotHandler(BaseHTTPRequestHandler):
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
             
-            response = {"error": "Endpoint not found", "available_endpoints": ["/health", "/status", "/stats", "/chat"]}
+            response = {"error": "Endpoint not found", "available_endpoints": ["/health", "/status", "/stats", "/chat", "/metrics"]}
             self.wfile.write(json.dumps(response).encode())
     
     def do_POST(self):
         """Handle POST requests"""
-        if self.path == '/chat':
+        if self.path == '/chat' and not startup.ready:
+            self.send_starting_response()
+            
+        elif self.path == '/chat':
             try:
                 content_length = int(self.headers['Content-Length'])
                 post_data = self.rfile.read(content_length)
@@ -914,7 +948,9 @@ class EnhancedDeenBotHandler(BaseHTTPRequestHandler):
                     raise ValueError("Message is required")
                 
                 # Get enhanced response
+                answer_started = time.perf_counter()
                 response_data = deenbot.get_intelligent_response(user_message, user_id)
+                metrics.observe_source(response_data['source'], time.perf_counter() - answer_started)
                 
                 # Send response
                 self.send_response(200)
@@ -944,9 +980,21 @@ class EnhancedDeenBotHandler(BaseHTTPRequestHandler):
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
             
-            response = {"error": "Endpoint not found", "available_endpoints": ["/health", "/status", "/stats", "/chat"]}
+            response = {"error": "Endpoint not found", "available_endpoints": ["/health", "/status", "/stats", "/chat", "/metrics"]}
             self.wfile.write(json.dumps(response).encode())
     
+    def send_starting_response(self):
+        """503 with Retry-After while the bot initializes"""
+        self.send_response(503)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Retry-After', str(RETRY_AFTER_SECONDS))
+        self.end_headers()
+        
+        response = {"error": "DeenBot is starting up, please retry shortly", "status_code": 503,
+                    "startup": startup.status()}
+        self.wfile.write(json.dumps(response).encode())
+    
     def send_error_response(self, status_code, message):
         """Send error response"""
         self.send_response(status_code)
@@ -965,6 +1013,8 @@ def monitor_system_resources():
     while True:
         try:
             if deenbot:
+                if RETENTION_DAYS:
+                    prune_conversations(deenbot.db.connection(), RETENTION_DAYS)
                 learning_stats = deenbot.get_learning_stats()
                 logging.info(f"📊 Enhanced System Status - Conversations: {learning_stats['total_conversations']}, Patterns: {learning_stats['learned_patterns']}, Users: {learning_stats['unique_users']}")
                 consecutive_errors = 0  # Reset error counter on success
@@ -989,29 +1039,36 @@ def monitor_system_resources():
         
         time.sleep(60)  # Check every minute
 
+def set_deenbot(instance):
+    """Publish the bot built by the background initializer"""
+    global deenbot
+    deenbot = instance
+
 def main():
     """Main function to start the enhanced server with graceful shutdown"""
     global start_time, deenbot
     
     start_time = time.time()
-    deenbot = EnhancedDeenBot()
     
     # Start system monitoring in background
     monitor_thread = threading.Thread(target=monitor_system_resources, daemon=True)
     monitor_thread.start()
     
-    # Configure server
+    # Configure server; bind before loading NLP models and the database so /health answers at once
     server_address = ('', 8080)
-    httpd = HTTPServer(server_address, EnhancedDeenBotHandler)
+    # One thread per connection; request state is per-thread or locked
+    httpd = ThreadingHTTPServer(server_address, EnhancedDeenBotHandler)
+    startup.start(EnhancedDeenBot, on_ready=set_deenbot)
     
     logging.info("🚀 Enhanced DeenBot Backend starting...")
-    logging.info("🧠 Advanced NLP and Learning capabilities enabled")
-    logging.info("📚 Islamic Knowledge Base loaded successfully")
+    logging.info("🧠 Advanced NLP and Learning capabilities loading in the background")
+    logging.info("📚 Islamic Knowledge Base loading in the background")
     logging.info("🌐 Server listening on port 8080")
     logging.info("✅ Health endpoint: /health")
     logging.info("✅ Status endpoint: /status")
     logging.info("✅ Stats endpoint: /stats")
     logging.info("✅ Enhanced chat endpoint: /chat")
+    logging.info("✅ Metrics endpoint: /metrics")
     
     # Set up signal handlers for graceful shutdown
     import signal
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+External Link Checker
+Complete Islamic Study Guide Extended Edition
+
+Verifies outbound references (sunnah.com, quran.com and others) with a
+concurrent worker pool. Each host gets reused keep-alive connections and
+its own rate limit; results are cached on disk with a TTL and written to a
+JSON report. Transient failures (connection errors, timeouts, rate limiting
+and server errors) are never cached, so a brief outage is re-checked on the
+next run instead of being reported all day.
+"""
+
+import os
+import json
+import time
+import argparse
+import threading
+from datetime import datetime
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from incremental_build import atomic_write
+from link_graph import build_link_graph
+
+# Relative to the site root being checked
+CACHE_FILE = '.external_link_cache.json'
+REPORT_FILE = 'external_links_report.json'
+
+DEFAULT_WORKERS = 16
+DEFAULT_PER_HOST_CONNECTIONS = 2
+DEFAULT_PER_HOST_RATE = 5.0       # requests per second per host
+DEFAULT_TIMEOUT = 10.0            # seconds
+DEFAULT_CACHE_TTL = 24 * 60 * 60  # seconds
+
+USER_AGENT = 'IslamicStudyGuide-LinkChecker/1.0'
+
+# Servers that reject HEAD are retried with GET
+HEAD_FALLBACK_STATUSES = {403, 405, 501}
+
+# Failures that may clear up on their own, besides 5xx and connection errors
+TRANSIENT_STATUSES = {408, 429}
+
+class HostRateLimiter:
+    """Spaces requests to one host at least 1/rate seconds apart"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_allowed = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """Block until this host may be sent another request"""
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_allowed - now
+            self.next_allowed = max(now, self.next_allowed) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+def load_cache(cache_path):
+    """Load cached link results"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def is_transient(result):
+    """True for a failure that may clear up on its own and must not be cached"""
+    status = result.get('status')
+    return not result.get('ok') and (status is None or status >= 500 or status in TRANSIENT_STATUSES)
+
+def check_url(session, url, timeout):
+    """HEAD a URL (falling back to GET) and return its result record"""
+    started = time.perf_counter()
+    try:
+        response = session.head(url, allow_redirects=True, timeout=timeout)
+        if response.status_code in HEAD_FALLBACK_STATUSES:
+            response.close()
+            response = session.get(url, allow_redirects=True, timeout=timeout, stream=True)
+        status = response.status_code
+        final_url = response.url
+        response.close()
+        return {
+            'url': url,
+            'ok': status < 400,
+            'status': status,
+            'final_url': final_url,
+            'error': None,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+            'checked_at': time.time()
+        }
+    except requests.RequestException as e:
+        return failed_result(url, e, time.perf_counter() - started)
+
+def failed_result(url, error, elapsed=0.0):
+    """Result record for a URL whose check raised; transient, so never cached"""
+    return {
+        'url': url,
+        'ok': False,
+        'status': None,
+        'final_url': None,
+        'error': f"{type(error).__name__}: {error}",
+        'elapsed_ms': round(elapsed * 1000, 1),
+        'checked_at': time.time()
+    }
+
+def check_shard(urls, limiter, timeout):
+    """Check one host's URLs over a single keep-alive session"""
+    results = []
+    with requests.Session() as session:
+        session.headers['User-Agent'] = USER_AGENT
+        for url in urls:
+            limiter.wait()
+            results.append(check_url(session, url, timeout))
+    return results
+
+def check_external_links(urls, workers=DEFAULT_WORKERS, per_host_connections=DEFAULT_PER_HOST_CONNECTIONS,
+                         per_host_rate=DEFAULT_PER_HOST_RATE, timeout=DEFAULT_TIMEOUT,
+                         cache_path=CACHE_FILE, cache_ttl=DEFAULT_CACHE_TTL):
+    """Check URLs concurrently, reusing cached results younger than cache_ttl
+
+    Transient failures are re-checked on every run and never cached. A
+    shard whose check raises unexpectedly reports its URLs as transient
+    failures, so the other shards' results are still cached.
+
+    Returns a dict of url -> result record.
+    """
+    cache = load_cache(cache_path) if cache_path else {}
+    now = time.time()
+
+    results = {}
+    by_host = {}
+    for url in sorted(set(urls)):
+        cached = cache.get(url)
+        if cached and not is_transient(cached) and now - cached.get('checked_at', 0) < cache_ttl:
+            results[url] = dict(cached, cached=True)
+            continue
+        by_host.setdefault(urlparse(url).netloc.lower(), []).append(url)
+
+    # Split each host's URLs across at most per_host_connections sessions
+    shards = []
+    for host, host_urls in by_host.items():
+        limiter = HostRateLimiter(per_host_rate)
+        shard_count = max(1, min(per_host_connections, len(host_urls)))
+        for i in range(shard_count):
+            shards.append((host_urls[i::shard_count], limiter))
+
+    if shards:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {executor.submit(check_shard, shard_urls, limiter, timeout): shard_urls
+                       for shard_urls, limiter in shards}
+            for future in as_completed(futures):
+                try:
+                    shard_results = future.result()
+                except Exception as e:
+                    shard_results = [failed_result(url, e) for url in futures[future]]
+                for result in shard_results:
+                    result['cached'] = False
+                    results[result['url']] = result
+                    if is_transient(result):
+                        cache.pop(result['url'], None)
+                    else:
+                        cache[result['url']] = {k: v for k, v in result.items() if k != 'cached'}
+
+    if cache_path:
+        atomic_write(cache_path, json.dumps(cache, indent=1, sort_keys=True))
+
+    return results
+
+def collect_external_links(root='.'):
+    """Map of external URL -> pages that link to it, from the link graph"""
+    graph = build_link_graph(root)
+    sources = {}
+    for filename, record in graph.pages.items():
+        for link_type, href in record['links']:
+            if link_type == 'external':
+                sources.setdefault(href, set()).add(filename)
+    return {url: sorted(pages) for url, pages in sources.items()}
+
+def build_report(results, sources, elapsed):
+    """JSON-serializable report of an external link check"""
+    broken = [r for r in results.values() if not r['ok']]
+    return {
+        'generated_at': datetime.now().isoformat(),
+        'elapsed_seconds': round(elapsed, 2),
+        'total_links': len(results),
+        'working_links': len(results) - len(broken),
+        'broken_links': len(broken),
+        'from_cache': sum(1 for r in results.values() if r.get('cached')),
+        'hosts': len({urlparse(url).netloc.lower() for url in results}),
+        'results': [
+            dict(results[url], sources=sources.get(url, []))
+            for url in sorted(results)
+        ]
+    }
+
+def run_external_link_check(root='.', report_path=REPORT_FILE, **options):
+    """Check every external link in the site and write the JSON report
+
+    The report path and the result cache are resolved against root.
+    """
+    options.setdefault('cache_path', CACHE_FILE)
+    if options['cache_path']:
+        options['cache_path'] = os.path.join(root, options['cache_path'])
+    sources = collect_external_links(root)
+    started = time.perf_counter()
+    results = check_external_links(sources.keys(), **options)
+    report = build_report(results, sources, time.perf_counter() - started)
+
+    if report_path:
+        atomic_write(os.path.join(root, report_path), json.dumps(report, indent=2))
+
+    return report
+
+def print_report_summary(report, report_path=REPORT_FILE):
+    """Console summary of an external link check"""
+    print("EXTERNAL LINK CHECK")
+    print("=" * 60)
+    print(f"External links: {report['total_links']} across {report['hosts']} hosts")
+    print(f"Working: {report['working_links']}")
+    print(f"Broken: {report['broken_links']}")
+    print(f"From cache: {report['from_cache']}")
+    print(f"Elapsed: {report['elapsed_seconds']}s")
+    for result in report['results']:
+        if not result['ok']:
+            reason = result['error'] or f"HTTP {result['status']}"
+            print(f"   {result['url']} - {reason} (linked from {', '.join(result['sources'])})")
+    if report_path:
+        print(f"\nReport saved to: {report_path}")
+
+def add_external_check_arguments(parser):
+    """Command-line options shared by the external link checking entry points"""
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="concurrent connections overall")
+    parser.add_argument('--per-host-connections', type=int, default=DEFAULT_PER_HOST_CONNECTIONS,
+                        help="concurrent connections per host")
+    parser.add_argument('--per-host-rate', type=float, default=DEFAULT_PER_HOST_RATE,
+                        help="maximum requests per second per host")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help="per-request timeout in seconds")
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_CACHE_TTL,
+                        help="seconds a cached result stays valid (0 re-checks everything)")
+    parser.add_argument('--report', default=REPORT_FILE, help="JSON report path, relative to the site root")
+
+def external_check_options(args):
+    """check_external_links keyword arguments from parsed options"""
+    return {
+        'workers': args.workers,
+        'per_host_connections': args.per_host_connections,
+        'per_host_rate': args.per_host_rate,
+        'timeout': args.timeout,
+        'cache_ttl': args.cache_ttl
+    }
+
+def main():
+    """Check all external links in the site"""
+    parser = argparse.ArgumentParser(description="Concurrent external link checker")
+    parser.add_argument('--root', default='.', help="directory containing the HTML pages")
+    add_external_check_arguments(parser)
+    args = parser.parse_args()
+
+    report = run_external_link_check(args.root, args.report, **external_check_options(args))
+    print_report_summary(report, os.path.join(args.root, args.report))
+
+if __name__ == "__main__":
+    main()
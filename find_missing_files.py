@@ -3,35 +3,8 @@
 Script to find missing HTML files referenced in the main guide
 """
 
-import re
 import os
-from pathlib import Path
-
-def extract_html_links(html_file):
-    """Extract all HTML file links from the main guide"""
-    with open(html_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Find all href="filename.html" patterns
-    pattern = r'href="([^"]*\.html)"'
-    matches = re.findall(pattern, content)
-    
-    # Remove duplicates and sort
-    unique_links = sorted(list(set(matches)))
-    return unique_links
-
-def check_existing_files(links):
-    """Check which files exist and which are missing"""
-    existing = []
-    missing = []
-    
-    for link in links:
-        if os.path.exists(link):
-            existing.append(link)
-        else:
-            missing.append(link)
-    
-    return existing, missing
+from link_graph import build_link_graph
 
 def main():
     main_file = "complete-islamic-study-guide-dark.html"
@@ -43,12 +16,14 @@ def main():
     print("Analyzing missing HTML files...")
     print("=" * 50)
     
-    # Extract all HTML links
-    links = extract_html_links(main_file)
+    # Extract all HTML links from the shared link graph
+    graph = build_link_graph()
+    links = sorted(set(graph.internal_links(main_file)))
     print(f"Total HTML links found: {len(links)}")
     
     # Check which exist and which are missing
-    existing, missing = check_existing_files(links)
+    missing = graph.missing_targets(main_file)
+    existing = [link for link in links if link not in missing]
     
     print(f"\nExisting files: {len(existing)}")
     print(f"Missing files: {len(missing)}")
@@ -9,7 +9,9 @@ with the exact index page design to ensure complete visual consistency.
 
 import os
 import re
+import argparse
 from pathlib import Path
+from incremental_build import IncrementalPageBuilder
 
 def get_exact_index_page_design():
     """Get the exact CSS design from the index page"""
@@ -629,7 +631,7 @@ def get_all_html_files():
             html_files.append(file)
     return html_files
 
-def main():
+def main(force=False):
     """Main function to fix all design violations"""
     print("🔨 FIXING ALL DESIGN VIOLATIONS")
     print("Complete Islamic Study Guide Extended Edition")
@@ -642,6 +644,7 @@ def main():
     print()
     
     # Fix each file
+    builder = IncrementalPageBuilder(__file__, force=force)
     fixed_count = 0
     for filename in html_files:
         print(f"🔨 Fixing: {filename}")
@@ -653,25 +656,25 @@ def main():
         title = filename.replace('.html', '').replace('-', ' ').replace('_', ' ').title()
         description = f"Complete guide to {title.lower()} with comprehensive Islamic content and resources"
         
-        # Create the content with exact design
-        content = create_content_page_with_exact_design(
+        # Create the content with exact design, re-rendering only when inputs changed
+        status = builder.build(
+            filename,
+            create_content_page_with_exact_design,
             filename, 
             title, 
             description, 
             content_type
         )
         
-        # Write the file
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        print(f"   ✅ Fixed successfully with exact index page design")
+        print(f"   ✅ Fixed successfully with exact index page design ({status})")
         fixed_count += 1
         print()
     
+    builder.save()
+    
     print("=" * 60)
     print(f"🎉 ALL DESIGN VIOLATIONS FIXED!")
-    print(f"📁 Files fixed: {fixed_count}")
+    print(f"📁 Files fixed: {fixed_count} ({builder.summary()})")
     print(f"📊 Total files processed: {len(html_files)}")
     print()
     print("🔍 Next steps:")
@@ -683,4 +686,8 @@ def main():
     print("📱 All content files now follow the critical design policy!")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Rebuild every content file with the exact index page design")
+    parser.add_argument('--force', action='store_true', help="re-render every page even if unchanged")
+    args = parser.parse_args()
+    
+    main(force=args.force)
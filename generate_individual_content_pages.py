@@ -7,6 +7,20 @@ NO EMOJIS - This is a serious Islamic research application
 """
 
 import os
+import argparse
+import time
+from incremental_build import IncrementalPageBuilder
+from parallel_render import (CompiledTemplate, default_jobs, job_count, render_pages, failed_pages,
+                             print_render_timings)
+
+_compiled_index_page_design = None
+
+def get_compiled_index_page_design():
+    """Exact index page design compiled once per process"""
+    global _compiled_index_page_design
+    if _compiled_index_page_design is None:
+        _compiled_index_page_design = CompiledTemplate(get_exact_index_page_design())
+    return _compiled_index_page_design
 
 def get_exact_index_page_design():
     """Get the exact CSS and structure from the index page - NO EMOJIS"""
@@ -614,7 +628,7 @@ def create_content_page_with_exact_design(page_key, page_data):
     additional_sections = ""
     
     # Fill template with exact design
-    page_content = get_exact_index_page_design().format(
+    page_content = get_compiled_index_page_design().render(
         title=page_data['title'],
         description=page_data['description'],
         back_link=page_data['back_link'],
@@ -626,7 +640,7 @@ def create_content_page_with_exact_design(page_key, page_data):
     
     return page_content
 
-def generate_all_content_pages():
+def generate_all_content_pages(force=False, jobs=None):
     """Generate all individual content pages with exact index page design"""
     
     print("Generating all individual content pages...")
@@ -634,34 +648,42 @@ def generate_all_content_pages():
     print("This is a serious Islamic research application")
     
     structure = get_content_pages_structure()
-    pages_generated = 0
+    builder = IncrementalPageBuilder(__file__, force=force)
+    if jobs is None:
+        jobs = default_jobs()
     
-    for page_key, page_data in structure.items():
-        try:
-            # Create page with exact design
-            page_content = create_content_page_with_exact_design(page_key, page_data)
-            filename = f"{page_key}.html"
-            
-            # Write the generated page
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(page_content)
-            
-            pages_generated += 1
-            print(f"Generated: {filename} - Now matches index page design exactly")
-            
-        except Exception as e:
-            print(f"Error generating {page_key}: {e}")
+    pages = [
+        (f"{page_key}.html", create_content_page_with_exact_design, (page_key, page_data))
+        for page_key, page_data in structure.items()
+    ]
+    
+    started = time.perf_counter()
+    # Re-render only when the template or page data changed
+    results = render_pages(pages, jobs=jobs, builder=builder)
+    failures = failed_pages(results)
+    for filename, error in failures:
+        print(f"Error generating {filename}: {error}")
+    elapsed = time.perf_counter() - started
+    
+    builder.save()
+    print_render_timings(results, elapsed, jobs)
+    pages_generated = len(results) - len(failures)
     
     print(f"\nAll content pages generated!")
-    print(f"Total pages generated: {pages_generated}")
+    print(f"Total pages generated: {pages_generated} ({builder.summary()})")
     print(f"Design now matches index page exactly")
     print(f"NO EMOJIS - Serious Islamic research application design")
     
     return pages_generated
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate all individual content pages")
+    parser.add_argument('--force', action='store_true', help="re-render every page even if unchanged")
+    parser.add_argument('--jobs', type=job_count, default=default_jobs(), help="number of render processes")
+    args = parser.parse_args()
+    
     try:
-        pages_generated = generate_all_content_pages()
+        pages_generated = generate_all_content_pages(force=args.force, jobs=args.jobs)
         print(f"\nGeneration Summary:")
         print(f"   All content pages now generated in application format")
         print(f"   Same CSS variables, fonts, colors, and layout")
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Incremental Page Builder - Shared by the Content Generators
+Skips re-rendering pages whose template and page data are unchanged, never
+rewrites identical output, and writes through temp-file-and-rename so a
+page is never left half-written.
+NO EMOJIS - This is a serious Islamic research application
+"""
+
+import os
+import json
+import types
+import inspect
+import hashlib
+import tempfile
+
+# One manifest per generator script, so generators writing the same output
+# path cannot mark each other's pages as up to date
+MANIFEST_PREFIX = '.page_build_manifest'
+
+# Build statuses reported per page
+STATUS_SKIPPED = 'skipped'
+STATUS_UNCHANGED = 'unchanged'
+STATUS_WRITTEN = 'written'
+
+# Module-level values whose contents are hashed into a generator fingerprint
+DATA_TYPES = (str, bytes, int, float, bool, tuple, list, dict, set, frozenset, type(None))
+
+def atomic_write(filename, content):
+    """Write content to filename via a temp file in the same directory and rename"""
+    directory = os.path.dirname(os.path.abspath(filename))
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        if os.path.exists(filename):
+            os.chmod(temp_path, os.stat(filename).st_mode & 0o777)
+        else:
+            os.chmod(temp_path, 0o644)
+        os.replace(temp_path, filename)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def file_digest(filename):
+    """SHA-256 of a file's bytes"""
+    with open(filename, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def manifest_file(generator):
+    """Build manifest path for a generator script path or name"""
+    name = os.path.splitext(os.path.basename(generator))[0]
+    return f"{MANIFEST_PREFIX}.{name}.json"
+
+def _global_names(code):
+    """Global names read by code and the functions and comprehensions nested in it"""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _global_names(const)
+    return names
+
+def _canonical(value):
+    """JSON fallback that serializes sets and other values the same way every run"""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    return repr(value)
+
+def _value_digest(value):
+    """Stable text form of a module-level constant"""
+    try:
+        return json.dumps(value, sort_keys=True, default=_canonical, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return repr(value)
+
+def generator_fingerprint(render, _seen=None):
+    """Hash the source of a render function, every module function it calls
+    and the module-level constants they read
+
+    A change to the template function, any helper the renderer reaches or a
+    template string or constant they use invalidates the pages it produced;
+    data-only changes invalidate just the pages whose data changed.
+    """
+    seen = _seen if _seen is not None else set()
+    digest = hashlib.sha256()
+    pending = [render]
+    while pending:
+        function = pending.pop()
+        if function in seen or not isinstance(function, types.FunctionType):
+            continue
+        seen.add(function)
+        try:
+            digest.update(inspect.getsource(function).encode('utf-8'))
+        except (OSError, TypeError):
+            digest.update(function.__code__.co_code)
+        for name in sorted(_global_names(function.__code__)):
+            if name not in function.__globals__:
+                continue
+            candidate = function.__globals__[name]
+            if isinstance(candidate, types.FunctionType):
+                if candidate.__module__ == function.__module__:
+                    pending.append(candidate)
+            elif isinstance(candidate, DATA_TYPES):
+                digest.update(f"{function.__module__}.{name}={_value_digest(candidate)}".encode('utf-8'))
+    return digest.hexdigest()
+
+def compute_build_key(fingerprint, render_args):
+    """Hash of the generator code plus the page data passed to it"""
+    payload = json.dumps(render_args, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256((fingerprint + payload).encode('utf-8')).hexdigest()
+
+class IncrementalPageBuilder:
+    """Render pages only when their inputs change and write them atomically"""
+
+    def __init__(self, generator, force=False, manifest_path=None):
+        self.manifest_path = manifest_path or manifest_file(generator)
+        self.force = force
+        self.manifest = self._load_manifest()
+        self.fingerprints = {}
+        self.stats = {STATUS_SKIPPED: 0, STATUS_UNCHANGED: 0, STATUS_WRITTEN: 0}
+
+    def _load_manifest(self):
+        """Load the per-page build manifest, starting fresh if it is unreadable"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _fingerprint(self, render):
+        """Generator fingerprint, computed once per render function"""
+        if render not in self.fingerprints:
+            self.fingerprints[render] = generator_fingerprint(render)
+        return self.fingerprints[render]
+
+    def is_current(self, filename, build_key):
+        """True when filename was built from build_key and has not been touched since"""
+        entry = self.manifest.get(filename)
+        if self.force or not entry or entry.get('key') != build_key:
+            return False
+        try:
+            stat = os.stat(filename)
+        except FileNotFoundError:
+            return False
+        return stat.st_size == entry.get('size') and stat.st_mtime_ns == entry.get('mtime_ns')
+
+    def record(self, filename, build_key, digest):
+        """Remember what filename was built from"""
+        stat = os.stat(filename)
+        self.manifest[filename] = {
+            'key': build_key,
+            'digest': digest,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns
+        }
+
+    def build_key(self, render, *render_args):
+        """Build key for rendering render(*render_args)"""
+        return compute_build_key(self._fingerprint(render), render_args)
+
+    def write_page(self, filename, content, build_key):
+        """Write rendered content unless the file already holds exactly it"""
+        data = content.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        if os.path.exists(filename) and file_digest(filename) == digest:
+            self.record(filename, build_key, digest)
+            self.stats[STATUS_UNCHANGED] += 1
+            return STATUS_UNCHANGED
+        atomic_write(filename, data)
+        self.record(filename, build_key, digest)
+        self.stats[STATUS_WRITTEN] += 1
+        return STATUS_WRITTEN
+
+    def build(self, filename, render, *render_args):
+        """Render and write filename from render(*render_args) if its inputs changed"""
+        build_key = self.build_key(render, *render_args)
+        if self.is_current(filename, build_key):
+            self.stats[STATUS_SKIPPED] += 1
+            return STATUS_SKIPPED
+        return self.write_page(filename, render(*render_args), build_key)
+
+    def save(self):
+        """Persist the build manifest"""
+        atomic_write(self.manifest_path, json.dumps(self.manifest, indent=1, sort_keys=True))
+
+    def summary(self):
+        """One-line build summary"""
+        return (f"{self.stats[STATUS_WRITTEN]} written, "
+                f"{self.stats[STATUS_UNCHANGED]} unchanged, "
+                f"{self.stats[STATUS_SKIPPED]} skipped")
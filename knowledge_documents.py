@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Knowledge Documents - Normalized Records for the Knowledge Databases
+Every hadith, surah, verse, fiqh ruling and guidance topic is normalized
+once at load into a compact record: its lowercased match text, its
+lowercased scoring fields with their weights, its topic name split into
+words and the result it produces when matched. The relevance scorers
+read these records and never lowercase, split or format the static text
+again per query.
+"""
+
+from collections import namedtuple
+
+# Relevance added per query word found in each field
+HADITH_FIELD_WEIGHTS = (('translation', 0.3), ('context', 0.2), ('category', 0.3))
+CONTENT_FIELD_WEIGHTS = (('title', 0.5), ('content', 0.1))
+QURAN_TRANSLATION_WEIGHT = 0.3
+QURAN_TAFSIR_WEIGHT = 0.2
+
+# Relevance per query word found in a topic name, and per topic word found in the query
+TOPIC_NAME_WEIGHT = 0.3
+TOPIC_WORD_WEIGHT = 0.2
+
+# A hadith topic and its hadith
+HadithTopic = namedtuple('HadithTopic', 'name words hadiths')
+
+# text: translation and context, for substring matching; fields: (lowercased field, weight) pairs
+Hadith = namedtuple('Hadith', 'text fields result')
+
+# name, translation and key are lowercased; result is the search_quran_comprehensive
+# result and entry the search_comprehensive_knowledge result
+Surah = namedtuple('Surah', 'name translation key result entry verses')
+
+# text: translation, transliteration and tafsir; topic_text: translation and tafsir;
+# fields: (lowercased field, weight) pairs; broad: the broad search result
+Verse = namedtuple('Verse', 'text topic_text fields result entry broad')
+
+# A fiqh ruling or guidance topic; text: what the single-word search matches (title and
+# content for fiqh, content for guidance); broad: the broad search result
+Entry = namedtuple('Entry', 'name words text fields result broad')
+
+def field_weights(record, weights):
+    """(lowercased field, weight) for each weighted field; a field the record lacks is empty"""
+    return tuple((record[key].lower() if key in record else '', weight) for key, weight in weights)
+
+def field_relevance(words, fields):
+    """Sum of each field's weight for every query word found in it"""
+    score = 0
+    for text, weight in fields:
+        for word in words:
+            if word in text:
+                score += weight
+    return score
+
+def topic_relevance(query, words, name, topic_words):
+    """Relevance of a topic name: query words in the name, and name words in the query"""
+    score = 0
+    for word in words:
+        if word in name:
+            score += TOPIC_NAME_WEIGHT
+    for word in topic_words:
+        if word in query:
+            score += TOPIC_WORD_WEIGHT
+    return score
+
+def _topic(topic):
+    """Lowercased topic name and its words"""
+    name = topic.lower()
+    return name, tuple(name.split('_'))
+
+def hadith_topics(hadith_database):
+    """HadithTopic records of the hadith database"""
+    topics = []
+    for topic, topic_data in hadith_database.items():
+        hadiths = tuple(
+            Hadith(
+                f"{hadith.get('translation', '')} {hadith.get('context', '')}".lower(),
+                field_weights(hadith, HADITH_FIELD_WEIGHTS),
+                {
+                    'title': f"Hadith {hadith['number']}",
+                    'content': f"{hadith['translation']} - {hadith['context']}",
+                    'source': f"{hadith['source']} - {hadith['narrator']}",
+                    'type': 'hadith',
+                    'arabic': hadith.get('arabic', ''),
+                    'authentication': hadith.get('authentication', '')
+                }
+            )
+            for hadith in topic_data.get('hadiths', [])
+        )
+        topics.append(HadithTopic(*_topic(topic), hadiths))
+    return tuple(topics)
+
+def _verse_fields(verse):
+    """Scoring fields of a verse, as calculate_quran_relevance weighs them
+
+    The tafsir only counts for verses that also carry a context.
+    """
+    tafsir = verse.get('tafsir', '').lower() if 'context' in verse else ''
+    return ((verse.get('translation', '').lower(), QURAN_TRANSLATION_WEIGHT), (tafsir, QURAN_TAFSIR_WEIGHT))
+
+def _verse(surah_data, verse):
+    """Verse record of one verse of a surah"""
+    number = surah_data.get('surah_number')
+    name = surah_data.get('surah_name')
+    source = f"Quran {number}:{verse.get('ayah')} - {name}"
+    return Verse(
+        f"{verse.get('translation', '')} {verse.get('transliteration', '')} {verse.get('tafsir', '')}".lower(),
+        f"{verse.get('translation', '')} {verse.get('tafsir', '')}".lower(),
+        _verse_fields(verse),
+        {
+            'type': 'quran_verse',
+            'surah_number': number,
+            'surah_name': name,
+            'arabic_name': surah_data.get('arabic_name', ''),
+            'ayah': verse.get('ayah'),
+            'arabic': verse.get('arabic'),
+            'transliteration': verse.get('transliteration'),
+            'translation': verse.get('translation'),
+            'tafsir': verse.get('tafsir'),
+            'source': source
+        },
+        {
+            'title': f"Quran {number}:{verse.get('ayah')} - {name}",
+            'content': f"{verse.get('translation')} - {verse.get('tafsir')}",
+            'source': source,
+            'type': 'quran_verse',
+            'arabic': verse.get('arabic'),
+            'transliteration': verse.get('transliteration'),
+            'verse_info': {'surah': number, 'ayah': verse.get('ayah'), 'surah_name': name}
+        },
+        {
+            'title': source,
+            'content': f"{verse.get('translation')} - {verse.get('tafsir')}",
+            'source': source,
+            'type': 'quran',
+            'arabic': verse.get('arabic', '')
+        }
+    )
+
+def surahs(quran_database):
+    """Surah records of the Quran database, each with its verses"""
+    records = []
+    for surah_key, surah_data in quran_database.items():
+        number = surah_data.get('surah_number')
+        name = surah_data.get('surah_name')
+        arabic_name = surah_data.get('arabic_name', '')
+        records.append(Surah(
+            surah_data.get('surah_name', '').lower(),
+            surah_data.get('translation', '').lower(),
+            surah_key.lower(),
+            {
+                'type': 'quran_surah',
+                'surah_number': number,
+                'surah_name': name,
+                'arabic_name': arabic_name,
+                'translation': surah_data.get('translation'),
+                'verses': surah_data.get('verses'),
+                'revelation': surah_data.get('revelation'),
+                'summary': surah_data.get('summary'),
+                'source': f"Quran - {name}"
+            },
+            {
+                'title': f"Quran - {name} ({arabic_name})",
+                'content': f"{surah_data.get('translation')} - {surah_data.get('summary')}",
+                'source': f"Quran {number} - {name}",
+                'type': 'quran_surah',
+                'surah_info': {
+                    'number': number,
+                    'name': name,
+                    'arabic_name': arabic_name,
+                    'verses': surah_data.get('verses'),
+                    'revelation': surah_data.get('revelation')
+                }
+            },
+            tuple(_verse(surah_data, verse) for verse in surah_data.get('verses_data', []))
+        ))
+    return tuple(records)
+
+def fiqh_entries(fiqh_database):
+    """Entry records of the fiqh database"""
+    entries = []
+    for topic, topic_data in fiqh_database.items():
+        broad = {
+            'title': topic_data['title'],
+            'content': topic_data['content'],
+            'source': topic_data['source'],
+            'type': 'fiqh'
+        }
+        entries.append(Entry(
+            *_topic(topic),
+            f"{topic_data.get('title', '')} {topic_data.get('content', '')}".lower(),
+            field_weights(topic_data, CONTENT_FIELD_WEIGHTS),
+            dict(broad, category=topic_data.get('category', ''), schools=topic_data.get('schools', []),
+                 ruling=topic_data.get('ruling', '')),
+            broad
+        ))
+    return tuple(entries)
+
+def guidance_entries(islamic_guidance):
+    """Entry records of the Islamic guidance topics"""
+    entries = []
+    for topic, topic_data in islamic_guidance.items():
+        result = {
+            'title': topic_data['title'],
+            'content': topic_data['content'],
+            'source': f"Islamic Guidance - {', '.join(topic_data['sources'])}",
+            'type': 'guidance'
+        }
+        entries.append(Entry(
+            *_topic(topic),
+            topic_data.get('content', '').lower(),
+            field_weights(topic_data, CONTENT_FIELD_WEIGHTS),
+            result,
+            result
+        ))
+    return tuple(entries)
+
+def build_documents(hadith_database, quran_database, fiqh_database, islamic_guidance):
+    """Normalized records of every knowledge database, keyed by source type"""
+    return {
+        'hadith': hadith_topics(hadith_database),
+        'quran': surahs(quran_database),
+        'fiqh': fiqh_entries(fiqh_database),
+        'guidance': guidance_entries(islamic_guidance)
+    }
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Knowledge Snapshot - Warm Start for the Comprehensive DeenBot Backend
+Serializes the fully constructed knowledge engine (knowledge databases,
+scanned content index and the bot's own topic tables) to a versioned
+binary file. On boot, each component restores its state from the
+snapshot instead of rebuilding it, as long as the snapshot was built from
+the same sources and content files.
+
+Build:  python knowledge_snapshot.py
+Check:  python knowledge_snapshot.py --check
+"""
+
+import os
+import sys
+import json
+import mmap
+import time
+import pickle
+import struct
+import hashlib
+import logging
+import argparse
+
+SNAPSHOT_FILE = '.knowledge_snapshot.pickle'
+
+# Bump when the layout of the snapshot or of any component's state changes
+SNAPSHOT_VERSION = 4
+MAGIC = b'DEENSNAP'
+_HEADER = struct.Struct('<8sII')  # magic, version, header JSON length
+
+# A change to any of these rebuilds the snapshot
+SOURCE_FILES = ['comprehensive_islamic_knowledge.py', 'knowledge_documents.py', 'relevance_scorer.py',
+                'content_scanner.py', 'comprehensive_deenbot_backend.py']
+
+# Component state that is not worth or not possible to keep
+VOLATILE_ATTRIBUTES = {'content_scanner': {'scan_thread'}}
+
+_loaded = None
+_load_attempted = False
+load_info = {'snapshot': None, 'load_seconds': None, 'reason': 'not attempted'}
+
+def snapshot_path():
+    """Snapshot file from DEENBOT_SNAPSHOT, or None when disabled ("0")"""
+    path = os.environ.get('DEENBOT_SNAPSHOT', SNAPSHOT_FILE)
+    if path.lower() in ('0', 'false', 'no', 'off'):
+        return None
+    return path
+
+def content_files(directory='.'):
+    """HTML files the content scanner indexes, in directory order"""
+    return [
+        name for name in os.listdir(directory)
+        if name.endswith('.html') and not name.startswith('test-') and not name.startswith('deenbot-')
+    ]
+
+def source_fingerprint():
+    """SHA-256 over the engine's source files and every content file"""
+    digest = hashlib.sha256(f"v{SNAPSHOT_VERSION}".encode())
+    for name in SOURCE_FILES + sorted(content_files()):
+        digest.update(name.encode('utf-8') + b'\0')
+        try:
+            with open(name, 'rb') as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        except OSError:
+            digest.update(b'missing')
+    return digest.hexdigest()
+
+def write_snapshot(path, components):
+    """Write components (name -> state dict) with pickle protocol 5
+
+    Objects supporting out-of-band buffers (e.g. NumPy arrays) are stored
+    after the pickle stream and mapped back without copying on load.
+    """
+    from incremental_build import atomic_write
+
+    buffers = []
+    payload = pickle.dumps(components, protocol=5, buffer_callback=buffers.append)
+    raw_buffers = [buffer.raw() for buffer in buffers]
+    header = json.dumps({
+        'version': SNAPSHOT_VERSION,
+        'fingerprint': source_fingerprint(),
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': sys.version.split()[0],
+        'components': sorted(components),
+        'payload_bytes': len(payload),
+        'buffer_bytes': [buffer.nbytes for buffer in raw_buffers]
+    }).encode('utf-8')
+    atomic_write(path, b''.join([_HEADER.pack(MAGIC, SNAPSHOT_VERSION, len(header)), header, payload]
+                                + [bytes(buffer) for buffer in raw_buffers]))
+    return len(payload) + sum(buffer.nbytes for buffer in raw_buffers)
+
+def read_header(path):
+    """Snapshot header dict, or None if the file is not a snapshot of this version"""
+    with open(path, 'rb') as f:
+        magic, version, header_length = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC or version != SNAPSHOT_VERSION:
+            return None
+        return json.loads(f.read(header_length))
+
+def load_snapshot(path):
+    """Components from a valid, up-to-date snapshot; (None, reason) otherwise"""
+    if not os.path.exists(path):
+        return None, 'no snapshot file'
+    try:
+        header = read_header(path)
+        if header is None:
+            return None, 'snapshot version mismatch'
+        if header['fingerprint'] != source_fingerprint():
+            return None, 'snapshot is stale (sources or content changed)'
+
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        offset = _HEADER.size + _HEADER.unpack(view[:_HEADER.size])[2]
+        payload = view[offset:offset + header['payload_bytes']]
+        offset += header['payload_bytes']
+        buffers = []
+        for length in header['buffer_bytes']:
+            buffers.append(view[offset:offset + length])
+            offset += length
+        components = pickle.loads(payload, buffers=buffers)
+        if not buffers:
+            # Nothing references the mapping; everything was copied out of it
+            payload.release()
+            view.release()
+            mapped.close()
+        return components, 'loaded'
+    except Exception as e:
+        return None, f"snapshot unreadable: {e}"
+
+def component_state(name):
+    """Saved state for a component, or None to build it from source
+
+    The snapshot is read and validated once, on the first call.
+    """
+    global _loaded, _load_attempted
+    if not _load_attempted:
+        _load_attempted = True
+        path = snapshot_path()
+        if path is None:
+            load_info['reason'] = 'disabled'
+        else:
+            started = time.perf_counter()
+            _loaded, reason = load_snapshot(path)
+            load_info.update(reason=reason)
+            if _loaded is not None:
+                load_info.update(snapshot=path, load_seconds=round(time.perf_counter() - started, 4))
+                logging.info(f"⚡ Knowledge snapshot loaded from {path} in {load_info['load_seconds'] * 1000:.1f}ms")
+            elif reason != 'no snapshot file':
+                logging.warning(f"⚠️ Knowledge snapshot not used: {reason}")
+    if _loaded is None:
+        return None
+    return _loaded.get(name)
+
+def restore(instance, name):
+    """Fill instance from the snapshot; True if it was restored"""
+    state = component_state(name)
+    if state is None:
+        return False
+    instance.__dict__.update(state)
+    return True
+
+def capture(instance, name):
+    """Picklable state of a constructed component"""
+    volatile = VOLATILE_ATTRIBUTES.get(name, set())
+    return {key: value for key, value in vars(instance).items() if key not in volatile}
+
+def build_snapshot(path=SNAPSHOT_FILE):
+    """Construct the engine from source and write its snapshot"""
+    # Never warm-start the build itself from an older snapshot
+    os.environ['DEENBOT_SNAPSHOT'] = '0'
+    import comprehensive_deenbot_backend as backend
+
+    components = {'deenbot': capture(backend.ComprehensiveDeenBot(), 'deenbot')}
+    if backend.COMPREHENSIVE_KNOWLEDGE_AVAILABLE:
+        components['knowledge'] = capture(backend.comprehensive_knowledge, 'knowledge')
+    if backend.CONTENT_SCANNER_AVAILABLE:
+        components['content_scanner'] = capture(backend.content_scanner, 'content_scanner')
+    return write_snapshot(path, components), sorted(components)
+
+def main():
+    """Build or check the knowledge snapshot"""
+    parser = argparse.ArgumentParser(description="Build the warm-start snapshot of the DeenBot knowledge engine")
+    parser.add_argument('--output', default=SNAPSHOT_FILE, help="snapshot file")
+    parser.add_argument('--check', action='store_true', help="only report whether the snapshot is up to date")
+    args = parser.parse_args()
+
+    if args.check:
+        if not os.path.exists(args.output):
+            print(f"❌ No snapshot at {args.output}")
+            return 1
+        header = read_header(args.output)
+        if header is None:
+            print(f"❌ {args.output} is not a version {SNAPSHOT_VERSION} snapshot")
+            return 1
+        fresh = header['fingerprint'] == source_fingerprint()
+        print(f"{'✅' if fresh else '❌'} {args.output}: built {header['created']}, "
+              f"{'up to date' if fresh else 'stale'} ({', '.join(header['components'])})")
+        return 0 if fresh else 1
+
+    logging.disable(logging.INFO)
+    started = time.perf_counter()
+    size, components = build_snapshot(args.output)
+    print(f"✅ Snapshot written to {args.output}: {size / 1024:.0f} KiB "
+          f"({', '.join(components)}) in {time.perf_counter() - started:.2f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
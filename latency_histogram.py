@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Latency Histogram for DeenBot
+HDR-style log-linear histogram: constant relative precision over any
+latency range, constant memory, O(1) recording and mergeable across threads
+"""
+
+import math
+import threading
+
+# 2**7 linear sub-buckets per power of two keeps relative error under 1%
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+
+REPORT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+class LatencyHistogram:
+    """Records latencies in microseconds into log-linear buckets"""
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def bucket_index(value):
+        """Bucket for an integer value; values below SUB_BUCKET_COUNT are exact"""
+        if value < SUB_BUCKET_COUNT:
+            return value
+        shift = value.bit_length() - SUB_BUCKET_BITS - 1
+        return ((shift + 1) << SUB_BUCKET_BITS) + (value >> shift) - SUB_BUCKET_COUNT
+
+    @staticmethod
+    def bucket_value(index):
+        """Highest value that falls in a bucket"""
+        if index < SUB_BUCKET_COUNT:
+            return index
+        shift = (index >> SUB_BUCKET_BITS) - 1
+        sub_bucket = (index & (SUB_BUCKET_COUNT - 1)) + SUB_BUCKET_COUNT
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record(self, microseconds):
+        """Record one latency in microseconds"""
+        value = max(int(microseconds), 0)
+        index = self.bucket_index(value)
+        with self.lock:
+            self.counts[index] = self.counts.get(index, 0) + 1
+            self.count += 1
+            self.total += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def record_seconds(self, seconds):
+        """Record one latency given in seconds"""
+        self.record(seconds * 1_000_000)
+
+    def merge(self, other):
+        """Add another histogram's samples into this one"""
+        with self.lock:
+            for index, count in other.counts.items():
+                self.counts[index] = self.counts.get(index, 0) + count
+            self.count += other.count
+            self.total += other.total
+            if other.min is not None:
+                self.min = other.min if self.min is None else min(self.min, other.min)
+                self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def percentile(self, percent):
+        """Latency in microseconds at or below which `percent` of samples fall"""
+        if not self.count:
+            return 0
+        target = max(1, math.ceil(self.count * percent / 100.0))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self.bucket_value(index), self.max)
+        return self.max
+
+    def mean(self):
+        """Mean latency in microseconds"""
+        return self.total / self.count if self.count else 0
+
+    def summary(self, percentiles=REPORT_PERCENTILES):
+        """Count, mean, min, max and percentiles in milliseconds"""
+        result = {
+            'count': self.count,
+            'mean_ms': round(self.mean() / 1000, 3),
+            'min_ms': round((self.min or 0) / 1000, 3),
+            'max_ms': round((self.max or 0) / 1000, 3)
+        }
+        for percent in percentiles:
+            result[f"p{percent:g}_ms"] = round(self.percentile(percent) / 1000, 3)
+        return result
+
+    def buckets(self):
+        """Non-empty buckets as (upper bound in microseconds, count) pairs, ascending"""
+        return [(self.bucket_value(index), self.counts[index]) for index in sorted(self.counts)]
+
+class HistogramSet:
+    """Histograms keyed by label, created on first use"""
+
+    def __init__(self):
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def get(self, label):
+        """Histogram for a label"""
+        histogram = self.histograms.get(label)
+        if histogram is None:
+            with self.lock:
+                histogram = self.histograms.setdefault(label, LatencyHistogram())
+        return histogram
+
+    def record_seconds(self, label, seconds):
+        """Record a latency in seconds under a label"""
+        self.get(label).record_seconds(seconds)
+
+    def summary(self):
+        """Per-label summaries, slowest p99 first"""
+        summaries = {label: histogram.summary() for label, histogram in list(self.histograms.items())}
+        return dict(sorted(summaries.items(), key=lambda item: item[1].get('p99_ms', 0), reverse=True))
+
+def format_summary_table(title, summaries):
+    """Fixed-width text table of histogram summaries"""
+    lines = [title]
+    lines.append(f"   {'':<40} {'count':>7} {'p50':>9} {'p90':>9} {'p99':>9} {'p99.9':>9} {'max':>9}")
+    for label, summary in summaries.items():
+        lines.append(
+            f"   {label[:40]:<40} {summary['count']:>7} {summary['p50_ms']:>7.2f}ms "
+            f"{summary['p90_ms']:>7.2f}ms {summary['p99_ms']:>7.2f}ms {summary['p99.9_ms']:>7.2f}ms "
+            f"{summary['max_ms']:>7.2f}ms"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,572 @@
+#!/usr/bin/env python3
+"""
+Learning Database - Versioned Schema for deenbot_learning.db
+Migrations are applied in order and tracked with PRAGMA user_version.
+Summary counters and the trainer's analytics rollups are kept current by
+triggers, so learning statistics and reports read a few small rows
+however many conversations and feedback entries are stored, and old
+conversations can be pruned by age through the timestamp index.
+LearningDatabase hands each thread its own tuned WAL connection to the file,
+and LearnedPatternIndex keeps the most-used learned patterns in memory.
+
+Usage:  python learning_database.py [--db deenbot_learning.db] [--prune-days N] [--rebuild-rollups]
+"""
+
+import os
+import sys
+import heapq
+import sqlite3
+import logging
+import argparse
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+DEFAULT_DB_PATH = 'deenbot_learning.db'
+
+# Delete conversations older than this many days (0 keeps everything)
+RETENTION_DAYS = int(os.environ.get('DEENBOT_CONVERSATION_RETENTION_DAYS', '0'))
+PRUNE_BATCH_SIZE = 5000
+
+# Connection tuning: WAL makes NORMAL durable across crashes (only the last commits can roll back on power loss)
+SYNCHRONOUS = 'NORMAL'
+CACHE_SIZE_KIB = 8192
+MMAP_SIZE = 64 * 1024 * 1024
+BUSY_TIMEOUT_MS = int(os.environ.get('DEENBOT_DB_BUSY_TIMEOUT_MS', '5000'))
+BUSY_RETRIES = 3
+
+# Learned patterns held in memory for request-time lookups
+PATTERN_INDEX_SIZE = int(os.environ.get('DEENBOT_PATTERN_INDEX_SIZE', '10000'))
+
+# Weight of the newest rating in a learned pattern's rolling effectiveness score
+FEEDBACK_SCORE_WEIGHT = 0.2
+
+# Recompute each summary table from its base table (migration backfill and --rebuild-rollups)
+LEARNING_STATS_BACKFILL = [
+    "DELETE FROM conversation_users",
+    '''INSERT INTO conversation_users (user_id, conversations)
+       SELECT user_id, COUNT(*) FROM conversations WHERE user_id IS NOT NULL GROUP BY user_id''',
+    "DELETE FROM learning_stats",
+    '''INSERT INTO learning_stats VALUES (1,
+        (SELECT COUNT(*) FROM conversations),
+        (SELECT COALESCE(SUM(effectiveness_score), 0.0) FROM conversations),
+        (SELECT COUNT(effectiveness_score) FROM conversations),
+        (SELECT COUNT(*) FROM conversation_users),
+        (SELECT COUNT(*) FROM learned_patterns))''',
+]
+
+PATTERN_TYPE_STATS_BACKFILL = [
+    "DELETE FROM pattern_type_stats",
+    '''INSERT INTO pattern_type_stats (response_type, patterns, effectiveness_sum, effectiveness_count)
+       SELECT COALESCE(response_type, ''), COUNT(*), COALESCE(SUM(effectiveness), 0.0), COUNT(effectiveness)
+       FROM learned_patterns GROUP BY 1''',
+]
+
+ANALYTICS_ROLLUPS_BACKFILL = [
+    "DELETE FROM feedback_rating_daily",
+    '''INSERT INTO feedback_rating_daily (day, rating, feedback)
+       SELECT COALESCE(date(created_at), ''), COALESCE(user_rating, 0), COUNT(*) FROM user_feedback GROUP BY 1, 2''',
+    "DELETE FROM feedback_suggestions",
+    '''INSERT INTO feedback_suggestions (suggestion, feedback)
+       SELECT improvement_suggestions, COUNT(*) FROM user_feedback
+       WHERE improvement_suggestions IS NOT NULL AND improvement_suggestions != ''
+       GROUP BY improvement_suggestions''',
+    "DELETE FROM response_quality_stats",
+    '''INSERT INTO response_quality_stats VALUES (1,
+        (SELECT COUNT(effectiveness_score) FROM conversations),
+        (SELECT COALESCE(SUM(effectiveness_score), 0.0) FROM conversations),
+        (SELECT COUNT(*) FROM conversations WHERE effectiveness_score >= 0.8),
+        (SELECT COUNT(*) FROM conversations WHERE effectiveness_score <= 0.5))''',
+    *PATTERN_TYPE_STATS_BACKFILL,
+]
+
+def _feedback_rollup(row, sign):
+    """Trigger body adding (sign 1) or removing (sign -1) a user_feedback row from its rollups"""
+    return f'''
+        INSERT INTO feedback_rating_daily (day, rating, feedback)
+        VALUES (COALESCE(date({row}.created_at), ''), COALESCE({row}.user_rating, 0), {sign})
+        ON CONFLICT (day, rating) DO UPDATE SET feedback = feedback + ({sign});
+        INSERT INTO feedback_suggestions (suggestion, feedback)
+        SELECT {row}.improvement_suggestions, {sign}
+        WHERE {row}.improvement_suggestions IS NOT NULL AND {row}.improvement_suggestions != ''
+        ON CONFLICT (suggestion) DO UPDATE SET feedback = feedback + ({sign});'''
+
+def _quality_rollup(row, sign):
+    """Trigger body adding or removing a conversation's effectiveness score"""
+    return f'''
+        UPDATE response_quality_stats SET
+            responses = responses + ({sign}) * ({row}.effectiveness_score IS NOT NULL),
+            score_sum = score_sum + ({sign}) * COALESCE({row}.effectiveness_score, 0.0),
+            high_quality = high_quality + ({sign}) * COALESCE({row}.effectiveness_score >= 0.8, 0),
+            low_quality = low_quality + ({sign}) * COALESCE({row}.effectiveness_score <= 0.5, 0)
+        WHERE id = 1;'''
+
+def _pattern_rollup(row, sign):
+    """Trigger body adding or removing a learned pattern from its response type's totals"""
+    return f'''
+        INSERT INTO pattern_type_stats (response_type, patterns, effectiveness_sum, effectiveness_count)
+        VALUES (COALESCE({row}.response_type, ''), {sign}, ({sign}) * COALESCE({row}.effectiveness, 0.0),
+                ({sign}) * ({row}.effectiveness IS NOT NULL))
+        ON CONFLICT (response_type) DO UPDATE SET
+            patterns = patterns + excluded.patterns,
+            effectiveness_sum = effectiveness_sum + excluded.effectiveness_sum,
+            effectiveness_count = effectiveness_count + excluded.effectiveness_count;'''
+
+# (version, description, statements); never edit an applied migration, add a new one
+MIGRATIONS = [
+    (1, "Learning tables", [
+        '''CREATE TABLE IF NOT EXISTS conversations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT,
+            message TEXT,
+            response TEXT,
+            timestamp DATETIME,
+            effectiveness_score REAL,
+            context TEXT
+        )''',
+        '''CREATE TABLE IF NOT EXISTS user_preferences (
+            user_id TEXT PRIMARY KEY,
+            preferences TEXT,
+            last_updated DATETIME
+        )''',
+        '''CREATE TABLE IF NOT EXISTS learned_patterns (
+            pattern TEXT PRIMARY KEY,
+            response_type TEXT,
+            effectiveness REAL,
+            usage_count INTEGER,
+            last_used DATETIME
+        )''',
+    ]),
+    (2, "Conversation indexes and trigger-maintained learning stats", [
+        "CREATE INDEX IF NOT EXISTS idx_conversations_timestamp ON conversations (timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_conversations_user_id ON conversations (user_id)",
+
+        # One row of running totals behind get_learning_stats
+        '''CREATE TABLE learning_stats (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            total_conversations INTEGER NOT NULL,
+            effectiveness_sum REAL NOT NULL,
+            effectiveness_count INTEGER NOT NULL,
+            unique_users INTEGER NOT NULL,
+            learned_patterns INTEGER NOT NULL
+        )''',
+        # Conversations per user, so unique users stay exact when conversations are pruned
+        '''CREATE TABLE conversation_users (
+            user_id TEXT PRIMARY KEY,
+            conversations INTEGER NOT NULL
+        )''',
+
+        # Backfill from existing data (the only full scan)
+        *LEARNING_STATS_BACKFILL,
+
+        '''CREATE TRIGGER conversations_insert_stats AFTER INSERT ON conversations BEGIN
+            UPDATE learning_stats SET
+                total_conversations = total_conversations + 1,
+                effectiveness_sum = effectiveness_sum + COALESCE(NEW.effectiveness_score, 0.0),
+                effectiveness_count = effectiveness_count + (NEW.effectiveness_score IS NOT NULL)
+            WHERE id = 1;
+            UPDATE learning_stats SET unique_users = unique_users + 1
+            WHERE id = 1 AND NEW.user_id IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM conversation_users WHERE user_id = NEW.user_id);
+            INSERT INTO conversation_users (user_id, conversations)
+            SELECT NEW.user_id, 1 WHERE NEW.user_id IS NOT NULL
+            ON CONFLICT (user_id) DO UPDATE SET conversations = conversations + 1;
+        END''',
+        '''CREATE TRIGGER conversations_delete_stats AFTER DELETE ON conversations BEGIN
+            UPDATE learning_stats SET
+                total_conversations = total_conversations - 1,
+                effectiveness_sum = effectiveness_sum - COALESCE(OLD.effectiveness_score, 0.0),
+                effectiveness_count = effectiveness_count - (OLD.effectiveness_score IS NOT NULL)
+            WHERE id = 1;
+            UPDATE conversation_users SET conversations = conversations - 1 WHERE user_id = OLD.user_id;
+            UPDATE learning_stats SET unique_users = unique_users - 1
+            WHERE id = 1 AND EXISTS (SELECT 1 FROM conversation_users WHERE user_id = OLD.user_id AND conversations = 0);
+            DELETE FROM conversation_users WHERE user_id = OLD.user_id AND conversations = 0;
+        END''',
+        '''CREATE TRIGGER conversations_score_stats AFTER UPDATE OF effectiveness_score ON conversations BEGIN
+            UPDATE learning_stats SET
+                effectiveness_sum = effectiveness_sum - COALESCE(OLD.effectiveness_score, 0.0)
+                                    + COALESCE(NEW.effectiveness_score, 0.0),
+                effectiveness_count = effectiveness_count - (OLD.effectiveness_score IS NOT NULL)
+                                      + (NEW.effectiveness_score IS NOT NULL)
+            WHERE id = 1;
+        END''',
+        # learned_patterns is written with an upsert, so a new pattern is an INSERT
+        '''CREATE TRIGGER learned_patterns_insert_stats AFTER INSERT ON learned_patterns BEGIN
+            UPDATE learning_stats SET learned_patterns = learned_patterns + 1 WHERE id = 1;
+        END''',
+        '''CREATE TRIGGER learned_patterns_delete_stats AFTER DELETE ON learned_patterns BEGIN
+            UPDATE learning_stats SET learned_patterns = learned_patterns - 1 WHERE id = 1;
+        END''',
+    ]),
+    (3, "Trainer tables", [
+        '''CREATE TABLE IF NOT EXISTS training_examples (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            input_message TEXT NOT NULL,
+            expected_response TEXT NOT NULL,
+            response_type TEXT NOT NULL,
+            category TEXT NOT NULL,
+            difficulty_level INTEGER DEFAULT 1,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            usage_count INTEGER DEFAULT 0,
+            success_rate REAL DEFAULT 0.0
+        )''',
+        '''CREATE TABLE IF NOT EXISTS user_feedback (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            conversation_id INTEGER,
+            user_rating INTEGER CHECK (user_rating >= 1 AND user_rating <= 5),
+            feedback_text TEXT,
+            improvement_suggestions TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (conversation_id) REFERENCES conversations (id)
+        )''',
+        '''CREATE TABLE IF NOT EXISTS response_improvements (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            original_response TEXT,
+            improved_response TEXT,
+            improvement_reason TEXT,
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            effectiveness_improvement REAL
+        )''',
+    ]),
+    (4, "Trigger-maintained analytics rollups for trainer reports", [
+        # Rating histogram per day (rating 0 = no rating given)
+        '''CREATE TABLE feedback_rating_daily (
+            day TEXT NOT NULL,
+            rating INTEGER NOT NULL,
+            feedback INTEGER NOT NULL,
+            PRIMARY KEY (day, rating)
+        )''',
+        '''CREATE TABLE feedback_suggestions (
+            suggestion TEXT PRIMARY KEY,
+            feedback INTEGER NOT NULL
+        )''',
+        "CREATE INDEX idx_feedback_suggestions_feedback ON feedback_suggestions (feedback)",
+        '''CREATE TABLE response_quality_stats (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            responses INTEGER NOT NULL,
+            score_sum REAL NOT NULL,
+            high_quality INTEGER NOT NULL,
+            low_quality INTEGER NOT NULL
+        )''',
+        '''CREATE TABLE pattern_type_stats (
+            response_type TEXT PRIMARY KEY,
+            patterns INTEGER NOT NULL,
+            effectiveness_sum REAL NOT NULL,
+            effectiveness_count INTEGER NOT NULL
+        )''',
+        *ANALYTICS_ROLLUPS_BACKFILL,
+
+        f"CREATE TRIGGER user_feedback_insert_rollups AFTER INSERT ON user_feedback BEGIN {_feedback_rollup('NEW', 1)} END",
+        f"CREATE TRIGGER user_feedback_delete_rollups AFTER DELETE ON user_feedback BEGIN {_feedback_rollup('OLD', -1)} END",
+        f'''CREATE TRIGGER user_feedback_update_rollups AFTER UPDATE ON user_feedback BEGIN
+            {_feedback_rollup('OLD', -1)} {_feedback_rollup('NEW', 1)}
+        END''',
+        f"CREATE TRIGGER conversations_insert_quality AFTER INSERT ON conversations BEGIN {_quality_rollup('NEW', 1)} END",
+        f"CREATE TRIGGER conversations_delete_quality AFTER DELETE ON conversations BEGIN {_quality_rollup('OLD', -1)} END",
+        f'''CREATE TRIGGER conversations_update_quality AFTER UPDATE OF effectiveness_score ON conversations BEGIN
+            {_quality_rollup('OLD', -1)} {_quality_rollup('NEW', 1)}
+        END''',
+        f"CREATE TRIGGER learned_patterns_insert_types AFTER INSERT ON learned_patterns BEGIN {_pattern_rollup('NEW', 1)} END",
+        f"CREATE TRIGGER learned_patterns_delete_types AFTER DELETE ON learned_patterns BEGIN {_pattern_rollup('OLD', -1)} END",
+        # The chat path re-upserts patterns constantly; only real changes touch the rollup
+        f'''CREATE TRIGGER learned_patterns_update_types AFTER UPDATE OF response_type, effectiveness ON learned_patterns
+            WHEN OLD.response_type IS NOT NEW.response_type OR OLD.effectiveness IS NOT NEW.effectiveness BEGIN
+            {_pattern_rollup('OLD', -1)} {_pattern_rollup('NEW', 1)}
+        END''',
+    ]),
+    (5, "One training example per normalized input", [
+        # Keep the oldest copy of anything imported or generated more than once
+        '''DELETE FROM training_examples WHERE id NOT IN (
+            SELECT MIN(id) FROM training_examples GROUP BY lower(trim(input_message)))''',
+        "CREATE UNIQUE INDEX idx_training_examples_input ON training_examples (lower(trim(input_message)))",
+    ]),
+    (6, "Learned pattern effectiveness from user ratings", [
+        # The patterns each conversation was answered for, and with which strategy
+        '''CREATE TABLE conversation_patterns (
+            conversation_id INTEGER NOT NULL,
+            pattern TEXT NOT NULL,
+            response_type TEXT,
+            PRIMARY KEY (conversation_id, pattern)
+        ) WITHOUT ROWID''',
+        # Stored effectiveness was the strategy's fixed confidence, not an outcome
+        "UPDATE learned_patterns SET effectiveness = NULL",
+        *PATTERN_TYPE_STATS_BACKFILL,
+        # A rating (1-5 mapped to 0-1) moves the rolling score of the patterns it answered,
+        # as long as they are still answered with the rated strategy
+        f'''CREATE TRIGGER user_feedback_insert_patterns AFTER INSERT ON user_feedback
+            WHEN NEW.user_rating IS NOT NULL BEGIN
+            UPDATE learned_patterns SET effectiveness = CASE
+                WHEN effectiveness IS NULL THEN (NEW.user_rating - 1) / 4.0
+                ELSE effectiveness * {1 - FEEDBACK_SCORE_WEIGHT} + (NEW.user_rating - 1) / 4.0 * {FEEDBACK_SCORE_WEIGHT}
+            END
+            WHERE EXISTS (SELECT 1 FROM conversation_patterns
+                          WHERE conversation_id = NEW.conversation_id
+                            AND conversation_patterns.pattern = learned_patterns.pattern
+                            AND conversation_patterns.response_type IS learned_patterns.response_type);
+        END''',
+        '''CREATE TRIGGER conversations_delete_patterns AFTER DELETE ON conversations BEGIN
+            DELETE FROM conversation_patterns WHERE conversation_id = OLD.id;
+        END''',
+    ]),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def schema_version(conn):
+    """Schema version recorded in the database file"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(conn):
+    """Apply pending migrations, each in its own transaction; returns the new version"""
+    current = schema_version(conn)
+    for version, description, statements in MIGRATIONS:
+        if version <= current:
+            continue
+        conn.commit()  # BEGIN below must not nest in an implicit transaction
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        logging.info(f"🗄️ Learning database migrated to v{version}: {description}")
+        current = version
+    return current
+
+def read_learning_stats(conn):
+    """Conversation, effectiveness, user and pattern totals from the summary row"""
+    row = conn.execute('''
+        SELECT total_conversations, effectiveness_sum, effectiveness_count, unique_users, learned_patterns
+        FROM learning_stats WHERE id = 1
+    ''').fetchone()
+    total_conversations, effectiveness_sum, effectiveness_count, unique_users, learned_patterns = row
+    return {
+        'total_conversations': total_conversations,
+        'average_effectiveness': effectiveness_sum / effectiveness_count if effectiveness_count else 0.0,
+        'learned_patterns': learned_patterns,
+        'unique_users': unique_users
+    }
+
+def rebuild_rollups(conn):
+    """Recompute every summary table from the base tables in one transaction"""
+    conn.commit()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        for statement in LEARNING_STATS_BACKFILL + ANALYTICS_ROLLUPS_BACKFILL:
+            conn.execute(statement)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+def prune_conversations(conn, retention_days=RETENTION_DAYS, batch_size=PRUNE_BATCH_SIZE):
+    """Delete conversations older than retention_days in indexed batches; returns rows deleted"""
+    if retention_days <= 0:
+        return 0
+    cutoff = (datetime.now() - timedelta(days=retention_days)).isoformat()
+    deleted = 0
+    while True:
+        cursor = conn.execute('''
+            DELETE FROM conversations WHERE id IN (
+                SELECT id FROM conversations WHERE timestamp < ? ORDER BY timestamp LIMIT ?
+            )
+        ''', (cutoff, batch_size))
+        conn.commit()
+        deleted += cursor.rowcount
+        if cursor.rowcount < batch_size:
+            break
+    if deleted:
+        logging.info(f"🧹 Pruned {deleted} conversations older than {retention_days} days")
+    return deleted
+
+class LearningDatabase:
+    """Per-thread connections to one learning database file
+
+    Every thread gets its own connection, so no cursor is ever shared
+    between threads. Connections use WAL, so readers never block the writer
+    and the writer never blocks readers. Writes go through transaction(),
+    which takes the write lock up front and counts the writes that are
+    waiting for it or holding it.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, busy_timeout_ms=BUSY_TIMEOUT_MS):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.pending_writes = 0  # writes waiting for or holding the write lock
+        self.busy_retries = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = {}  # thread ident -> (thread, connection)
+
+    def _connect(self):
+        """Open and tune a connection for the calling thread"""
+        # Owned by one thread; check_same_thread=False only so close() can close it from another
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute(f"PRAGMA synchronous = {SYNCHRONOUS}")
+        conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+        conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+        conn.execute(f"PRAGMA busy_timeout = {self.busy_timeout_ms}")
+        with self._lock:
+            # Connections of threads that have exited would otherwise stay open forever
+            for ident, (thread, stale) in list(self._connections.items()):
+                if not thread.is_alive():
+                    stale.close()
+                    del self._connections[ident]
+            self._connections[threading.get_ident()] = (threading.current_thread(), conn)
+        return conn
+
+    def connection(self):
+        """The calling thread's connection, opened on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """Write transaction on the calling thread's connection
+
+        Takes the write lock with BEGIN IMMEDIATE, so a busy database is
+        waited out (up to the busy timeout) before any statement runs rather
+        than failing halfway. Commits on success, rolls back on error.
+        """
+        conn = self.connection()
+        conn.commit()  # BEGIN below must not nest in an implicit transaction
+        with self._lock:
+            self.pending_writes += 1
+        try:
+            for attempt in range(BUSY_RETRIES + 1):
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    break
+                except sqlite3.OperationalError as e:
+                    if ('locked' not in str(e) and 'busy' not in str(e)) or attempt == BUSY_RETRIES:
+                        raise
+                    with self._lock:
+                        self.busy_retries += 1
+                    logging.warning(f"⚠️ Learning database busy, retrying write ({attempt + 1}/{BUSY_RETRIES})")
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        finally:
+            with self._lock:
+                self.pending_writes -= 1
+
+    def migrate(self):
+        """Bring the schema up to date; returns the version"""
+        return migrate(self.connection())
+
+    def open_connections(self):
+        """Number of per-thread connections currently open"""
+        with self._lock:
+            return len(self._connections)
+
+    def close(self):
+        """Close every thread's connection; threads reconnect on next use"""
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for _, conn in connections:
+            conn.close()
+        # Other threads notice their closed connection through the error it raises
+        self._local = threading.local()
+
+class LearnedPatternIndex:
+    """Bounded in-memory view of learned_patterns for lookups on the request path
+
+    Maps pattern -> [response_type, effectiveness, usage_count] for the
+    most-used patterns. The learning write path reports every upsert, with
+    the values the database returned, so the index matches the table for
+    every pattern it holds; a rating stored by another process reaches the
+    index with the pattern's next upsert. Past capacity, the least-used patterns are
+    dropped in one pass down to 90% of capacity.
+    """
+
+    def __init__(self, capacity=PATTERN_INDEX_SIZE):
+        self.capacity = max(int(capacity), 1)
+        self.patterns = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def load(self, conn):
+        """Fill the index with the most-used patterns; returns how many were loaded"""
+        rows = conn.execute('''
+            SELECT pattern, response_type, effectiveness, COALESCE(usage_count, 0)
+            FROM learned_patterns ORDER BY usage_count DESC LIMIT ?
+        ''', (self.capacity,)).fetchall()
+        with self._lock:
+            self.patterns = {pattern: [response_type, effectiveness, usage] for pattern, response_type, effectiveness, usage in rows}
+        return len(rows)
+
+    def record(self, pattern, response_type, effectiveness, usage_count):
+        """Mirror one committed learned_patterns upsert"""
+        with self._lock:
+            self.patterns[pattern] = [response_type, effectiveness, usage_count]
+            if len(self.patterns) > self.capacity:
+                keep = heapq.nlargest(int(self.capacity * 0.9), self.patterns.items(), key=lambda item: item[1][2])
+                self.patterns = dict(keep)
+
+    def best(self, patterns, min_effectiveness, min_usage):
+        """Most effective (response_type, effectiveness, usage_count) learned for any of patterns
+
+        Only entries seen at least min_usage times with effectiveness of at
+        least min_effectiveness qualify; None if nothing does.
+        """
+        best = None
+        found = False
+        for pattern in patterns:
+            entry = self.patterns.get(pattern)
+            if entry is None:
+                continue
+            found = True
+            response_type, effectiveness, usage = entry
+            if effectiveness is None or effectiveness < min_effectiveness or usage < min_usage:
+                continue
+            if best is None or (effectiveness, usage) > (best[1], best[2]):
+                best = (response_type, effectiveness, usage)
+        with self._lock:
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return best
+
+    def stats(self):
+        """(hits, misses) for the metrics cache hit ratio"""
+        return self.hits, self.misses
+
+def main():
+    """Migrate a learning database and report its stats"""
+    parser = argparse.ArgumentParser(description="Migrate deenbot_learning.db and show its learning stats")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help="learning database file")
+    parser.add_argument('--prune-days', type=int, default=0, help="delete conversations older than N days")
+    parser.add_argument('--rebuild-rollups', action='store_true', help="recompute summary tables from the base tables")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    database = LearningDatabase(args.db)
+    conn = database.connection()
+    before = schema_version(conn)
+    after = migrate(conn)
+    print(f"🗄️ {args.db}: schema v{before} -> v{after}")
+    if args.rebuild_rollups:
+        rebuild_rollups(conn)
+        print("🔄 Rollups rebuilt")
+    if args.prune_days:
+        print(f"🧹 Pruned {prune_conversations(conn, args.prune_days)} conversations")
+    for key, value in read_learning_stats(conn).items():
+        print(f"   {key}: {value}")
+    database.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Link Graph Indexer
+Complete Islamic Study Guide Extended Edition
+
+Reads every HTML page exactly once, extracting its links and design
+compliance markers in a single pass, and caches the results by mtime.
+Broken-link, orphan-page and design-violation queries are answered from
+the graph without re-reading target files.
+"""
+
+import os
+import re
+import json
+import argparse
+
+from incremental_build import atomic_write
+
+CACHE_FILE = '.link_graph_cache.json'
+CACHE_VERSION = 1
+
+MAIN_INDEX = 'complete-islamic-study-guide-dark.html'
+
+# Entry points that are not expected to have inbound links
+ENTRY_PAGES = {MAIN_INDEX, 'index.html'}
+
+HREF_PATTERN = re.compile(r'href=["\']([^"\']+)["\']')
+
+REQUIRED_CSS_VARIABLES = [
+    '--bg-primary: #0a0f0f',
+    '--accent-primary: #10b981',
+    '--text-primary: #ffffff'
+]
+
+def classify_link(href):
+    """Classify an href the same way verify_all_links always has"""
+    if href.startswith('http'):
+        return 'external'
+    elif href.startswith('#'):
+        return 'anchor'
+    elif href.startswith('mailto:'):
+        return 'email'
+    elif href.startswith('tel:'):
+        return 'phone'
+    return 'internal'
+
+def extract_links(content):
+    """All (type, href) pairs in a page"""
+    return [(classify_link(href), href) for href in HREF_PATTERN.findall(content)]
+
+def link_target(href):
+    """File an internal href points at, without fragment or query string"""
+    return href.split('#', 1)[0].split('?', 1)[0]
+
+def check_file_content(content):
+    """Validate that a page exists with real, correctly designed content"""
+    if len(content.strip()) == 0:
+        return False, "File is empty"
+
+    # Check if file has proper HTML structure
+    if '<!DOCTYPE html>' not in content:
+        return False, "Not a valid HTML file"
+
+    # Check if file has the correct design (CSS variables)
+    if '--bg-primary: #0a0f0f' not in content:
+        return False, "Does not have correct design (CSS variables missing)"
+
+    # Check if file has content beyond just HTML structure
+    if len(content) < 1000:
+        return False, "File has minimal content"
+
+    return True, "File exists and has proper content"
+
+def check_design_compliance(filename, content):
+    """Validate that a page follows the exact design policy"""
+    # Check for required CSS variables
+    for var in REQUIRED_CSS_VARIABLES:
+        if var not in content:
+            return False, f"Missing required CSS variable: {var}"
+
+    # Check for correct font family
+    if "'Georgia', 'Times New Roman', serif" not in content:
+        return False, "Incorrect font family"
+
+    # Check for theme toggle functionality
+    if 'toggleTheme()' not in content:
+        return False, "Missing theme toggle functionality"
+
+    # Check for back link to main index (skip for main index page itself)
+    if filename != MAIN_INDEX and MAIN_INDEX not in content:
+        return False, "Missing back link to main index"
+
+    return True, "Design compliance verified"
+
+def index_page(filename, content):
+    """Everything the graph needs from one page, extracted in one pass"""
+    content_ok, content_message = check_file_content(content)
+    design_ok, design_message = check_design_compliance(filename, content)
+    return {
+        'links': extract_links(content),
+        'content_ok': content_ok,
+        'content_message': content_message,
+        'design_ok': design_ok,
+        'design_message': design_message
+    }
+
+class LinkGraph:
+    """Link graph over the site's HTML pages, cached by mtime"""
+
+    def __init__(self, root='.', cache_path=CACHE_FILE):
+        self.root = root
+        self.cache_path = os.path.join(root, cache_path) if cache_path else None
+        self.pages = {}
+        self.files_read = 0
+
+    def _load_cache(self):
+        """Load cached page records, ignoring stale or unreadable caches"""
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        if cache.get('version') != CACHE_VERSION:
+            return {}
+        return cache.get('pages', {})
+
+    def _save_cache(self):
+        """Persist page records for the next build"""
+        if self.cache_path:
+            atomic_write(self.cache_path, json.dumps({'version': CACHE_VERSION, 'pages': self.pages}))
+
+    def build(self):
+        """Index every HTML page, re-reading only files whose mtime or size changed"""
+        cached = self._load_cache()
+        pages = {}
+
+        for filename in sorted(os.listdir(self.root)):
+            if not filename.endswith('.html'):
+                continue
+            path = os.path.join(self.root, filename)
+            if not os.path.isfile(path):
+                continue
+
+            stat = os.stat(path)
+            record = cached.get(filename)
+            if record and record['mtime_ns'] == stat.st_mtime_ns and record['size'] == stat.st_size:
+                pages[filename] = record
+                continue
+
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                record = index_page(filename, content)
+            except Exception as e:
+                record = {
+                    'links': [],
+                    'content_ok': False,
+                    'content_message': f"Error reading file: {e}",
+                    'design_ok': False,
+                    'design_message': f"Error checking design compliance: {e}"
+                }
+            record['mtime_ns'] = stat.st_mtime_ns
+            record['size'] = stat.st_size
+            pages[filename] = record
+            self.files_read += 1
+
+        self.pages = pages
+        self._save_cache()
+        return self
+
+    def internal_links(self, filename):
+        """Internal .html link targets of a page, in document order"""
+        return [
+            link_target(href) for link_type, href in self.pages[filename]['links']
+            if link_type == 'internal' and link_target(href).endswith('.html')
+        ]
+
+    def check_target(self, target):
+        """(ok, message) for a link target, answered from the graph"""
+        record = self.pages.get(target)
+        if record is None:
+            return False, "File does not exist"
+        return record['content_ok'], record['content_message']
+
+    def broken_links(self):
+        """(source, target, reason) for every internal link that does not resolve to a valid page"""
+        broken = []
+        for filename in self.pages:
+            for target in self.internal_links(filename):
+                ok, message = self.check_target(target)
+                if not ok:
+                    broken.append((filename, target, message))
+        return broken
+
+    def missing_targets(self, source=None):
+        """Link targets that do not exist, optionally only those linked from source"""
+        sources = [source] if source else list(self.pages)
+        return sorted({
+            target for filename in sources if filename in self.pages
+            for target in self.internal_links(filename) if target not in self.pages
+        })
+
+    def inbound_links(self):
+        """Map of page -> set of pages linking to it"""
+        inbound = {filename: set() for filename in self.pages}
+        for filename in self.pages:
+            for target in self.internal_links(filename):
+                if target in inbound and target != filename:
+                    inbound[target].add(filename)
+        return inbound
+
+    def orphan_pages(self):
+        """Pages no other page links to"""
+        return sorted(
+            filename for filename, sources in self.inbound_links().items()
+            if not sources and filename not in ENTRY_PAGES
+        )
+
+    def design_violations(self):
+        """(page, reason) for every page that breaks the design policy"""
+        return [
+            (filename, record['design_message']) for filename, record in self.pages.items()
+            if not record['design_ok']
+        ]
+
+    def report(self):
+        """Summary of all graph queries"""
+        return {
+            'pages': len(self.pages),
+            'files_read': self.files_read,
+            'internal_links': sum(len(self.internal_links(filename)) for filename in self.pages),
+            'broken_links': [
+                {'source': source, 'target': target, 'reason': reason}
+                for source, target, reason in self.broken_links()
+            ],
+            'orphan_pages': self.orphan_pages(),
+            'design_violations': [
+                {'page': page, 'reason': reason} for page, reason in self.design_violations()
+            ]
+        }
+
+def build_link_graph(root='.', use_cache=True):
+    """Build (or refresh) the link graph for a site directory"""
+    return LinkGraph(root, CACHE_FILE if use_cache else None).build()
+
+def main():
+    """Print broken links, orphan pages and design violations"""
+    parser = argparse.ArgumentParser(description="Single-pass link graph for the study guide pages")
+    parser.add_argument('--root', default='.', help="directory containing the HTML pages")
+    parser.add_argument('--no-cache', action='store_true', help="ignore and do not write the mtime cache")
+    parser.add_argument('--json', action='store_true', help="print the full report as JSON")
+    args = parser.parse_args()
+
+    graph = build_link_graph(args.root, use_cache=not args.no_cache)
+    report = graph.report()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print("LINK GRAPH REPORT")
+    print("=" * 60)
+    print(f"Pages indexed: {report['pages']} ({report['files_read']} read, rest from cache)")
+    print(f"Internal links: {report['internal_links']}")
+    print(f"Broken links: {len(report['broken_links'])}")
+    for item in report['broken_links']:
+        print(f"   {item['source']} -> {item['target']}: {item['reason']}")
+    print(f"Orphan pages: {len(report['orphan_pages'])}")
+    for page in report['orphan_pages']:
+        print(f"   {page}")
+    print(f"Design violations: {len(report['design_violations'])}")
+    for item in report['design_violations']:
+        print(f"   {item['page']}: {item['reason']}")
+
+if __name__ == "__main__":
+    main()
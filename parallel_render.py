@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Parallel Page Rendering - Process Pool Render Mode for the Content Generators
+Renders page structure dicts across a process pool with a template compiled
+once per process, then writes the results in bulk. A page that fails to
+render or write is reported on its own and the others are still written.
+NO EMOJIS - This is a serious Islamic research application
+"""
+
+import os
+import time
+import string
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from incremental_build import atomic_write, STATUS_SKIPPED, STATUS_WRITTEN
+
+# Build status of a page whose render or write raised
+STATUS_FAILED = 'failed'
+
+class CompiledTemplate:
+    """A str.format template parsed once into literal and field chunks
+
+    Rendering joins the pre-split chunks instead of re-parsing the template
+    for every page. Output is identical to template.format(**values).
+    """
+
+    def __init__(self, template):
+        self.template = template
+        self.chunks = list(string.Formatter().parse(template))
+        self.fields = {field for _, field, _, _ in self.chunks if field is not None}
+        # Attribute/index lookups and nested specs are left to str.format
+        self.simple = all(
+            field is None or (field.isidentifier() and '{' not in (spec or ''))
+            for _, field, spec, _ in self.chunks
+        )
+
+    def render(self, **values):
+        """Render the template with the given field values"""
+        if not self.simple:
+            return self.template.format(**values)
+
+        parts = []
+        for literal, field, spec, conversion in self.chunks:
+            parts.append(literal)
+            if field is not None:
+                value = values[field]
+                if conversion == 'r':
+                    value = repr(value)
+                elif conversion == 'a':
+                    value = ascii(value)
+                elif conversion == 's':
+                    value = str(value)
+                parts.append(format(value, spec or ''))
+        return ''.join(parts)
+
+def default_jobs():
+    """Default worker count - one per core"""
+    return os.cpu_count() or 1
+
+def job_count(value):
+    """argparse type for --jobs: a whole number of at least 1"""
+    try:
+        jobs = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid job count: {value!r}")
+    if jobs < 1:
+        raise argparse.ArgumentTypeError(f"job count must be at least 1, got {jobs}")
+    return jobs
+
+def _render_page(page):
+    """Worker: render one page and time it; the error message replaces the content if it fails"""
+    filename, render, render_args = page
+    started = time.perf_counter()
+    try:
+        content, error = render(*render_args), None
+    except Exception as e:
+        content, error = None, str(e)
+    return filename, content, error, time.perf_counter() - started
+
+def render_pages(pages, jobs=None, builder=None):
+    """Render (filename, render, render_args) pages in parallel and write them in bulk
+
+    With an IncrementalPageBuilder, pages whose inputs are unchanged are
+    skipped before any work is sent to the pool and identical output is not
+    rewritten. Returns a list of (filename, status, render_seconds, error);
+    error is None unless status is STATUS_FAILED.
+    """
+    if jobs is None:
+        jobs = default_jobs()
+    if jobs < 1:
+        raise ValueError(f"jobs must be at least 1, got {jobs}")
+
+    pending = []
+    build_keys = {}
+    results = []
+    for filename, render, render_args in pages:
+        if builder is not None:
+            build_key = builder.build_key(render, *render_args)
+            if builder.is_current(filename, build_key):
+                builder.stats[STATUS_SKIPPED] += 1
+                results.append((filename, STATUS_SKIPPED, 0.0, None))
+                continue
+            build_keys[filename] = build_key
+        pending.append((filename, render, tuple(render_args)))
+
+    if jobs <= 1 or len(pending) <= 1:
+        rendered = [_render_page(page) for page in pending]
+    else:
+        chunksize = max(1, len(pending) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            rendered = list(executor.map(_render_page, pending, chunksize=chunksize))
+
+    # Bulk write once every page has rendered; failed pages are left as they were
+    for filename, content, error, seconds in rendered:
+        if error is None:
+            try:
+                if builder is not None:
+                    status = builder.write_page(filename, content, build_keys[filename])
+                else:
+                    atomic_write(filename, content)
+                    status = STATUS_WRITTEN
+            except Exception as e:
+                error = str(e)
+        if error is not None:
+            status = STATUS_FAILED
+        results.append((filename, status, seconds, error))
+
+    return results
+
+def failed_pages(results):
+    """(filename, error) of every page that failed to render or write"""
+    return [(filename, error) for filename, status, _, error in results if status == STATUS_FAILED]
+
+def print_render_timings(results, elapsed, jobs):
+    """Per-page timing output plus a total"""
+    for filename, status, seconds, _ in results:
+        print(f"   {filename}: {status} ({seconds * 1000:.1f} ms)")
+    rendered = [seconds for _, status, seconds, _ in results if status != STATUS_SKIPPED]
+    print(f"Rendered {len(rendered)} of {len(results)} pages with {jobs} jobs "
+          f"in {elapsed:.2f}s (render time {sum(rendered):.2f}s)")
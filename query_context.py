@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Query Context - Per-Request Memo for the Routing Cascade
+One QueryContext is built per /chat message. It holds the normalized and
+tokenized message and the result of every knowledge search already run
+for it, so a later stage that needs the same search (SECOND after an
+unanswered FIRST-A) reuses the result instead of searching again.
+Process-wide counters record how much work was computed and how much
+was saved.
+"""
+
+import threading
+
+class QueryWorkStats:
+    """Searches computed and reused across all requests, per search name"""
+
+    def __init__(self):
+        self.computed = {}
+        self.saved = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, reused):
+        """Count one computed or reused search"""
+        counts = self.saved if reused else self.computed
+        with self._lock:
+            counts[name] = counts.get(name, 0) + 1
+
+    def totals(self):
+        """{'computed': {...}, 'saved': {...}} snapshot"""
+        with self._lock:
+            return {'computed': dict(self.computed), 'saved': dict(self.saved)}
+
+query_work = QueryWorkStats()
+
+class QueryContext:
+    """The message of one request in the forms stages use, and the searches run on it"""
+
+    __slots__ = ('message', 'lower', 'tokens', 'results', 'saved')
+
+    def __init__(self, message):
+        self.message = message
+        self.lower = message.lower().strip()
+        self.tokens = self.lower.split()
+        self.results = {}
+        self.saved = 0
+
+    def once(self, name, search, *args):
+        """search(*args), computed on the first call for this request and reused after"""
+        if name in self.results:
+            self.saved += 1
+            query_work.record(name, reused=True)
+            return self.results[name]
+        result = search(*args)
+        self.results[name] = result
+        query_work.record(name, reused=False)
+        return result
@@ -0,0 +1,709 @@
+#!/usr/bin/env python3
+"""
+Question Corpora - Shared by the DeenBot Test Scripts and the Regression Benchmark
+Every question list the test scripts use, grouped by corpus and category
+"""
+
+# From test_100_questions.py
+CORE_KNOWLEDGE_QUESTIONS = {
+    "Core Islamic Concepts": [
+        "What is Islam?",
+        "What is Taqwa?",
+        "What are the five pillars of Islam?",
+        "What is the Shahada?",
+        "What is Salah?",
+        "What is Zakat?",
+        "What is Sawm?",
+        "What is Hajj?"
+    ],
+    "Prayer and Worship": [
+        "How to perform wudu?",
+        "How to pray?",
+        "What is dua?",
+        "What is dhikr?",
+        "What is tahajjud?",
+        "What are prayer times?",
+        "How to make dua?",
+        "What is the importance of prayer?"
+    ],
+    "Islamic Ethics and Character": [
+        "What is patience in Islam?",
+        "What is gratitude in Islam?",
+        "What is humility in Islam?",
+        "What is honesty in Islam?",
+        "How to control anger?",
+        "What is sabr?",
+        "What is shukr?",
+        "What is tawadu?"
+    ],
+    "Family and Relationships": [
+        "How to treat parents?",
+        "What is marriage in Islam?",
+        "How to raise children?",
+        "What is family in Islam?",
+        "How to be a good spouse?",
+        "What are family rights?",
+        "How to resolve family conflicts?",
+        "What is parenting in Islam?"
+    ],
+    "Business and Finance": [
+        "What is Islamic business?",
+        "What is riba?",
+        "What is charity in Islam?",
+        "How to manage wealth?",
+        "What is halal business?",
+        "What is Islamic banking?",
+        "How to give zakat?",
+        "What is sadaqah?"
+    ],
+    "Health and Wellness": [
+        "What is health in Islam?",
+        "How to seek medical treatment?",
+        "What is hygiene in Islam?",
+        "What is exercise in Islam?",
+        "How to maintain health?",
+        "What is Islamic medicine?",
+        "How to stay healthy?",
+        "What is wellness in Islam?"
+    ],
+    "Education and Knowledge": [
+        "What is education in Islam?",
+        "How to seek knowledge?",
+        "What is wisdom in Islam?",
+        "How to understand Islam?",
+        "What is learning in Islam?",
+        "How to gain wisdom?",
+        "What is Islamic education?",
+        "How to study Islam?"
+    ],
+    "Social Justice and Community": [
+        "What is justice in Islam?",
+        "What is equality in Islam?",
+        "How to build community?",
+        "How to serve others?",
+        "What is social justice?",
+        "How to help neighbors?",
+        "What is community service?",
+        "How to promote unity?"
+    ],
+    "Advanced Islamic Topics": [
+        "What is aqeedah?",
+        "What is fiqh?",
+        "What is seerah?",
+        "What is sufism?",
+        "What are Islamic beliefs?",
+        "What is Islamic law?",
+        "What is prophet biography?",
+        "What is spirituality?"
+    ],
+    "Islamic History and Civilization": [
+        "What is Islamic history?",
+        "What was the Golden Age?",
+        "What is Al-Andalus?",
+        "What is the Ottoman Empire?",
+        "What is Islamic civilization?",
+        "What are Muslim achievements?",
+        "What is Islamic Spain?",
+        "What is Muslim history?"
+    ],
+    "Contemporary Issues": [
+        "What are modern challenges?",
+        "How to deal with technology?",
+        "What is interfaith dialogue?",
+        "How to promote understanding?",
+        "What is Islamic finance?",
+        "How to bank halal?",
+        "What is environmental protection?",
+        "How to protect the environment?"
+    ],
+    "Personal Development": [
+        "What is Islamic psychology?",
+        "How to manage mental health?",
+        "What is emotional intelligence?",
+        "How to control emotions?",
+        "How to manage stress?",
+        "How to cope with difficulties?",
+        "How to set goals?",
+        "How to achieve objectives?"
+    ],
+    "Advanced Worship": [
+        "What is night prayer?",
+        "How to do advanced dhikr?",
+        "What are dhikr methods?",
+        "What are dua collections?",
+        "How to make supplications?",
+        "How to memorize Quran?",
+        "What is hifz?",
+        "How to recite Quran?"
+    ],
+    "Islamic Culture": [
+        "What is Islamic art?",
+        "What is Muslim art?",
+        "What is Islamic architecture?",
+        "How to design mosques?",
+        "What is Islamic literature?",
+        "What is Muslim literature?",
+        "What is Islamic music?",
+        "What are nasheeds?"
+    ],
+    "Quranic Knowledge": [
+        "What are important Quranic verses?",
+        "What are essential verses?",
+        "How to understand Quran?",
+        "What are hadith collections?",
+        "What are hadith books?",
+        "How to verify hadith?",
+        "What is authentic hadith?",
+        "How to study hadith?"
+    ],
+    "Additional Topics": [
+        "What is Ramadan?",
+        "What is fasting?",
+        "What is pilgrimage?",
+        "What is the Kaaba?",
+        "What is Mecca?",
+        "What is Medina?",
+        "What is the Prophet's Mosque?",
+        "What is the Black Stone?"
+    ],
+    "Edge Cases and Variations": [
+        "What is the meaning of Bismillah?",
+        "How to become a better Muslim?",
+        "What is the purpose of life?",
+        "How to find peace?",
+        "What is the best way to worship?",
+        "How to strengthen faith?",
+        "What is the most important thing in Islam?",
+        "How to be closer to Allah?"
+    ],
+    "Complex Questions": [
+        "What is the difference between Sunnah and Hadith?",
+        "How does Islam view modern science?",
+        "What is the Islamic perspective on democracy?",
+        "How to balance tradition and modernity?",
+        "What is the role of women in Islam?",
+        "How to deal with non-Muslims?",
+        "What is jihad in Islam?",
+        "How to understand Islamic rulings?"
+    ],
+    "Practical Life": [
+        "How to eat according to Sunnah?",
+        "What is Islamic etiquette?",
+        "How to dress modestly?",
+        "What is halal food?",
+        "How to greet people?",
+        "What is visiting etiquette?",
+        "How to be a good neighbor?",
+        "What is social media etiquette?"
+    ],
+    "Spiritual Growth": [
+        "How to increase iman?",
+        "What is spiritual purification?",
+        "How to develop taqwa?",
+        "What is heart purification?",
+        "How to find inner peace?",
+        "What is spiritual growth?",
+        "How to connect with Allah?",
+        "What is divine love?"
+    ],
+    "Final Comprehensive Questions": [
+        "What is the complete Islamic way of life?",
+        "How to implement Islam in daily life?",
+        "What is the ultimate goal of a Muslim?",
+        "How to be successful in this life and the next?",
+        "What is the comprehensive Islamic guidance?",
+        "How to live as a true Muslim?",
+        "What is the path to Paradise?",
+        "How to achieve eternal happiness?"
+    ]
+}
+
+# From test_100_random_questions.py
+RANDOM_QUESTIONS = {
+    "Random Islamic concepts": [
+        "What is the meaning of Bismillah?",
+        "How to perform wudu correctly?",
+        "What are the benefits of fasting?",
+        "How to make dua for parents?",
+        "What is the importance of charity?",
+        "How to strengthen iman?",
+        "What is the best time to pray?",
+        "How to deal with anxiety?",
+        "What is Islamic banking?",
+        "How to raise children Islamically?"
+    ],
+    "Random daily life questions": [
+        "How to be a good neighbor?",
+        "What is halal food?",
+        "How to dress modestly?",
+        "What is Islamic etiquette?",
+        "How to greet people?",
+        "What is visiting etiquette?",
+        "How to eat according to Sunnah?",
+        "What is social media etiquette?",
+        "How to be patient?",
+        "What is gratitude in Islam?"
+    ],
+    "Random spiritual questions": [
+        "How to purify the heart?",
+        "What is dhikr?",
+        "How to connect with Allah?",
+        "What is spiritual growth?",
+        "How to find inner peace?",
+        "What is divine love?",
+        "How to increase taqwa?",
+        "What is the purpose of life?",
+        "How to be closer to Allah?",
+        "What is the best way to worship?"
+    ],
+    "Random family questions": [
+        "How to treat parents?",
+        "What is marriage in Islam?",
+        "How to resolve conflicts?",
+        "What are family rights?",
+        "How to be a good spouse?",
+        "What is parenting in Islam?",
+        "How to raise children?",
+        "What is family in Islam?",
+        "How to deal with family problems?",
+        "What is divorce in Islam?"
+    ],
+    "Random business questions": [
+        "What is Islamic business?",
+        "How to avoid riba?",
+        "What is halal business?",
+        "How to manage wealth?",
+        "What is charity in Islam?",
+        "How to give zakat?",
+        "What is sadaqah?",
+        "How to invest halal?",
+        "What is Islamic finance?",
+        "How to bank halal?"
+    ],
+    "Random health questions": [
+        "What is health in Islam?",
+        "How to seek medical treatment?",
+        "What is hygiene in Islam?",
+        "How to stay healthy?",
+        "What is Islamic medicine?",
+        "How to maintain health?",
+        "What is exercise in Islam?",
+        "How to cope with stress?",
+        "What is mental health in Islam?",
+        "How to manage emotions?"
+    ],
+    "Random education questions": [
+        "What is education in Islam?",
+        "How to seek knowledge?",
+        "What is wisdom in Islam?",
+        "How to understand Islam?",
+        "What is learning in Islam?",
+        "How to gain wisdom?",
+        "What is Islamic education?",
+        "How to study Islam?",
+        "What is the importance of knowledge?",
+        "How to memorize Quran?"
+    ],
+    "Random social questions": [
+        "What is justice in Islam?",
+        "How to build community?",
+        "What is equality in Islam?",
+        "How to serve others?",
+        "What is social justice?",
+        "How to help neighbors?",
+        "What is community service?",
+        "How to promote unity?",
+        "What is the role of women?",
+        "How to deal with non-Muslims?"
+    ],
+    "Random advanced topics": [
+        "What is aqeedah?",
+        "What is fiqh?",
+        "What is seerah?",
+        "What is sufism?",
+        "What is Islamic history?",
+        "What was the Golden Age?",
+        "What is Al-Andalus?",
+        "What is the Ottoman Empire?",
+        "What is Islamic civilization?",
+        "What are Muslim achievements?"
+    ],
+    "Random contemporary issues": [
+        "What are modern challenges?",
+        "How to deal with technology?",
+        "What is interfaith dialogue?",
+        "How to promote understanding?",
+        "What is Islamic finance?",
+        "How to bank halal?",
+        "What is environmental protection?",
+        "How to protect the environment?",
+        "What is Islamic psychology?",
+        "How to manage mental health?"
+    ]
+}
+
+# From 50_new_islamic_questions.py
+REALISTIC_QUESTIONS = {
+    "Prayer & Worship": [
+        "Can I pray if I'm bleeding from a cut?",
+        "What if I miss Fajr prayer?",
+        "How do I know which direction to pray?",
+        "Can I pray in my work clothes?",
+        "What should I do if I forget how many rakats I prayed?",
+        "Is it okay to pray with nail polish?",
+        "Can I pray if I have makeup on?",
+        "What if I'm traveling and can't find a clean place to pray?"
+    ],
+    "Fasting & Ramadan": [
+        "What if I accidentally eat during fasting?",
+        "Can I take medicine while fasting?",
+        "What if I forget I'm fasting and drink water?",
+        "Do I need to make up missed fasts from last year?",
+        "Can I brush my teeth while fasting?",
+        "What if I'm sick during Ramadan?",
+        "Is it okay to exercise while fasting?",
+        "What if I break my fast early by mistake?"
+    ],
+    "Family & Relationships": [
+        "How should I treat my non-Muslim family?",
+        "What if my parents don't approve of my Islamic practices?",
+        "Can I marry someone from a different culture?",
+        "How do I explain Islam to my children?",
+        "What if my spouse doesn't pray?",
+        "How should I handle family conflicts?",
+        "Can I attend non-Muslim family celebrations?",
+        "What if my family doesn't understand my hijab?"
+    ],
+    "Work & Business": [
+        "How do I handle riba in my job?",
+        "Can I work in a bank?",
+        "What if my boss asks me to lie?",
+        "How do I maintain Islamic values at work?",
+        "Can I shake hands with the opposite gender?",
+        "What if my company serves alcohol at events?",
+        "How do I handle interest-based loans?",
+        "Can I work on Fridays?"
+    ],
+    "Modern Life": [
+        "Is it okay to use social media?",
+        "How do I deal with Islamophobia online?",
+        "Can I listen to music?",
+        "What if my friends drink alcohol?",
+        "How do I maintain modesty in modern society?",
+        "Can I watch movies and TV shows?",
+        "How do I handle dating apps?",
+        "What if I'm invited to a party with alcohol?"
+    ],
+    "Health & Medical": [
+        "Can I get a tattoo for medical reasons?",
+        "What if I need a blood transfusion?",
+        "How do I handle medical procedures during Ramadan?",
+        "Can I take birth control?",
+        "What if I need surgery?",
+        "How do I maintain health while fasting?",
+        "Can I use pain medication?",
+        "What if I'm pregnant during Ramadan?"
+    ],
+    "Education & Learning": [
+        "How do I study Islam while in school?",
+        "Can I attend a non-Muslim university?",
+        "What if my teacher says something against Islam?",
+        "How do I handle exams during Ramadan?",
+        "Can I study with the opposite gender?",
+        "What if my school serves non-halal food?",
+        "How do I balance Islamic studies with other subjects?",
+        "Can I participate in school sports?"
+    ],
+    "Community & Society": [
+        "How do I find a good mosque?",
+        "What if there's no mosque in my area?",
+        "How do I deal with cultural differences in Islam?",
+        "Can I participate in community events?",
+        "What if my neighbors are Islamophobic?",
+        "How do I help new Muslims?",
+        "Can I volunteer at non-Muslim organizations?",
+        "What if my community doesn't understand Islam?"
+    ]
+}
+
+# From deenbot_48_young_muslim_men_test.py
+YOUNG_MUSLIM_MEN_QUESTIONS = {
+    "Identity and Faith": [
+        "How can I strengthen my iman as a young Muslim man?",
+        "What should I do when I feel disconnected from my faith?",
+        "How do I balance being Muslim with modern life?",
+        "What are the most important duas for young men?",
+        "How can I be a good role model for other young Muslims?",
+        "What should I do when friends question my Islamic practices?",
+        "How do I explain my faith to non-Muslim classmates?",
+        "What are the signs of weak iman and how to fix them?"
+    ],
+    "Education and Career": [
+        "How should I choose my career path as a Muslim?",
+        "What does Islam say about pursuing higher education?",
+        "How do I maintain Islamic values in a competitive work environment?",
+        "What should I do if my job conflicts with prayer times?",
+        "How can I be successful while staying true to Islamic principles?",
+        "What does Islam say about entrepreneurship and business?",
+        "How do I handle workplace discrimination as a Muslim?",
+        "What are the Islamic guidelines for financial planning?"
+    ],
+    "Relationships and Marriage": [
+        "What should I look for in a potential spouse?",
+        "How do I approach marriage as a young Muslim man?",
+        "What are my responsibilities towards my future wife?",
+        "How do I handle family pressure about marriage?",
+        "What does Islam say about dating before marriage?",
+        "How should I interact with women in professional settings?",
+        "What are the rights and duties in an Islamic marriage?",
+        "How do I prepare financially for marriage?"
+    ],
+    "Social Life and Friendships": [
+        "How do I make Muslim friends in a new city?",
+        "What should I do when friends want to do haram activities?",
+        "How do I handle peer pressure to drink or party?",
+        "What are good social activities for young Muslim men?",
+        "How do I maintain friendships with non-Muslims?",
+        "What should I do if I'm the only Muslim in my group?",
+        "How do I handle social media as a Muslim?",
+        "What are Islamic guidelines for social gatherings?"
+    ],
+    "Physical and Mental Health": [
+        "How should I take care of my physical health as a Muslim?",
+        "What does Islam say about mental health and seeking help?",
+        "How do I deal with stress and anxiety?",
+        "What are the Islamic guidelines for exercise and sports?",
+        "How should I handle anger and frustration?",
+        "What does Islam say about depression and sadness?",
+        "How do I maintain a healthy lifestyle while being busy?",
+        "What are the benefits of fasting beyond Ramadan?"
+    ],
+    "Technology and Modern Life": [
+        "How do I use technology responsibly as a Muslim?",
+        "What are the Islamic guidelines for social media use?",
+        "How do I avoid wasting time on the internet?",
+        "What does Islam say about online relationships?",
+        "How do I protect my privacy online as a Muslim?",
+        "What are good apps for Islamic learning?",
+        "How do I balance gaming with Islamic responsibilities?",
+        "What does Islam say about artificial intelligence and automation?"
+    ]
+}
+
+# From test_30_non_muslim_questions.py
+NON_MUSLIM_30_QUESTIONS = {
+    "Basic Understanding Questions": [
+        "What is Islam and what do Muslims believe?",
+        "Who is Allah and how is He different from God in other religions?",
+        "What is the Quran and how is it different from the Bible?",
+        "Who is Prophet Muhammad and why is he important to Muslims?",
+        "What are the main differences between Islam and Christianity?",
+        "What are the main differences between Islam and Judaism?"
+    ],
+    "Cultural and Social Questions": [
+        "Why do Muslim women wear hijab?",
+        "What is halal food and why is it important?",
+        "Why do Muslims pray five times a day?",
+        "What is Ramadan and why do Muslims fast?",
+        "Why do Muslims face Mecca when praying?",
+        "What is the significance of the Kaaba?"
+    ],
+    "Practical Questions": [
+        "How do Muslims greet each other?",
+        "What should I do if I'm invited to a Muslim home?",
+        "Can non-Muslims visit mosques?",
+        "What are the rules for non-Muslims during Ramadan?",
+        "How do Muslims celebrate their holidays?",
+        "What is the proper way to interact with Muslim colleagues?"
+    ],
+    "Misconceptions and Clarifications": [
+        "Is Islam a violent religion?",
+        "Do Muslims believe in Jesus?",
+        "What does Jihad really mean?",
+        "Why do some Muslim countries have different laws?",
+        "Is it true that Muslims can't eat pork?",
+        "Why do some Muslims have multiple wives?"
+    ],
+    "Modern and Contemporary Issues": [
+        "How does Islam view modern technology?",
+        "What is the Islamic perspective on democracy?",
+        "How do Muslims view other religions?",
+        "What is the Islamic stance on human rights?",
+        "How does Islam address environmental issues?",
+        "What is the future of Islam in the modern world?"
+    ]
+}
+
+# From test_32_women_non_muslim_questions.py
+WOMEN_NON_MUSLIM_QUESTIONS = {
+    "Women's Rights and Status in Islam": [
+        "What rights do women have in Islam?",
+        "Is it true that Islam oppresses women?",
+        "How does Islam view women's education?",
+        "Can Muslim women work and have careers?",
+        "What is the Islamic view on women's leadership?",
+        "Do Muslim women have property rights?",
+        "How does Islam protect women's dignity?",
+        "What is the Islamic perspective on women's independence?"
+    ],
+    "Dress Code and Modesty": [
+        "Why do Muslim women wear hijab?",
+        "Is hijab mandatory for all Muslim women?",
+        "What is the Islamic dress code for women?",
+        "Can Muslim women wear makeup and jewelry?",
+        "What should I wear when visiting Muslim women?",
+        "How do Muslim women dress for different occasions?"
+    ],
+    "Family and Relationships": [
+        "What is the Islamic view on marriage?",
+        "Can Muslim women choose their own husbands?",
+        "What are the rights of Muslim wives?",
+        "How does Islam view divorce for women?",
+        "What is the Islamic perspective on motherhood?",
+        "How do Muslim women handle family conflicts?"
+    ],
+    "Social Interactions": [
+        "How should I interact with Muslim women?",
+        "Can I hug or shake hands with Muslim women?",
+        "What topics are appropriate to discuss with Muslim women?",
+        "How do Muslim women socialize with non-Muslims?",
+        "What should I know about Muslim women's privacy?",
+        "How do Muslim women participate in community activities?"
+    ],
+    "Modern Women's Issues": [
+        "How does Islam address women's mental health?",
+        "What is the Islamic view on women's sports and fitness?",
+        "How do Muslim women balance work and family?",
+        "What is the Islamic perspective on women's social media use?",
+        "How does Islam address women's financial independence?",
+        "What is the Islamic view on women's travel and mobility?"
+    ]
+}
+
+# From test_60_non_muslim_questions.py
+NON_MUSLIM_60_QUESTIONS = {
+    "Basic Understanding Questions": [
+        "What is Islam and what do Muslims believe?",
+        "Who is Allah and how is He different from God in other religions?",
+        "What is the Quran and how is it different from the Bible?",
+        "Who is Prophet Muhammad and why is he important to Muslims?",
+        "What are the main differences between Islam and Christianity?",
+        "What are the main differences between Islam and Judaism?",
+        "What does 'Muslim' mean and who can become one?",
+        "What is the difference between Sunni and Shia Muslims?",
+        "How old is Islam as a religion?",
+        "What is the Islamic calendar and how does it work?"
+    ],
+    "Cultural and Social Questions": [
+        "Why do Muslim women wear hijab?",
+        "What is halal food and why is it important?",
+        "Why do Muslims pray five times a day?",
+        "What is Ramadan and why do Muslims fast?",
+        "Why do Muslims face Mecca when praying?",
+        "What is the significance of the Kaaba?",
+        "What is the Islamic dress code?",
+        "Why do some Muslim men have beards?",
+        "What is the Islamic view on music and art?",
+        "How do Muslims celebrate their holidays?"
+    ],
+    "Practical Questions": [
+        "How do Muslims greet each other?",
+        "What should I do if I'm invited to a Muslim home?",
+        "Can non-Muslims visit mosques?",
+        "What are the rules for non-Muslims during Ramadan?",
+        "How do Muslims celebrate their holidays?",
+        "What is the proper way to interact with Muslim colleagues?",
+        "What should I wear when visiting a mosque?",
+        "How do Muslims handle death and funerals?",
+        "What is the Islamic way of eating?",
+        "How do Muslims handle business transactions?"
+    ],
+    "Misconceptions and Clarifications": [
+        "Is Islam a violent religion?",
+        "Do Muslims believe in Jesus?",
+        "What does Jihad really mean?",
+        "Why do some Muslim countries have different laws?",
+        "Is it true that Muslims can't eat pork?",
+        "Why do some Muslims have multiple wives?",
+        "Do Muslims worship the Kaaba?",
+        "Is it true that Islam oppresses women?",
+        "What is the Islamic view on terrorism?",
+        "Do Muslims believe in the same God as Christians?"
+    ],
+    "Modern and Contemporary Issues": [
+        "How does Islam view modern technology?",
+        "What is the Islamic perspective on democracy?",
+        "How do Muslims view other religions?",
+        "What is the Islamic stance on human rights?",
+        "How does Islam address environmental issues?",
+        "What is the future of Islam in the modern world?",
+        "How does Islam view social media?",
+        "What is the Islamic perspective on education?",
+        "How does Islam address mental health?",
+        "What is the Islamic view on social justice?"
+    ],
+    "Advanced and Specific Topics": [
+        "What is the Islamic view on science and evolution?",
+        "How does Islam view medical treatment?",
+        "What is the Islamic perspective on banking and interest?",
+        "How does Islam address gender equality?",
+        "What is the Islamic view on LGBTQ+ issues?",
+        "How does Islam view democracy and voting?",
+        "What is the Islamic perspective on war and peace?",
+        "How does Islam address poverty and wealth inequality?",
+        "What is the Islamic view on freedom of speech?",
+        "How does Islam address climate change and environmental protection?"
+    ]
+}
+
+# Queries that reach the later routing stages, for the stage benchmark
+ROUTING_EDGE_CASE_QUESTIONS = {
+    "Follow-up source requests": [
+        "Show me more sources",
+        "Give me one at a time",
+        "Show all at once",
+        "Display sahih bukhari narrations",
+        "Show additional tirmidhi sources"
+    ],
+    "Non-Islamic questions": [
+        "What is the best recipe for kebab?",
+        "What is the weather forecast for tomorrow?",
+        "How do I fix my broken phone screen?",
+        "Which programming language should I learn first?",
+        "What is the capital of Turkey?",
+        "Weather temperature in Istanbul today",
+        "Football fitness exercise routine"
+    ],
+    "Unmatched and edge-case input": [
+        "Hello there",
+        "Good morning to you",
+        "asdfgh qwerty zxcvb",
+        "Can you help me with something?",
+        "1234567890",
+        "Abc def ghi jkl"
+    ]
+}
+
+# Corpus name -> {category: [questions]}
+CORPORA = {
+    'core_knowledge': CORE_KNOWLEDGE_QUESTIONS,
+    'random': RANDOM_QUESTIONS,
+    'realistic': REALISTIC_QUESTIONS,
+    'young_muslim_men': YOUNG_MUSLIM_MEN_QUESTIONS,
+    'non_muslim_30': NON_MUSLIM_30_QUESTIONS,
+    'women_non_muslim': WOMEN_NON_MUSLIM_QUESTIONS,
+    'non_muslim_60': NON_MUSLIM_60_QUESTIONS,
+    'routing_edge_cases': ROUTING_EDGE_CASE_QUESTIONS
+}
+
+def corpus_questions(corpus):
+    """Flat question list for a corpus or its {category: [questions]} dict, in order"""
+    categories = CORPORA[corpus] if isinstance(corpus, str) else corpus
+    return [question for questions in categories.values() for question in questions]
+
+def iter_corpora(names=None):
+    """(corpus, category, question) for every question in the named corpora (all by default)"""
+    for name in names or CORPORA:
+        for category, questions in CORPORA[name].items():
+            for question in questions:
+                yield name, category, question
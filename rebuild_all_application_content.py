@@ -8,7 +8,9 @@ Rebuilds all subjects and content below DeenBot with website content imported
 import os
 import re
 import json
+import argparse
 from pathlib import Path
+from incremental_build import IncrementalPageBuilder
 
 def get_website_content_structure():
     """Define the structure of all Islamic content subjects"""
@@ -524,48 +526,43 @@ def generate_main_subject_cards():
     
     return cards_html
 
-def rebuild_all_application_content():
+def rebuild_all_application_content(force=False):
     """Rebuild all application content with standardized format"""
     
     print("🔄 Starting complete application content rebuild...")
     
     # Get content structure
     content_structure = get_website_content_structure()
+    builder = IncrementalPageBuilder(__file__, force=force)
     
     # Create main index page
-    main_index_content = create_main_index_page()
-    with open('islamic-study-index.html', 'w', encoding='utf-8') as f:
-        f.write(main_index_content)
-    print("✅ Created: islamic-study-index.html")
+    status = builder.build('islamic-study-index.html', create_main_index_page)
+    print(f"✅ Created: islamic-study-index.html ({status})")
     
     # Create subject index pages
     pages_created = 1  # Count main index
     
     for subject_key, subject_data in content_structure.items():
         # Create subject index page
-        subject_index_content = create_subject_page(subject_key, subject_data)
         filename = f"{subject_key}-index.html"
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(subject_index_content)
+        status = builder.build(filename, create_subject_page, subject_key, subject_data)
         
         pages_created += 1
-        print(f"✅ Created: {filename}")
+        print(f"✅ Created: {filename} ({status})")
         
         # Create individual subject pages
         for subject in subject_data['subjects']:
             subject_key_clean = subject.lower().replace(" ", "-").replace("&", "and")
-            subject_page_content = create_individual_subject_page(subject, subject_key)
             filename = f"{subject_key_clean}.html"
-            
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(subject_page_content)
+            status = builder.build(filename, create_individual_subject_page, subject, subject_key)
             
             pages_created += 1
-            print(f"✅ Created: {filename}")
+            print(f"✅ Created: {filename} ({status})")
+    
+    builder.save()
     
     print(f"\n🎉 Complete application content rebuild finished!")
-    print(f"📊 Total pages created: {pages_created}")
+    print(f"📊 Total pages created: {pages_created} ({builder.summary()})")
     print(f"📖 All subjects now have standardized format")
     print(f"🎨 Consistent design and navigation")
     print(f"🌐 All content is independent and self-contained")
@@ -746,8 +743,12 @@ def create_individual_subject_page(subject_name, parent_subject):
     return template
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild all application content pages")
+    parser.add_argument('--force', action='store_true', help="re-render every page even if unchanged")
+    args = parser.parse_args()
+    
     try:
-        pages_created = rebuild_all_application_content()
+        pages_created = rebuild_all_application_content(force=args.force)
         print(f"\n🎯 Rebuild Summary:")
         print(f"   • Main index page created")
         print(f"   • Subject index pages created")
@@ -8,6 +8,20 @@ NO EMOJIS - This is a serious Islamic research application
 
 import os
 import re
+import argparse
+import time
+from incremental_build import IncrementalPageBuilder
+from parallel_render import (CompiledTemplate, default_jobs, job_count, render_pages, failed_pages,
+                             print_render_timings)
+
+_compiled_index_page_design = None
+
+def get_compiled_index_page_design():
+    """Exact index page design compiled once per process"""
+    global _compiled_index_page_design
+    if _compiled_index_page_design is None:
+        _compiled_index_page_design = CompiledTemplate(get_exact_index_page_design())
+    return _compiled_index_page_design
 
 def get_exact_index_page_design():
     """Get the exact CSS and structure from the index page - NO EMOJIS"""
@@ -630,7 +644,7 @@ def create_page_with_exact_design(page_key, page_data):
         }"""
     
     # Fill template with exact design
-    page_content = get_exact_index_page_design().format(
+    page_content = get_compiled_index_page_design().render(
         title=page_data['title'],
         description=page_data['description'],
         back_link=page_data['back_link'],
@@ -643,7 +657,7 @@ def create_page_with_exact_design(page_key, page_data):
     
     return page_content
 
-def rebuild_all_website_content():
+def rebuild_all_website_content(force=False, jobs=None):
     """Rebuild ALL website content into application pages with exact index page design"""
     
     print("Rebuilding all website content into application pages...")
@@ -651,36 +665,43 @@ def rebuild_all_website_content():
     print("This is a serious Islamic research application")
     
     structure = get_complete_website_structure()
-    pages_rebuilt = 0
+    builder = IncrementalPageBuilder(__file__, force=force)
+    if jobs is None:
+        jobs = default_jobs()
     
-    for page_key, page_data in structure.items():
-        try:
-            # Create page with exact design
-            page_content = create_page_with_exact_design(page_key, page_data)
-            
-            # Determine filename
-            filename = f"{page_key.replace('_', '-')}.html"
-            
-            # Write the rebuilt page
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(page_content)
-            
-            pages_rebuilt += 1
-            print(f"Rebuilt: {filename} - Now matches index page design exactly")
-            
-        except Exception as e:
-            print(f"Error rebuilding {page_key}: {e}")
+    # Determine filename for each page; rendering happens in the process pool
+    pages = [
+        (f"{page_key.replace('_', '-')}.html", create_page_with_exact_design, (page_key, page_data))
+        for page_key, page_data in structure.items()
+    ]
+    
+    started = time.perf_counter()
+    # Re-render only when the template or page data changed
+    results = render_pages(pages, jobs=jobs, builder=builder)
+    failures = failed_pages(results)
+    for filename, error in failures:
+        print(f"Error rebuilding {filename}: {error}")
+    elapsed = time.perf_counter() - started
+    
+    builder.save()
+    print_render_timings(results, elapsed, jobs)
+    pages_rebuilt = len(results) - len(failures)
     
     print(f"\nAll website content rebuilt!")
-    print(f"Total pages rebuilt: {pages_rebuilt}")
+    print(f"Total pages rebuilt: {pages_rebuilt} ({builder.summary()})")
     print(f"Design now matches index page exactly")
     print(f"NO EMOJIS - Serious Islamic research application design")
     
     return pages_rebuilt
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild all website content pages")
+    parser.add_argument('--force', action='store_true', help="re-render every page even if unchanged")
+    parser.add_argument('--jobs', type=job_count, default=default_jobs(), help="number of render processes")
+    args = parser.parse_args()
+    
     try:
-        pages_rebuilt = rebuild_all_website_content()
+        pages_rebuilt = rebuild_all_website_content(force=args.force, jobs=args.jobs)
         print(f"\nRebuild Summary:")
         print(f"   All website content now rebuilt in application format")
         print(f"   Same CSS variables, fonts, colors, and layout")
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+DeenBot Regression Benchmark - All Question Corpora, In-Process or Over HTTP
+Runs every question corpus through ComprehensiveDeenBot.get_comprehensive_response
+(no server needed), records per-question latency and routed source, and
+fails when latency regresses against a stored baseline
+"""
+
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import statistics
+from datetime import datetime
+
+from question_corpora import CORPORA, iter_corpora
+from latency_histogram import HistogramSet, LatencyHistogram, format_summary_table
+from incremental_build import atomic_write
+from deenbot_metrics import routing_branch
+
+BASELINE_FILE = 'benchmark_baseline.json'
+RESULTS_FILE = 'benchmark_results.json'
+
+DEFAULT_REPEATS = 5
+DEFAULT_WARMUP = 20           # untimed questions before measuring
+DEFAULT_TOLERANCE = 0.25      # fail when a metric is 25% slower than baseline...
+DEFAULT_MIN_DELTA_MS = 0.5    # ...and at least this many ms slower (timer noise floor)
+
+# Latency metrics compared against the baseline. A corpus has too few
+# questions for its p99 to be more than its single slowest question.
+GATED_METRICS = ('mean_ms', 'p50_ms', 'p90_ms', 'p99_ms')
+CORPUS_GATED_METRICS = ('mean_ms', 'p50_ms', 'p90_ms')
+
+class InProcessTarget:
+    """Calls ComprehensiveDeenBot directly, without HTTP"""
+
+    def __init__(self):
+        started = time.perf_counter()
+        from comprehensive_deenbot_backend import ComprehensiveDeenBot
+        self.deenbot = ComprehensiveDeenBot()
+        self.startup_seconds = time.perf_counter() - started
+        self.description = 'in-process'
+
+    def ask(self, question):
+        """Answer a question and return the response source"""
+        return self.deenbot.get_comprehensive_response(question).get('source')
+
+class HttpTarget:
+    """Posts to a running DeenBot server's /chat endpoint"""
+
+    def __init__(self, base_url):
+        import requests
+        self.session = requests.Session()
+        self.base_url = base_url.rstrip('/')
+        self.startup_seconds = 0.0
+        self.description = self.base_url
+
+    def ask(self, question):
+        """Answer a question and return the response source"""
+        response = self.session.post(f"{self.base_url}/chat", json={"message": question}, timeout=30)
+        if response.status_code != 200:
+            return f"HTTP {response.status_code}"
+        return response.json().get('source')
+
+def run_benchmark(target, corpora=None, repeats=DEFAULT_REPEATS, warmup=DEFAULT_WARMUP):
+    """Time every question in the corpora and summarize the latencies
+
+    The corpora are run `repeats` times over and each question keeps its
+    fastest time, so a stall on a busy machine only costs a question one of
+    its runs instead of skewing the whole pass.
+    """
+    questions = list(iter_corpora(corpora))
+
+    for _, _, question in questions[:warmup]:
+        target.ask(question)
+
+    timings = [[] for _ in questions]
+    sources = [None] * len(questions)
+
+    started = time.perf_counter()
+    for _ in range(max(repeats, 1)):
+        for index, (_, _, question) in enumerate(questions):
+            call_started = time.perf_counter()
+            try:
+                sources[index] = target.ask(question)
+            except Exception as e:
+                sources[index] = f"Error - {type(e).__name__}"
+            timings[index].append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+
+    overall = LatencyHistogram()
+    by_corpus = HistogramSet()
+    by_branch = HistogramSet()
+    records = []
+    for (corpus, category, question), question_timings, source in zip(questions, timings, sources):
+        latency = min(question_timings)
+        branch = routing_branch(source)
+        overall.record_seconds(latency)
+        by_corpus.record_seconds(corpus, latency)
+        by_branch.record_seconds(branch, latency)
+        records.append({
+            'corpus': corpus,
+            'category': category,
+            'question': question,
+            'latency_ms': round(latency * 1000, 3),
+            'median_ms': round(statistics.median(question_timings) * 1000, 3),
+            'source': source,
+            'branch': branch
+        })
+
+    return {
+        'generated_at': datetime.now().isoformat(),
+        'target': target.description,
+        'repeats': repeats,
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine()
+        },
+        'startup_seconds': round(target.startup_seconds, 3),
+        'elapsed_seconds': round(elapsed, 3),
+        'corpora': sorted({record['corpus'] for record in records}),
+        'summary': {
+            'overall': overall.summary(),
+            'by_corpus': by_corpus.summary(),
+            'by_branch': by_branch.summary()
+        },
+        'questions': records
+    }
+
+def compare_to_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE, min_delta_ms=DEFAULT_MIN_DELTA_MS):
+    """Latency regressions, improvements and routing changes relative to a baseline run
+
+    A metric regresses when it is both `tolerance` (relative) and
+    `min_delta_ms` (absolute) slower than the baseline.
+    """
+    comparison = {'regressions': [], 'improvements': [], 'routing_changes': [], 'slower_questions': []}
+
+    scopes = [('overall', results['summary']['overall'], baseline['summary']['overall'], GATED_METRICS)]
+    for corpus, summary in results['summary']['by_corpus'].items():
+        if corpus in baseline['summary']['by_corpus']:
+            scopes.append((corpus, summary, baseline['summary']['by_corpus'][corpus], CORPUS_GATED_METRICS))
+
+    for scope, current, previous, metrics in scopes:
+        for metric in metrics:
+            now, before = current[metric], previous[metric]
+            change = {
+                'scope': scope,
+                'metric': metric,
+                'baseline_ms': before,
+                'current_ms': now,
+                'change_pct': round((now - before) / before * 100, 1) if before else None
+            }
+            if now > before * (1 + tolerance) and now - before >= min_delta_ms:
+                comparison['regressions'].append(change)
+            elif before > now * (1 + tolerance) and before - now >= min_delta_ms:
+                comparison['improvements'].append(change)
+
+    previous_questions = {(q['corpus'], q['question']): q for q in baseline['questions']}
+    slower = []
+    for record in results['questions']:
+        previous = previous_questions.get((record['corpus'], record['question']))
+        if previous is None:
+            continue
+        if previous['source'] != record['source']:
+            comparison['routing_changes'].append({
+                'corpus': record['corpus'],
+                'question': record['question'],
+                'baseline_source': previous['source'],
+                'current_source': record['source']
+            })
+        delta = record['latency_ms'] - previous['latency_ms']
+        if delta >= min_delta_ms:
+            slower.append((delta, record, previous))
+
+    slower.sort(key=lambda item: item[0], reverse=True)
+    comparison['slower_questions'] = [
+        {
+            'corpus': record['corpus'],
+            'question': record['question'],
+            'baseline_ms': previous['latency_ms'],
+            'current_ms': record['latency_ms'],
+            'branch': record['branch']
+        }
+        for _, record, previous in slower[:10]
+    ]
+    return comparison
+
+def load_baseline(path):
+    """Stored baseline results, or None when there is none yet"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def print_results(results):
+    """Text summary of a benchmark run"""
+    overall = results['summary']['overall']
+    print("📊 BENCHMARK RESULTS")
+    print("=" * 60)
+    print(f"🎯 Target: {results['target']} ({results['repeats']} runs per question, fastest recorded)")
+    print(f"📝 Questions: {overall['count']} across {len(results['corpora'])} corpora")
+    print(f"⏱️  Elapsed: {results['elapsed_seconds']:.1f}s (startup {results['startup_seconds']:.1f}s)")
+    print(f"⏱️  Latency: mean {overall['mean_ms']:.1f}ms | p50 {overall['p50_ms']:.1f}ms | "
+          f"p90 {overall['p90_ms']:.1f}ms | p99 {overall['p99_ms']:.1f}ms | max {overall['max_ms']:.1f}ms")
+    print("")
+    print(format_summary_table("🗂️  BY CORPUS:", results['summary']['by_corpus']))
+    print("")
+    print(format_summary_table("🧭 BY ROUTING BRANCH:", results['summary']['by_branch']))
+
+def print_comparison(comparison, baseline_path, tolerance, min_delta_ms):
+    """Text summary of a baseline comparison"""
+    print("")
+    print(f"📏 COMPARISON WITH {baseline_path} (tolerance {tolerance * 100:.0f}%, floor {min_delta_ms}ms)")
+    print("=" * 60)
+    for label, changes in (("❌ Regressions", comparison['regressions']), ("✅ Improvements", comparison['improvements'])):
+        print(f"{label}: {len(changes)}")
+        for change in changes:
+            # No percentage against a zero baseline
+            change_pct = "n/a" if change['change_pct'] is None else f"{change['change_pct']:+.1f}%"
+            print(f"   {change['scope']} {change['metric']}: {change['baseline_ms']:.1f}ms -> "
+                  f"{change['current_ms']:.1f}ms ({change_pct})")
+    print(f"🔀 Routing changes: {len(comparison['routing_changes'])}")
+    for change in comparison['routing_changes'][:20]:
+        print(f"   [{change['corpus']}] {change['question'][:60]}: "
+              f"{change['baseline_source']} -> {change['current_source']}")
+    if comparison['slower_questions']:
+        print("🐢 Most slowed questions:")
+        for question in comparison['slower_questions']:
+            print(f"   [{question['corpus']}] {question['question'][:60]}: "
+                  f"{question['baseline_ms']:.1f}ms -> {question['current_ms']:.1f}ms ({question['branch']})")
+
+def main():
+    """Run the benchmark and gate on the stored baseline"""
+    parser = argparse.ArgumentParser(description="DeenBot regression benchmark over all question corpora")
+    parser.add_argument('--corpus', action='append', choices=sorted(CORPORA),
+                        help="corpus to run (repeatable, default all)")
+    parser.add_argument('--url', help="benchmark a running server instead of calling DeenBot in-process")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS, help="timed runs per question")
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP, help="untimed questions before measuring")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="baseline results to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="store this run as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="relative slowdown that counts as a regression (0.25 = 25%%)")
+    parser.add_argument('--min-delta-ms', type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="ignore slowdowns smaller than this many milliseconds")
+    parser.add_argument('--fail-on-routing-change', action='store_true',
+                        help="also fail when a question is answered by a different source than in the baseline")
+    parser.add_argument('--output', default=RESULTS_FILE, help="JSON results path")
+    parser.add_argument('--verbose', action='store_true', help="keep DeenBot's per-query INFO logging")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        # Per-query INFO logging would otherwise dominate the console
+        logging.disable(logging.INFO)
+
+    target = HttpTarget(args.url) if args.url else InProcessTarget()
+    results = run_benchmark(target, args.corpus, args.repeats, args.warmup)
+    print_results(results)
+
+    atomic_write(args.output, json.dumps(results, indent=2, ensure_ascii=False))
+    print(f"\n📁 Results saved to: {args.output}")
+
+    if args.save_baseline:
+        atomic_write(args.baseline, json.dumps(results, indent=2, ensure_ascii=False))
+        print(f"📁 Baseline saved to: {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"⚠️ No baseline at {args.baseline} - run with --save-baseline to create one")
+        return 0
+
+    comparison = compare_to_baseline(results, baseline, args.tolerance, args.min_delta_ms)
+    print_comparison(comparison, args.baseline, args.tolerance, args.min_delta_ms)
+
+    failed = bool(comparison['regressions']) or (args.fail_on_routing_change and comparison['routing_changes'])
+    print("")
+    print("❌ FAILED - regressed against the baseline" if failed else "✅ PASSED - no regressions")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
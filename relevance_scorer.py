@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Relevance Scorer - Vectorized Field Scoring for the Knowledge Searches
+The weighted fields of every hadith, Quran verse, fiqh ruling and guidance
+topic form one sparse term matrix: a row per (source, field, record) and a column
+per distinct lowercased token. A query word is matched against the
+vocabulary once, and a sparse product gives every row it occurs in,
+exactly as `word in text` would. The per-row counts are folded into
+record scores with the field weights, and argpartition picks the top
+results. Row matches are cached per word, since queries reuse words.
+The Quran search scans all surah and verse texts joined into one string
+instead of testing each text in turn.
+"""
+
+import os
+import re
+import bisect
+import threading
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Query words whose matching rows are kept; the cache is emptied when full
+WORD_CACHE_SIZE = int(os.environ.get('DEENBOT_RELEVANCE_WORD_CACHE', '4096'))
+
+# Knowledge sources scored through the term matrix, in broad search order
+SCORED_SOURCES = ('hadith', 'quran', 'fiqh', 'guidance')
+
+# Matching words per field up to which record scores are looked up instead of summed
+FOLD_TABLE_COUNTS = 16
+
+# Separates the Quran texts in their joined search text; no text contains it
+QURAN_SEPARATOR = '\x00'
+
+# Relevance of a matching surah and verse, as in search_quran_comprehensive
+SURAH_RELEVANCE = 0.9
+VERSE_RELEVANCE = 0.8
+
+def top_k(scores, k):
+    """Indices of the k highest scores, best first; equal scores keep index order, as a stable sort does"""
+    count = len(scores)
+    k = max(min(k, count), 0)
+    if k < count:
+        kth = scores[np.argpartition(scores, count - k)[count - k]]
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[:k - len(above)]
+        candidates = np.concatenate([above, ties])
+    else:
+        candidates = np.arange(count)
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+def candidates(relevances, templates):
+    """(relevances, keep, templates) of results found outside the term matrix, all kept"""
+    return np.array(relevances, dtype=float), np.ones(len(templates), dtype=bool), templates
+
+def top_results(ranked, max_results):
+    """The best max_results of (relevances, keep, templates) candidates, ties in candidate order
+
+    Returns None when no candidate is kept. Only the winners are turned
+    into result dicts.
+    """
+    relevance = np.concatenate([relevances for relevances, _, _ in ranked])
+    kept = np.flatnonzero(np.concatenate([keep for _, keep, _ in ranked]))
+    if not len(kept):
+        return None
+    offsets = [0]
+    for _, _, templates in ranked:
+        offsets.append(offsets[-1] + len(templates))
+    winners = kept[top_k(relevance[kept], max_results)]
+    results = []
+    for index, score in zip(winners.tolist(), relevance[winners].tolist()):
+        part = bisect.bisect_right(offsets, index) - 1
+        results.append(dict(ranked[part][2][index - offsets[part]], relevance=score))
+    return results
+
+def fold_table(weights, counts):
+    """Score of every combination of per-field match counts, for each set of field weights
+
+    weights has one row per distinct set of field weights. Entry
+    [set, c0, c1, ...] adds field 0's weight c0 times, then field 1's c1
+    times and so on, in the order the per-word loop adds them.
+    """
+    fields = weights.shape[1]
+    grid = np.indices((counts + 1,) * fields)
+    table = np.zeros((len(weights),) + (counts + 1,) * fields)
+    for index, field_weights in enumerate(weights):
+        score = np.zeros(grid.shape[1:])
+        for field, weight in enumerate(field_weights):
+            for matched in range(counts):
+                score = np.where(grid[field] > matched, score + weight, score)
+        table[index] = score
+    return table
+
+class RelevanceScorer:
+    """Sparse term matrix over the weighted fields of the hadith, verse, fiqh and guidance records"""
+
+    def __init__(self, documents, word_cache_size=WORD_CACHE_SIZE):
+        records = {
+            'hadith': tuple(hadith for topic in documents['hadith'] for hadith in topic.hadiths),
+            'quran': tuple(verse for surah in documents['quran'] for verse in surah.verses),
+            'fiqh': documents['fiqh'],
+            'guidance': documents['guidance']
+        }
+        # Each source's records within the score vector, and the results they yield
+        self.spans = {}
+        self.templates = {'result': {}, 'broad': {}}
+        start = 0
+        for source in SCORED_SOURCES:
+            self.spans[source] = slice(start, start + len(records[source]))
+            start += len(records[source])
+            self.templates['result'][source] = tuple(record.result for record in records[source])
+            self.templates['broad'][source] = tuple(getattr(record, 'broad', record.result) for record in records[source])
+        all_records = [record for source in SCORED_SOURCES for record in records[source]]
+        self.size = len(all_records)
+
+        # Surahs and verses in search order; a surah matches on its name, translation or key
+        quran_texts = []
+        quran_matches = []
+        relevance = []
+        self.quran_templates = []
+        for surah in documents['quran']:
+            quran_texts.extend((surah.name, surah.translation, surah.key))
+            quran_matches.extend([len(relevance)] * 3)
+            relevance.append(SURAH_RELEVANCE)
+            self.quran_templates.append((surah.result, surah.entry))
+            for verse in surah.verses:
+                quran_texts.append(verse.text)
+                quran_matches.append(len(relevance))
+                relevance.append(VERSE_RELEVANCE)
+                self.quran_templates.append((verse.result, verse.entry))
+        self.quran_text = QURAN_SEPARATOR.join(quran_texts) + QURAN_SEPARATOR
+        self.quran_text_starts = np.cumsum([0] + [len(text) + 1 for text in quran_texts[:-1]], dtype=np.int64)
+        self.quran_text_matches = np.array(quran_matches, dtype=np.int32)
+        self.quran_relevance = np.array(relevance)
+
+        # Topic of each hadith, to keep only hadith under matching topics
+        self.hadith_topics = np.repeat(np.arange(len(documents['hadith'])),
+                                       [len(topic.hadiths) for topic in documents['hadith']])
+
+        # One row per (field, record), field-major; records with fewer fields get empty ones
+        fields = max((len(record.fields) for record in all_records), default=0)
+        texts = []
+        weights = np.zeros((fields, self.size))
+        for field in range(fields):
+            for index, record in enumerate(all_records):
+                if field < len(record.fields):
+                    texts.append(record.fields[field][0])
+                    weights[field, index] = record.fields[field][1]
+                else:
+                    texts.append('')
+        self.weights = weights
+        self.rows = len(texts)
+
+        # Records sharing field weights share their rows of the fold table
+        signatures, self.signatures = np.unique(weights.T, axis=0, return_inverse=True)
+        self.signatures = self.signatures.reshape(-1)
+        self.fold_table = fold_table(signatures, FOLD_TABLE_COUNTS)
+
+        # Tokens joined by newlines, so one regex scan finds every token containing a word
+        tokens = sorted({token for text in texts for token in text.split()})
+        token_ids = {token: index for index, token in enumerate(tokens)}
+        self.vocabulary = '\n'.join(tokens) + '\n'
+        self.token_starts = np.cumsum([0] + [len(token) + 1 for token in tokens[:-1]], dtype=np.int64)
+
+        # Coordinates of the nonzero (row, token) cells
+        cells = [(row, token_ids[token]) for row, text in enumerate(texts) for token in set(text.split())]
+        self.term_rows = np.array([row for row, _ in cells], dtype=np.int32)
+        self.term_columns = np.array([column for _, column in cells], dtype=np.int32)
+
+        self.word_cache_size = max(int(word_cache_size), 1)
+        self.word_rows = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()  # hits and misses are counted from every request thread
+
+    def __getstate__(self):
+        """Snapshot state without the per-word cache"""
+        state = dict(self.__dict__, word_rows={}, hits=0, misses=0)
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        """Restore snapshot state with a fresh lock"""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _match(self, word):
+        """Rows whose field text contains word"""
+        positions = [match.start() for match in re.finditer(re.escape(word), self.vocabulary)]
+        matched = np.zeros(len(self.token_starts), dtype=bool)
+        if positions:
+            matched[np.searchsorted(self.token_starts, positions, side='right') - 1] = True
+        return np.bincount(self.term_rows, weights=matched[self.term_columns], minlength=self.rows) > 0
+
+    def word_matches(self, word):
+        """Rows containing word, cached"""
+        rows = self.word_rows.get(word)
+        if rows is not None:
+            with self._lock:
+                self.hits += 1
+            return rows
+        with self._lock:
+            self.misses += 1
+        rows = self._match(word)
+        if len(self.word_rows) >= self.word_cache_size:
+            self.word_rows.clear()
+        self.word_rows[word] = rows
+        return rows
+
+    def scores(self, words):
+        """Relevance of every record for the query words; self.spans locates each source"""
+        counts = np.zeros(self.rows, dtype=np.int32)
+        for word in words:
+            counts += self.word_matches(word)
+
+        counts = counts.reshape(len(self.weights), self.size)
+        if not len(words) or counts.max() <= FOLD_TABLE_COUNTS:
+            return self.fold_table[(self.signatures, *counts)]
+
+        # Beyond the table, add the weight once per matching word, field by field, so
+        # the sums are bit-for-bit those of the per-word loop and ties rank the same
+        score = np.zeros(self.size)
+        for field_counts, field_weights in zip(counts, self.weights):
+            for matched in range(int(field_counts.max())):
+                score = np.where(field_counts > matched, score + field_weights, score)
+        return score
+
+    def quran_matches(self, query_lower, limit):
+        """The best (relevance, (result, entry)) of the surahs and verses containing query_lower
+
+        One scan of the joined Quran texts, ranked as a stable sort by relevance.
+        """
+        if QURAN_SEPARATOR in query_lower:
+            return []
+        positions = []
+        position = self.quran_text.find(query_lower)
+        while position >= 0:
+            positions.append(position)
+            position = self.quran_text.find(query_lower, position + 1)
+        if not positions:
+            return []
+        matched = np.unique(self.quran_text_matches[np.searchsorted(self.quran_text_starts, positions, side='right') - 1])
+        best = matched[top_k(self.quran_relevance[matched], limit)]
+        return [(relevance, self.quran_templates[index])
+                for index, relevance in zip(best.tolist(), self.quran_relevance[best].tolist())]
+
+    def in_topics(self, topic_flags):
+        """Per hadith, the flag of its topic"""
+        return np.asarray(topic_flags, dtype=bool)[self.hadith_topics]
+
+    def stats(self):
+        """(hits, misses) of the per-word cache"""
+        return self.hits, self.misses
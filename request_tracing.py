@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Request Tracing for DeenBot
+Lightweight per-request span trees for the /chat path. Spans are only
+recorded while a trace is active for the current request, so traced
+functions cost one context lookup when tracing is off.
+"""
+
+import os
+import re
+import time
+import functools
+import threading
+import contextvars
+from collections import deque
+
+# Trace every /chat request and send the Server-Timing breakdown
+TRACING_ENABLED = os.environ.get('DEENBOT_TRACING', '').lower() in ('1', 'true', 'yes')
+
+# Expose /debug/trace (span trees of recent and on-demand requests)
+DEBUG_ENDPOINTS_ENABLED = os.environ.get('DEENBOT_DEBUG', '').lower() in ('1', 'true', 'yes')
+
+RECENT_TRACE_LIMIT = 50
+
+_current_span = contextvars.ContextVar('deenbot_current_span', default=None)
+
+class Span:
+    """A timed operation and the operations it called"""
+
+    __slots__ = ('name', 'start', 'end', 'children', 'attributes')
+
+    def __init__(self, name):
+        self.name = name
+        self.start = time.perf_counter()
+        self.end = None
+        self.children = []
+        self.attributes = {}
+
+    def duration(self):
+        """Span duration in seconds (up to now if still open)"""
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def to_dict(self, origin=None):
+        """Span tree as JSON-serializable dicts, times in ms relative to origin"""
+        origin = self.start if origin is None else origin
+        result = {
+            'name': self.name,
+            'start_ms': round((self.start - origin) * 1000, 3),
+            'duration_ms': round(self.duration() * 1000, 3)
+        }
+        if self.attributes:
+            result['attributes'] = dict(self.attributes)
+        if self.children:
+            result['children'] = [child.to_dict(origin) for child in self.children]
+        return result
+
+class _NullSpan:
+    """Stand-in returned by span() when no trace is active"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+    def set(self, key, value):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class _ActiveSpan:
+    """Context manager that opens a child span of the current span"""
+
+    __slots__ = ('span', 'token')
+
+    def __init__(self, parent, name):
+        self.span = Span(name)
+        parent.children.append(self.span)
+        self.token = None
+
+    def __enter__(self):
+        self.token = _current_span.set(self.span)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.span.end = time.perf_counter()
+        if exc_type is not None:
+            self.span.attributes['error'] = exc_type.__name__
+        _current_span.reset(self.token)
+        return False
+
+    def set(self, key, value):
+        """Attach an attribute to the span"""
+        self.span.attributes[key] = value
+
+def span(name):
+    """Time a block as a child of the current span; a no-op outside a trace"""
+    parent = _current_span.get()
+    if parent is None:
+        return _NULL_SPAN
+    return _ActiveSpan(parent, name)
+
+def traced(name):
+    """Decorator recording each call of a function as a span"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            parent = _current_span.get()
+            if parent is None:
+                return function(*args, **kwargs)
+            with _ActiveSpan(parent, name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+class Trace:
+    """Root span of one request; use as a context manager around the request"""
+
+    def __init__(self, name):
+        self.root = Span(name)
+        self.token = None
+
+    def __enter__(self):
+        self.token = _current_span.set(self.root)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.root.end = time.perf_counter()
+        _current_span.reset(self.token)
+        return False
+
+    def to_dict(self):
+        """Span tree of the request"""
+        return self.root.to_dict()
+
+def _metric_name(name):
+    """Server-Timing metric names must be HTTP tokens"""
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', name)
+
+def server_timing_header(trace):
+    """Server-Timing value: the request's top-level spans plus the total
+
+    Repeated stages (the knowledge search can run twice) get a -2, -3 suffix.
+    """
+    entries = []
+    seen = {}
+    for child in trace.root.children:
+        metric = _metric_name(child.name)
+        seen[metric] = seen.get(metric, 0) + 1
+        if seen[metric] > 1:
+            metric = f"{metric}-{seen[metric]}"
+        entries.append(f"{metric};dur={child.duration() * 1000:.2f}")
+    entries.append(f"total;dur={trace.root.duration() * 1000:.2f}")
+    return ", ".join(entries)
+
+class TraceBuffer:
+    """The most recent request traces, for /debug/trace"""
+
+    def __init__(self, limit=RECENT_TRACE_LIMIT):
+        self.traces = deque(maxlen=limit)
+        self.lock = threading.Lock()
+
+    def add(self, trace, **details):
+        """Keep a finished trace with request details"""
+        entry = dict(details, trace=trace.to_dict())
+        with self.lock:
+            self.traces.append(entry)
+
+    def recent(self):
+        """Recent traces, newest first"""
+        with self.lock:
+            return list(reversed(self.traces))
+
+recent_traces = TraceBuffer()
@@ -16,9 +16,9 @@ fi
 
 echo ""
 echo "🔥 This stress test will:"
-echo "   • Run continuously for exactly 5 minutes"
+echo "   • Warm up for 10 seconds, then run for 5 minutes"
 echo "   • Test all variations of user text"
-echo "   • Send requests every 0.5 seconds"
+echo "   • Drive concurrent load (pass --mode/--users/--rate to tune)"
 echo "   • Monitor for crashes or failures"
 echo "   • Generate a comprehensive report"
 echo ""
@@ -38,7 +38,7 @@ echo "📊 Monitor progress in the terminal"
 echo ""
 
 # Run the stress test
-python3 deenbot_stress_tester.py
+python3 deenbot_stress_tester.py --yes "$@"
 
 # Check exit code
 if [ $? -eq 0 ]; then
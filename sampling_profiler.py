@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Sampling Profiler for DeenBot
+Opt-in, low-overhead CPU profiling of a running backend. A background
+thread samples every thread's Python stack at a fixed interval for N
+seconds and writes collapsed stacks (flamegraph.pl / speedscope input),
+a pstats file (snakeviz, python -m pstats) and a JSON summary of the
+hottest functions. Nothing is sampled unless a
+profile is started, via /debug/profile or SIGUSR2.
+"""
+
+import os
+import sys
+import json
+import marshal
+import time
+import signal
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+
+PROFILE_DIR = os.environ.get('DEENBOT_PROFILE_DIR', 'profiles')
+DEFAULT_SECONDS = float(os.environ.get('DEENBOT_PROFILE_SECONDS', '30'))
+DEFAULT_INTERVAL = 0.01  # 100 Hz
+MAX_SECONDS = 300
+
+# Leaf functions of threads that are waiting rather than running; dequeue is the
+# log QueueListener blocked in SimpleQueue.get()
+IDLE_FUNCTIONS = {'select', 'poll', 'wait', 'accept', '_wait_for_tstate_lock', 'dequeue', 'get', 'acquire', 'sleep'}
+
+# Per-thread CPU clocks tell a thread blocked in C (sleep, socket I/O) from one running
+THREAD_CPU_CLOCKS = hasattr(time, 'pthread_getcpuclockid')
+
+# Share of the wall time since a thread's previous sample it must have spent on
+# CPU to count as running; a thread that only woke briefly is waiting
+BUSY_CPU_SHARE = 0.5
+
+def thread_cpu_time(thread_id):
+    """CPU seconds used by a thread, or None where unavailable"""
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(thread_id))
+    except (OSError, ValueError, OverflowError):
+        return None
+
+def frame_label(function):
+    """Collapsed-stack label for a (filename, line, name) function key"""
+    return f"{os.path.basename(function[0])}:{function[2]}"
+
+class SamplingProfiler:
+    """Collects stack samples of all other threads for a fixed duration"""
+
+    def __init__(self, profile_dir=PROFILE_DIR, interval=DEFAULT_INTERVAL):
+        self.profile_dir = profile_dir
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.thread = None
+        self.running = False
+        self.last_result = None
+
+    def start(self, seconds=DEFAULT_SECONDS):
+        """Start a profile in the background; False if one is already running"""
+        seconds = max(0.1, min(float(seconds), MAX_SECONDS))
+        with self.lock:
+            if self.running:
+                return False
+            self.running = True
+        self.thread = threading.Thread(target=self._run, args=(seconds,), name='deenbot-profiler', daemon=True)
+        self.thread.start()
+        logging.info(f"🔬 Sampling profiler started for {seconds:.0f}s at {1 / self.interval:.0f} Hz")
+        return True
+
+    def status(self):
+        """Whether a profile is running, and the last completed profile"""
+        return {'running': self.running, 'last_profile': self.last_result}
+
+    def _cpu_baseline(self, own_id):
+        """(CPU seconds, wall clock) of every other thread, where CPU clocks exist"""
+        if not THREAD_CPU_CLOCKS:
+            return {}
+        now = time.perf_counter()
+        return {thread_id: (thread_cpu_time(thread_id), now) for thread_id in sys._current_frames() if thread_id != own_id}
+
+    def _busy(self, thread_id, cpu_times):
+        """Whether a thread spent at least BUSY_CPU_SHARE of the time since its last sample on CPU
+
+        A thread first seen mid-profile has no baseline; its first sample
+        only starts one. Without CPU clocks every thread counts as busy.
+        """
+        cpu = thread_cpu_time(thread_id)
+        now = time.perf_counter()
+        previous = cpu_times.get(thread_id)
+        cpu_times[thread_id] = (cpu, now)
+        if cpu is None:
+            return True
+        if previous is None or previous[0] is None:
+            return False
+        return cpu - previous[0] >= BUSY_CPU_SHARE * (now - previous[1])
+
+    def _run(self, seconds):
+        """Sampling loop"""
+        stacks = Counter()
+        samples = 0
+        idle = 0
+        own_id = threading.get_ident()
+        cpu_times = self._cpu_baseline(own_id)
+        started = time.perf_counter()
+        deadline = started + seconds
+        try:
+            while time.perf_counter() < deadline:
+                time.sleep(self.interval)
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_id:
+                        continue
+                    # Every thread's CPU baseline moves on, even one already known to be waiting
+                    busy = self._busy(thread_id, cpu_times) if THREAD_CPU_CLOCKS else True
+                    if frame.f_code.co_name in IDLE_FUNCTIONS or not busy:
+                        idle += 1
+                        continue
+                    stack = []
+                    while frame is not None:
+                        code = frame.f_code
+                        stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                        frame = frame.f_back
+                    stacks[tuple(reversed(stack))] += 1
+                    samples += 1
+            self.last_result = self._write(stacks, samples, idle, time.perf_counter() - started)
+            logging.info(f"🔬 Profile complete: {samples} samples -> {self.last_result['collapsed_file']}")
+        except Exception as e:
+            logging.error(f"❌ Sampling profiler error: {e}")
+        finally:
+            with self.lock:
+                self.running = False
+
+    def _write(self, stacks, samples, idle, elapsed):
+        """Write collapsed stacks, pstats and a summary; return the summary"""
+        os.makedirs(self.profile_dir, exist_ok=True)
+        stem = os.path.join(self.profile_dir, f"deenbot-{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+
+        collapsed = Counter()
+        for stack, count in stacks.items():
+            collapsed[';'.join(frame_label(function) for function in stack)] += count
+        with open(f"{stem}.collapsed", 'w', encoding='utf-8') as f:
+            for stack, count in collapsed.most_common():
+                f.write(f"{stack} {count}\n")
+
+        self_samples, total_samples = Counter(), Counter()
+        for stack, count in stacks.items():
+            self_samples[stack[-1]] += count
+            for function in set(stack):
+                total_samples[function] += count
+        with open(f"{stem}.prof", 'wb') as f:
+            marshal.dump(self._pstats(stacks, self_samples, total_samples), f)
+
+        def top(counts):
+            return [
+                {'function': f"{frame_label(function)}:{function[1]}", 'samples': count,
+                 'pct': round(count / max(samples, 1) * 100, 1)}
+                for function, count in counts.most_common(25)
+            ]
+
+        summary = {
+            'generated_at': datetime.now().isoformat(),
+            'elapsed_seconds': round(elapsed, 2),
+            'interval_seconds': self.interval,
+            'samples': samples,
+            'idle_samples': idle,
+            'collapsed_file': f"{stem}.collapsed",
+            'pstats_file': f"{stem}.prof",
+            'top_self': top(self_samples),
+            'top_total': top(total_samples)
+        }
+        with open(f"{stem}.json", 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        return summary
+
+    def _pstats(self, stacks, self_samples, total_samples):
+        """Samples as a pstats stats dict; times are samples x interval, call counts are sample counts"""
+        callers = {function: Counter() for function in total_samples}
+        for stack, count in stacks.items():
+            for caller, callee in set(zip(stack, stack[1:])):
+                callers[callee][caller] += count
+
+        stats = {}
+        for function, total in total_samples.items():
+            own = self_samples.get(function, 0)
+            stats[function] = (
+                total, total, own * self.interval, total * self.interval,
+                {caller: (count, count, 0.0, count * self.interval) for caller, count in callers[function].items()}
+            )
+        return stats
+
+profiler = SamplingProfiler()
+
+def install_signal_handler(seconds=DEFAULT_SECONDS):
+    """Start a profile on SIGUSR2 (where the platform has it)"""
+    if not hasattr(signal, 'SIGUSR2'):
+        return False
+
+    def handle(signum, frame):
+        if not profiler.start(seconds):
+            logging.warning("⚠️ Sampling profiler already running")
+
+    signal.signal(signal.SIGUSR2, handle)
+    return True
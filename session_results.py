@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Session Results - Cached Result Sets for Follow-Up Requests
+When an answer offers more sources ("one at a time", "all at once",
+"show me Sahih Bukhari"), the ranked result list is kept per chat session
+so the follow-up is served from memory instead of a second search.
+Sessions live in a bounded LRU and expire after a period of inactivity.
+"""
+
+import os
+import time
+import uuid
+import threading
+from collections import OrderedDict
+
+# Sessions kept at once; the least recently used is dropped beyond this
+MAX_SESSIONS = int(os.environ.get('DEENBOT_SESSION_CACHE_SIZE', '1000'))
+
+# Seconds of inactivity after which a session's results are forgotten
+SESSION_TTL_SECONDS = float(os.environ.get('DEENBOT_SESSION_TTL_SECONDS', '1800'))
+
+def new_session_id():
+    """Random session ID for clients that did not send one"""
+    return uuid.uuid4().hex
+
+class SessionResults:
+    """Bounded LRU of session ID -> ranked results of the session's last search"""
+
+    def __init__(self, max_sessions=MAX_SESSIONS, ttl_seconds=SESSION_TTL_SECONDS, clock=time.monotonic):
+        self.max_sessions = max(int(max_sessions), 1)
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.sessions = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def store(self, session_id, query, results, shown=1):
+        """Remember a search; the first `shown` results were already in the answer"""
+        with self._lock:
+            self.sessions[session_id] = {
+                'query': query,
+                'results': list(results),
+                'position': shown,
+                'expires': self.clock() + self.ttl_seconds
+            }
+            self.sessions.move_to_end(session_id)
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+                self.evictions += 1
+
+    def _live(self, session_id):
+        """The unexpired entry for session_id, refreshed; call with the lock held"""
+        entry = self.sessions.get(session_id)
+        if entry is None:
+            return None
+        now = self.clock()
+        if entry['expires'] < now:
+            del self.sessions[session_id]
+            self.evictions += 1
+            return None
+        entry['expires'] = now + self.ttl_seconds
+        self.sessions.move_to_end(session_id)
+        return entry
+
+    def take(self, session_id, count=None):
+        """(query, results, first index, total) for the next `count` unseen results, advancing past them
+
+        count=None takes everything still unseen. Returns None if the
+        session has no cached results.
+        """
+        with self._lock:
+            entry = self._live(session_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            start = entry['position']
+            end = len(entry['results']) if count is None else min(start + count, len(entry['results']))
+            entry['position'] = end
+            return entry['query'], entry['results'][start:end], start, len(entry['results'])
+
+    def results(self, session_id):
+        """(query, all cached results) without moving the position, or None"""
+        with self._lock:
+            entry = self._live(session_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry['query'], entry['results']
+
+    def stats(self):
+        """(hits, misses) for the metrics cache hit ratio"""
+        return self.hits, self.misses
+
+    def __len__(self):
+        return len(self.sessions)
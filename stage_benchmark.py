@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+DeenBot Stage Benchmark - Per-Stage Cost of the Routing Cascade
+Times every stage of ComprehensiveDeenBot.get_comprehensive_response in-process
+over the question corpora and reports how often each stage is reached, how
+often it produces the answer, and where the time goes
+"""
+
+import sys
+import json
+import time
+import logging
+import argparse
+
+from question_corpora import CORPORA, iter_corpora
+from latency_histogram import LatencyHistogram
+from incremental_build import atomic_write
+
+DEFAULT_REPEATS = 3
+
+# Stage labels in cascade order
+STAGE_TOPIC_MATCH = 'Direct topic match'
+STAGE_CLASSIFICATION = 'Pattern classification'
+STAGE_FIRST_A = 'Comprehensive knowledge (FIRST-A)'
+STAGE_MULTI_SOURCE = 'Multi-source (short queries)'
+STAGE_FOLLOW_UP = 'Follow-up sources'
+STAGE_SECOND = 'Comprehensive knowledge (SECOND)'
+STAGE_CONTENT_SCANNER = 'Content scanner'
+STAGE_ENHANCED = 'Enhanced knowledge loop'
+STAGE_ONLINE = 'Online answer with warning'
+STAGE_OVERHEAD = 'Cascade overhead'
+
+STAGE_ORDER = [
+    STAGE_TOPIC_MATCH, STAGE_CLASSIFICATION, STAGE_FIRST_A, STAGE_MULTI_SOURCE, STAGE_FOLLOW_UP,
+    STAGE_SECOND, STAGE_CONTENT_SCANNER, STAGE_ENHANCED, STAGE_ONLINE, STAGE_OVERHEAD
+]
+
+class StageStats:
+    """Reach count, answer count and call latencies for one stage"""
+
+    def __init__(self):
+        self.reached = 0
+        self.answered = 0
+        self.total = 0.0
+        self.histogram = LatencyHistogram()
+
+    def add(self, seconds, answered):
+        """Record one call of the stage"""
+        self.reached += 1
+        self.answered += 1 if answered else 0
+        self.total += seconds
+        self.histogram.record_seconds(seconds)
+
+class StageProfiler:
+    """Wraps each cascade stage of a ComprehensiveDeenBot with a timer
+
+    Wrappers are installed as instance attributes, so the bot, the shared
+    knowledge base and the content scanner are untouched once restore()
+    runs. Only the outermost stage call is timed; a stage that calls
+    another stage's method includes that time in its own.
+    """
+
+    def __init__(self, deenbot, backend):
+        self.deenbot = deenbot
+        self.backend = backend
+        self.stats = {stage: StageStats() for stage in STAGE_ORDER}
+        self.installed = []
+        self.depth = 0
+        self.request_time = 0.0
+        self.request_classified = False
+        self.request_knowledge_calls = 0
+        self.repeated_searches = 0
+        self.repeated_search_seconds = 0.0
+        self.queries = 0
+
+    def _wrap(self, owner, method_name, label, answered):
+        """Replace owner.method_name with a timing wrapper"""
+        original = getattr(owner, method_name)
+
+        def timed(*args, **kwargs):
+            if self.depth:
+                return original(*args, **kwargs)
+            self.depth += 1
+            started = time.perf_counter()
+            try:
+                result = original(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - started
+                self.depth -= 1
+            stage = label(result) if callable(label) else label
+            self.stats[stage].add(seconds, answered(result))
+            self.request_time += seconds
+            if stage == STAGE_SECOND and self.request_knowledge_calls > 1:
+                # FIRST-A already searched this exact message and found nothing
+                self.repeated_searches += 1
+                self.repeated_search_seconds += seconds
+            return result
+
+        setattr(owner, method_name, timed)
+        self.installed.append((owner, method_name))
+
+    def _knowledge_stage(self, result):
+        """FIRST-A or SECOND, from how many knowledge searches this request has made"""
+        self.request_knowledge_calls += 1
+        if self.request_knowledge_calls == 1 and self.request_classified:
+            return STAGE_FIRST_A
+        return STAGE_SECOND
+
+    def _classification_stage(self, result):
+        """Remember whether FIRST-A will run for this request"""
+        self.request_classified = result is not None
+        return STAGE_CLASSIFICATION
+
+    def install(self):
+        """Install timing wrappers on every stage"""
+        deenbot = self.deenbot
+        self._wrap(deenbot, 'find_best_topic_match', STAGE_TOPIC_MATCH,
+                   lambda topic: bool(topic) and topic in deenbot.islamic_knowledge)
+        self._wrap(deenbot, 'classify_islamic_query', self._classification_stage,
+                   lambda category: category is not None)
+        self._wrap(deenbot, 'find_enhanced_knowledge_match', STAGE_ENHANCED, bool)
+        self._wrap(deenbot, 'get_online_answer_with_warning', STAGE_ONLINE, bool)
+
+        if self.backend.COMPREHENSIVE_KNOWLEDGE_AVAILABLE:
+            knowledge = self.backend.comprehensive_knowledge
+            self._wrap(knowledge, 'get_ranked_comprehensive_response', self._knowledge_stage,
+                       lambda result: bool(result[0]))
+            self._wrap(knowledge, 'get_comprehensive_multi_source_response', STAGE_MULTI_SOURCE, bool)
+            self._wrap(knowledge, 'get_follow_up_sources', STAGE_FOLLOW_UP, bool)
+
+        if self.backend.CONTENT_SCANNER_AVAILABLE:
+            self._wrap(self.backend.content_scanner, 'get_comprehensive_response', STAGE_CONTENT_SCANNER,
+                       lambda result: bool(result[0]))
+        return self
+
+    def restore(self):
+        """Remove the timing wrappers"""
+        for owner, method_name in self.installed:
+            delattr(owner, method_name)
+        self.installed = []
+
+    def run_query(self, question):
+        """Answer one question, attributing untimed cascade work to overhead"""
+        self.request_time = 0.0
+        self.request_classified = False
+        self.request_knowledge_calls = 0
+        started = time.perf_counter()
+        response = self.deenbot.get_comprehensive_response(question)
+        total = time.perf_counter() - started
+        self.stats[STAGE_OVERHEAD].add(max(total - self.request_time, 0.0), False)
+        self.queries += 1
+        return response
+
+    def report(self):
+        """Per-stage results, in cascade order"""
+        total = sum(stats.total for stats in self.stats.values()) or 1e-12
+        stages = []
+        for stage in STAGE_ORDER:
+            stats = self.stats[stage]
+            summary = stats.histogram.summary()
+            stages.append({
+                'stage': stage,
+                'reached': stats.reached,
+                'reach_pct': round(stats.reached / max(self.queries, 1) * 100, 1),
+                'answered': stats.answered,
+                'total_ms': round(stats.total * 1000, 3),
+                'share_pct': round(stats.total / total * 100, 1),
+                'mean_ms': summary['mean_ms'],
+                'p50_ms': summary['p50_ms'],
+                'p99_ms': summary['p99_ms'],
+                'max_ms': summary['max_ms']
+            })
+        return {
+            'queries': self.queries,
+            'total_ms': round(total * 1000, 3),
+            'repeated_searches': self.repeated_searches,
+            'repeated_search_ms': round(self.repeated_search_seconds * 1000, 3),
+            'stages': stages
+        }
+
+def run_stage_benchmark(corpora=None, repeats=DEFAULT_REPEATS):
+    """Profile every cascade stage over the corpora and return the report"""
+    import comprehensive_deenbot_backend as backend
+
+    deenbot = backend.ComprehensiveDeenBot()
+    questions = [question for _, _, question in iter_corpora(corpora)]
+
+    saved_before = sum(backend.query_work.totals()['saved'].values())
+    profiler = StageProfiler(deenbot, backend).install()
+    try:
+        for _ in range(max(repeats, 1)):
+            for question in questions:
+                profiler.run_query(question)
+    finally:
+        profiler.restore()
+
+    report = profiler.report()
+    report['saved_searches'] = sum(backend.query_work.totals()['saved'].values()) - saved_before
+    report['repeats'] = repeats
+    report['corpora'] = sorted(corpora or CORPORA)
+    return report
+
+def print_stage_report(report):
+    """Text table of per-stage costs"""
+    print("🔬 ROUTING STAGE BENCHMARK")
+    print("=" * 60)
+    print(f"📝 Queries: {report['queries']} ({report['repeats']} passes over {len(report['corpora'])} corpora)")
+    print(f"⏱️  Total cascade time: {report['total_ms']:.1f}ms "
+          f"({report['total_ms'] / max(report['queries'], 1):.2f}ms per query)")
+    print("")
+    print(f"   {'stage':<36} {'reached':>8} {'reach%':>7} {'answered':>9} {'total':>11} {'share':>7} "
+          f"{'mean':>9} {'p50':>9} {'p99':>9}")
+    for stage in report['stages']:
+        print(f"   {stage['stage']:<36} {stage['reached']:>8} {stage['reach_pct']:>6.1f}% {stage['answered']:>9} "
+              f"{stage['total_ms']:>9.1f}ms {stage['share_pct']:>6.1f}% {stage['mean_ms']:>7.3f}ms "
+              f"{stage['p50_ms']:>7.3f}ms {stage['p99_ms']:>7.3f}ms")
+    print("")
+    print(f"🔁 Repeated knowledge searches (SECOND after an unanswered FIRST-A): "
+          f"{report['repeated_searches']} costing {report['repeated_search_ms']:.1f}ms")
+    print(f"♻️  Searches reused from the request's query context: {report['saved_searches']}")
+
+def main():
+    """Run the stage benchmark"""
+    parser = argparse.ArgumentParser(description="Per-stage microbenchmark of DeenBot's routing cascade")
+    parser.add_argument('--corpus', action='append', choices=sorted(CORPORA),
+                        help="corpus to run (repeatable, default all)")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS, help="passes over the query set")
+    parser.add_argument('--json', metavar='PATH', help="also write the report as JSON")
+    args = parser.parse_args()
+
+    # Per-query INFO logging would otherwise dominate the console
+    logging.disable(logging.INFO)
+
+    report = run_stage_benchmark(args.corpus, args.repeats)
+    print_stage_report(report)
+
+    if args.json:
+        atomic_write(args.json, json.dumps(report, indent=2))
+        print(f"\n📁 Report saved to: {args.json}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
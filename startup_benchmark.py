@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+DeenBot Startup Benchmark - Time-to-Ready, Cold vs Snapshot
+Starts fresh interpreters that import the comprehensive backend and build
+the knowledge engine, once rebuilding everything from source and once
+restoring from the knowledge snapshot, and reports how long each takes to
+be ready to answer
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+from knowledge_snapshot import SNAPSHOT_FILE, read_header, source_fingerprint
+from incremental_build import atomic_write
+
+DEFAULT_RUNS = 5
+
+# Runs in the child: build the engine exactly as main() does, then report
+CHILD_CODE = """
+import json, logging, time
+logging.disable(logging.INFO)
+import comprehensive_deenbot_backend as backend
+backend.ComprehensiveDeenBot()
+print(json.dumps({
+    'engine_seconds': time.perf_counter() - backend.BOOT_STARTED,
+    'snapshot': backend.knowledge_snapshot.load_info['reason']
+}), flush=True)
+"""
+
+def time_startup(snapshot):
+    """One fresh-process startup; wall time from spawn to ready, plus in-process time"""
+    env = dict(os.environ, DEENBOT_SNAPSHOT=snapshot)
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-c', CHILD_CODE], stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL, env=env, text=True)
+    line = process.stdout.readline()
+    wall = time.perf_counter() - started
+    process.wait()
+    result = json.loads(line)
+    result['wall_seconds'] = wall
+    return result
+
+def summarize(results):
+    """Min and median of the timing fields"""
+    summary = {'snapshot': results[-1]['snapshot'], 'runs': len(results)}
+    for field in ('wall_seconds', 'engine_seconds'):
+        values = [result[field] for result in results]
+        summary[field.replace('_seconds', '_min_ms')] = round(min(values) * 1000, 1)
+        summary[field.replace('_seconds', '_median_ms')] = round(statistics.median(values) * 1000, 1)
+    return summary
+
+def snapshot_is_current(path):
+    """Whether path holds an up-to-date snapshot"""
+    if not os.path.exists(path):
+        return False
+    header = read_header(path)
+    return header is not None and header['fingerprint'] == source_fingerprint()
+
+def main():
+    """Run the startup benchmark"""
+    parser = argparse.ArgumentParser(description="Time DeenBot backend startup with and without the knowledge snapshot")
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS, help="fresh processes per mode")
+    parser.add_argument('--snapshot', default=SNAPSHOT_FILE, help="snapshot file to warm-start from")
+    parser.add_argument('--json', metavar='PATH', help="also write the results as JSON")
+    args = parser.parse_args()
+
+    if not snapshot_is_current(args.snapshot):
+        print(f"🔨 Building knowledge snapshot: {args.snapshot}")
+        subprocess.run([sys.executable, 'knowledge_snapshot.py', '--output', args.snapshot], check=True)
+
+    print("⏱️  DEENBOT STARTUP BENCHMARK")
+    print("=" * 60)
+    # Interleave modes so disk cache and CPU frequency affect both alike
+    runs = {'cold': [], 'snapshot': []}
+    for _ in range(max(args.runs, 1)):
+        runs['cold'].append(time_startup('0'))
+        runs['snapshot'].append(time_startup(args.snapshot))
+    modes = {mode: summarize(results) for mode, results in runs.items()}
+
+    print(f"   {'mode':<10} {'wall min':>10} {'wall p50':>10} {'engine min':>11} {'engine p50':>11}  snapshot")
+    for mode, summary in modes.items():
+        print(f"   {mode:<10} {summary['wall_min_ms']:>8.1f}ms {summary['wall_median_ms']:>8.1f}ms "
+              f"{summary['engine_min_ms']:>9.1f}ms {summary['engine_median_ms']:>9.1f}ms  {summary['snapshot']}")
+    if modes['snapshot']['snapshot'] != 'loaded':
+        print(f"⚠️ Snapshot was not used: {modes['snapshot']['snapshot']}")
+    else:
+        speedup = modes['cold']['engine_median_ms'] / max(modes['snapshot']['engine_median_ms'], 1e-3)
+        print(f"\n⚡ Snapshot startup is {speedup:.1f}x faster to ready "
+              f"({modes['cold']['wall_median_ms'] - modes['snapshot']['wall_median_ms']:.0f}ms saved per process)")
+
+    if args.json:
+        atomic_write(args.json, json.dumps({'runs': args.runs, 'modes': modes}, indent=2))
+        print(f"\n📁 Results saved to: {args.json}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,8 @@ import json
 import time
 from datetime import datetime
 
+from question_corpora import corpus_questions
+
 class DeenBotTester:
     def __init__(self):
         self.base_url = "http://localhost:8080"
@@ -22,217 +24,7 @@ class DeenBotTester:
         }
         
         # 100+ comprehensive test questions covering all topics
-        self.test_questions = [
-            # Core Islamic Concepts
-            "What is Islam?",
-            "What is Taqwa?",
-            "What are the five pillars of Islam?",
-            "What is the Shahada?",
-            "What is Salah?",
-            "What is Zakat?",
-            "What is Sawm?",
-            "What is Hajj?",
-            
-            # Prayer and Worship
-            "How to perform wudu?",
-            "How to pray?",
-            "What is dua?",
-            "What is dhikr?",
-            "What is tahajjud?",
-            "What are prayer times?",
-            "How to make dua?",
-            "What is the importance of prayer?",
-            
-            # Islamic Ethics and Character
-            "What is patience in Islam?",
-            "What is gratitude in Islam?",
-            "What is humility in Islam?",
-            "What is honesty in Islam?",
-            "How to control anger?",
-            "What is sabr?",
-            "What is shukr?",
-            "What is tawadu?",
-            
-            # Family and Relationships
-            "How to treat parents?",
-            "What is marriage in Islam?",
-            "How to raise children?",
-            "What is family in Islam?",
-            "How to be a good spouse?",
-            "What are family rights?",
-            "How to resolve family conflicts?",
-            "What is parenting in Islam?",
-            
-            # Business and Finance
-            "What is Islamic business?",
-            "What is riba?",
-            "What is charity in Islam?",
-            "How to manage wealth?",
-            "What is halal business?",
-            "What is Islamic banking?",
-            "How to give zakat?",
-            "What is sadaqah?",
-            
-            # Health and Wellness
-            "What is health in Islam?",
-            "How to seek medical treatment?",
-            "What is hygiene in Islam?",
-            "What is exercise in Islam?",
-            "How to maintain health?",
-            "What is Islamic medicine?",
-            "How to stay healthy?",
-            "What is wellness in Islam?",
-            
-            # Education and Knowledge
-            "What is education in Islam?",
-            "How to seek knowledge?",
-            "What is wisdom in Islam?",
-            "How to understand Islam?",
-            "What is learning in Islam?",
-            "How to gain wisdom?",
-            "What is Islamic education?",
-            "How to study Islam?",
-            
-            # Social Justice and Community
-            "What is justice in Islam?",
-            "What is equality in Islam?",
-            "How to build community?",
-            "How to serve others?",
-            "What is social justice?",
-            "How to help neighbors?",
-            "What is community service?",
-            "How to promote unity?",
-            
-            # Advanced Islamic Topics
-            "What is aqeedah?",
-            "What is fiqh?",
-            "What is seerah?",
-            "What is sufism?",
-            "What are Islamic beliefs?",
-            "What is Islamic law?",
-            "What is prophet biography?",
-            "What is spirituality?",
-            
-            # Islamic History and Civilization
-            "What is Islamic history?",
-            "What was the Golden Age?",
-            "What is Al-Andalus?",
-            "What is the Ottoman Empire?",
-            "What is Islamic civilization?",
-            "What are Muslim achievements?",
-            "What is Islamic Spain?",
-            "What is Muslim history?",
-            
-            # Contemporary Issues
-            "What are modern challenges?",
-            "How to deal with technology?",
-            "What is interfaith dialogue?",
-            "How to promote understanding?",
-            "What is Islamic finance?",
-            "How to bank halal?",
-            "What is environmental protection?",
-            "How to protect the environment?",
-            
-            # Personal Development
-            "What is Islamic psychology?",
-            "How to manage mental health?",
-            "What is emotional intelligence?",
-            "How to control emotions?",
-            "How to manage stress?",
-            "How to cope with difficulties?",
-            "How to set goals?",
-            "How to achieve objectives?",
-            
-            # Advanced Worship
-            "What is night prayer?",
-            "How to do advanced dhikr?",
-            "What are dhikr methods?",
-            "What are dua collections?",
-            "How to make supplications?",
-            "How to memorize Quran?",
-            "What is hifz?",
-            "How to recite Quran?",
-            
-            # Islamic Culture
-            "What is Islamic art?",
-            "What is Muslim art?",
-            "What is Islamic architecture?",
-            "How to design mosques?",
-            "What is Islamic literature?",
-            "What is Muslim literature?",
-            "What is Islamic music?",
-            "What are nasheeds?",
-            
-            # Quranic Knowledge
-            "What are important Quranic verses?",
-            "What are essential verses?",
-            "How to understand Quran?",
-            "What are hadith collections?",
-            "What are hadith books?",
-            "How to verify hadith?",
-            "What is authentic hadith?",
-            "How to study hadith?",
-            
-            # Additional Topics
-            "What is Ramadan?",
-            "What is fasting?",
-            "What is pilgrimage?",
-            "What is the Kaaba?",
-            "What is Mecca?",
-            "What is Medina?",
-            "What is the Prophet's Mosque?",
-            "What is the Black Stone?",
-            
-            # Edge Cases and Variations
-            "What is the meaning of Bismillah?",
-            "How to become a better Muslim?",
-            "What is the purpose of life?",
-            "How to find peace?",
-            "What is the best way to worship?",
-            "How to strengthen faith?",
-            "What is the most important thing in Islam?",
-            "How to be closer to Allah?",
-            
-            # Complex Questions
-            "What is the difference between Sunnah and Hadith?",
-            "How does Islam view modern science?",
-            "What is the Islamic perspective on democracy?",
-            "How to balance tradition and modernity?",
-            "What is the role of women in Islam?",
-            "How to deal with non-Muslims?",
-            "What is jihad in Islam?",
-            "How to understand Islamic rulings?",
-            
-            # Practical Life
-            "How to eat according to Sunnah?",
-            "What is Islamic etiquette?",
-            "How to dress modestly?",
-            "What is halal food?",
-            "How to greet people?",
-            "What is visiting etiquette?",
-            "How to be a good neighbor?",
-            "What is social media etiquette?",
-            
-            # Spiritual Growth
-            "How to increase iman?",
-            "What is spiritual purification?",
-            "How to develop taqwa?",
-            "What is heart purification?",
-            "How to find inner peace?",
-            "What is spiritual growth?",
-            "How to connect with Allah?",
-            "What is divine love?",
-            
-            # Final Comprehensive Questions
-            "What is the complete Islamic way of life?",
-            "How to implement Islam in daily life?",
-            "What is the ultimate goal of a Muslim?",
-            "How to be successful in this life and the next?",
-            "What is the comprehensive Islamic guidance?",
-            "How to live as a true Muslim?",
-            "What is the path to Paradise?",
-            "How to achieve eternal happiness?"
-        ]
+        self.test_questions = corpus_questions('core_knowledge')
         
         print(f"🚀 DeenBot 100+ Question Test")
         print(f"📊 Total Questions: {len(self.test_questions)}")
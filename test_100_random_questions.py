@@ -10,6 +10,8 @@ import time
 import random
 from datetime import datetime
 
+from question_corpora import corpus_questions
+
 class RandomQuestionTester:
     def __init__(self):
         self.base_url = "http://localhost:8080"
@@ -23,127 +25,7 @@ class RandomQuestionTester:
         }
         
         # 100 completely random questions covering various scenarios
-        self.random_questions = [
-            # Random Islamic concepts
-            "What is the meaning of Bismillah?",
-            "How to perform wudu correctly?",
-            "What are the benefits of fasting?",
-            "How to make dua for parents?",
-            "What is the importance of charity?",
-            "How to strengthen iman?",
-            "What is the best time to pray?",
-            "How to deal with anxiety?",
-            "What is Islamic banking?",
-            "How to raise children Islamically?",
-            
-            # Random daily life questions
-            "How to be a good neighbor?",
-            "What is halal food?",
-            "How to dress modestly?",
-            "What is Islamic etiquette?",
-            "How to greet people?",
-            "What is visiting etiquette?",
-            "How to eat according to Sunnah?",
-            "What is social media etiquette?",
-            "How to be patient?",
-            "What is gratitude in Islam?",
-            
-            # Random spiritual questions
-            "How to purify the heart?",
-            "What is dhikr?",
-            "How to connect with Allah?",
-            "What is spiritual growth?",
-            "How to find inner peace?",
-            "What is divine love?",
-            "How to increase taqwa?",
-            "What is the purpose of life?",
-            "How to be closer to Allah?",
-            "What is the best way to worship?",
-            
-            # Random family questions
-            "How to treat parents?",
-            "What is marriage in Islam?",
-            "How to resolve conflicts?",
-            "What are family rights?",
-            "How to be a good spouse?",
-            "What is parenting in Islam?",
-            "How to raise children?",
-            "What is family in Islam?",
-            "How to deal with family problems?",
-            "What is divorce in Islam?",
-            
-            # Random business questions
-            "What is Islamic business?",
-            "How to avoid riba?",
-            "What is halal business?",
-            "How to manage wealth?",
-            "What is charity in Islam?",
-            "How to give zakat?",
-            "What is sadaqah?",
-            "How to invest halal?",
-            "What is Islamic finance?",
-            "How to bank halal?",
-            
-            # Random health questions
-            "What is health in Islam?",
-            "How to seek medical treatment?",
-            "What is hygiene in Islam?",
-            "How to stay healthy?",
-            "What is Islamic medicine?",
-            "How to maintain health?",
-            "What is exercise in Islam?",
-            "How to cope with stress?",
-            "What is mental health in Islam?",
-            "How to manage emotions?",
-            
-            # Random education questions
-            "What is education in Islam?",
-            "How to seek knowledge?",
-            "What is wisdom in Islam?",
-            "How to understand Islam?",
-            "What is learning in Islam?",
-            "How to gain wisdom?",
-            "What is Islamic education?",
-            "How to study Islam?",
-            "What is the importance of knowledge?",
-            "How to memorize Quran?",
-            
-            # Random social questions
-            "What is justice in Islam?",
-            "How to build community?",
-            "What is equality in Islam?",
-            "How to serve others?",
-            "What is social justice?",
-            "How to help neighbors?",
-            "What is community service?",
-            "How to promote unity?",
-            "What is the role of women?",
-            "How to deal with non-Muslims?",
-            
-            # Random advanced topics
-            "What is aqeedah?",
-            "What is fiqh?",
-            "What is seerah?",
-            "What is sufism?",
-            "What is Islamic history?",
-            "What was the Golden Age?",
-            "What is Al-Andalus?",
-            "What is the Ottoman Empire?",
-            "What is Islamic civilization?",
-            "What are Muslim achievements?",
-            
-            # Random contemporary issues
-            "What are modern challenges?",
-            "How to deal with technology?",
-            "What is interfaith dialogue?",
-            "How to promote understanding?",
-            "What is Islamic finance?",
-            "How to bank halal?",
-            "What is environmental protection?",
-            "How to protect the environment?",
-            "What is Islamic psychology?",
-            "How to manage mental health?"
-        ]
+        self.random_questions = corpus_questions('random')
         
         print(f"🎲 DeenBot 100 Random Questions Test")
         print(f"📊 Total Questions: {len(self.random_questions)}")
@@ -9,6 +9,8 @@ import json
 import time
 from datetime import datetime
 
+from question_corpora import corpus_questions
+
 class DeenBotNonMuslimTester:
     def __init__(self):
         self.base_url = "http://localhost:8080"
@@ -23,47 +25,7 @@ class DeenBotNonMuslimTester:
         }
         
         # 30 realistic questions from non-Muslim perspective
-        self.test_questions = [
-            # Basic Understanding Questions
-            "What is Islam and what do Muslims believe?",
-            "Who is Allah and how is He different from God in other religions?",
-            "What is the Quran and how is it different from the Bible?",
-            "Who is Prophet Muhammad and why is he important to Muslims?",
-            "What are the main differences between Islam and Christianity?",
-            "What are the main differences between Islam and Judaism?",
-            
-            # Cultural and Social Questions
-            "Why do Muslim women wear hijab?",
-            "What is halal food and why is it important?",
-            "Why do Muslims pray five times a day?",
-            "What is Ramadan and why do Muslims fast?",
-            "Why do Muslims face Mecca when praying?",
-            "What is the significance of the Kaaba?",
-            
-            # Practical Questions
-            "How do Muslims greet each other?",
-            "What should I do if I'm invited to a Muslim home?",
-            "Can non-Muslims visit mosques?",
-            "What are the rules for non-Muslims during Ramadan?",
-            "How do Muslims celebrate their holidays?",
-            "What is the proper way to interact with Muslim colleagues?",
-            
-            # Misconceptions and Clarifications
-            "Is Islam a violent religion?",
-            "Do Muslims believe in Jesus?",
-            "What does Jihad really mean?",
-            "Why do some Muslim countries have different laws?",
-            "Is it true that Muslims can't eat pork?",
-            "Why do some Muslims have multiple wives?",
-            
-            # Modern and Contemporary Issues
-            "How does Islam view modern technology?",
-            "What is the Islamic perspective on democracy?",
-            "How do Muslims view other religions?",
-            "What is the Islamic stance on human rights?",
-            "How does Islam address environmental issues?",
-            "What is the future of Islam in the modern world?"
-        ]
+        self.test_questions = corpus_questions('non_muslim_30')
         
         print("🕌 DeenBot Non-Muslim Question Tester")
         print("=" * 50)
@@ -9,6 +9,8 @@ import json
 import time
 from datetime import datetime
 
+from question_corpora import corpus_questions
+
 class DeenBotWomenNonMuslimTester:
     def __init__(self):
         self.base_url = "http://localhost:8080"
@@ -23,49 +25,7 @@ class DeenBotWomenNonMuslimTester:
         }
         
         # 32 specialized questions from non-Muslim women's perspective
-        self.test_questions = [
-            # Women's Rights and Status in Islam (8 questions)
-            "What rights do women have in Islam?",
-            "Is it true that Islam oppresses women?",
-            "How does Islam view women's education?",
-            "Can Muslim women work and have careers?",
-            "What is the Islamic view on women's leadership?",
-            "Do Muslim women have property rights?",
-            "How does Islam protect women's dignity?",
-            "What is the Islamic perspective on women's independence?",
-            
-            # Dress Code and Modesty (6 questions)
-            "Why do Muslim women wear hijab?",
-            "Is hijab mandatory for all Muslim women?",
-            "What is the Islamic dress code for women?",
-            "Can Muslim women wear makeup and jewelry?",
-            "What should I wear when visiting Muslim women?",
-            "How do Muslim women dress for different occasions?",
-            
-            # Family and Relationships (6 questions)
-            "What is the Islamic view on marriage?",
-            "Can Muslim women choose their own husbands?",
-            "What are the rights of Muslim wives?",
-            "How does Islam view divorce for women?",
-            "What is the Islamic perspective on motherhood?",
-            "How do Muslim women handle family conflicts?",
-            
-            # Social Interactions (6 questions)
-            "How should I interact with Muslim women?",
-            "Can I hug or shake hands with Muslim women?",
-            "What topics are appropriate to discuss with Muslim women?",
-            "How do Muslim women socialize with non-Muslims?",
-            "What should I know about Muslim women's privacy?",
-            "How do Muslim women participate in community activities?",
-            
-            # Modern Women's Issues (6 questions)
-            "How does Islam address women's mental health?",
-            "What is the Islamic view on women's sports and fitness?",
-            "How do Muslim women balance work and family?",
-            "What is the Islamic perspective on women's social media use?",
-            "How does Islam address women's financial independence?",
-            "What is the Islamic view on women's travel and mobility?"
-        ]
+        self.test_questions = corpus_questions('women_non_muslim')
         
         print("🕌 DeenBot Women's Non-Muslim Question Tester")
         print("=" * 60)
@@ -9,6 +9,8 @@ import json
 import time
 from datetime import datetime
 
+from question_corpora import corpus_questions
+
 class DeenBot60QuestionTester:
     def __init__(self):
         self.base_url = "http://localhost:8080"
@@ -23,79 +25,7 @@ class DeenBot60QuestionTester:
         }
         
         # 60 comprehensive questions from non-Muslim perspective
-        self.test_questions = [
-            # Basic Understanding Questions (10 questions)
-            "What is Islam and what do Muslims believe?",
-            "Who is Allah and how is He different from God in other religions?",
-            "What is the Quran and how is it different from the Bible?",
-            "Who is Prophet Muhammad and why is he important to Muslims?",
-            "What are the main differences between Islam and Christianity?",
-            "What are the main differences between Islam and Judaism?",
-            "What does 'Muslim' mean and who can become one?",
-            "What is the difference between Sunni and Shia Muslims?",
-            "How old is Islam as a religion?",
-            "What is the Islamic calendar and how does it work?",
-            
-            # Cultural and Social Questions (10 questions)
-            "Why do Muslim women wear hijab?",
-            "What is halal food and why is it important?",
-            "Why do Muslims pray five times a day?",
-            "What is Ramadan and why do Muslims fast?",
-            "Why do Muslims face Mecca when praying?",
-            "What is the significance of the Kaaba?",
-            "What is the Islamic dress code?",
-            "Why do some Muslim men have beards?",
-            "What is the Islamic view on music and art?",
-            "How do Muslims celebrate their holidays?",
-            
-            # Practical Questions (10 questions)
-            "How do Muslims greet each other?",
-            "What should I do if I'm invited to a Muslim home?",
-            "Can non-Muslims visit mosques?",
-            "What are the rules for non-Muslims during Ramadan?",
-            "How do Muslims celebrate their holidays?",
-            "What is the proper way to interact with Muslim colleagues?",
-            "What should I wear when visiting a mosque?",
-            "How do Muslims handle death and funerals?",
-            "What is the Islamic way of eating?",
-            "How do Muslims handle business transactions?",
-            
-            # Misconceptions and Clarifications (10 questions)
-            "Is Islam a violent religion?",
-            "Do Muslims believe in Jesus?",
-            "What does Jihad really mean?",
-            "Why do some Muslim countries have different laws?",
-            "Is it true that Muslims can't eat pork?",
-            "Why do some Muslims have multiple wives?",
-            "Do Muslims worship the Kaaba?",
-            "Is it true that Islam oppresses women?",
-            "What is the Islamic view on terrorism?",
-            "Do Muslims believe in the same God as Christians?",
-            
-            # Modern and Contemporary Issues (10 questions)
-            "How does Islam view modern technology?",
-            "What is the Islamic perspective on democracy?",
-            "How do Muslims view other religions?",
-            "What is the Islamic stance on human rights?",
-            "How does Islam address environmental issues?",
-            "What is the future of Islam in the modern world?",
-            "How does Islam view social media?",
-            "What is the Islamic perspective on education?",
-            "How does Islam address mental health?",
-            "What is the Islamic view on social justice?",
-            
-            # Advanced and Specific Topics (10 questions)
-            "What is the Islamic view on science and evolution?",
-            "How does Islam view medical treatment?",
-            "What is the Islamic perspective on banking and interest?",
-            "How does Islam address gender equality?",
-            "What is the Islamic view on LGBTQ+ issues?",
-            "How does Islam view democracy and voting?",
-            "What is the Islamic perspective on war and peace?",
-            "How does Islam address poverty and wealth inequality?",
-            "What is the Islamic view on freedom of speech?",
-            "How does Islam address climate change and environmental protection?"
-        ]
+        self.test_questions = corpus_questions('non_muslim_60')
         
         print("🕌 DeenBot 60-Question Non-Muslim Tester")
         print("=" * 60)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+DeenBot Follow-Up Session Test - Verify that new questions are not taken over by a session's cached sources
+"""
+
+import uuid
+import requests
+
+CHAT_URL = "http://localhost:8080/chat"
+FOLLOW_UP_SOURCE = "Additional Islamic Sources - Session Results"
+
+# An answer that offers additional sources, so the session holds cached results
+OPENING_QUESTION = "What does the hadith say about honesty?"
+
+# Questions that mention a collection or "next" / "rest" and must still be answered normally
+NEW_QUESTIONS = [
+    "What is the Quran?",
+    "Who was Imam Ahmad?",
+    "What happens in the next life?",
+    "Is fiqh important?",
+    "What does Bukhari say about patience?",
+    "show me Bukhari on patience",
+    "quran",
+    "the rest of my life",
+]
+
+# Follow-ups that must be served from the session's cached results
+FOLLOW_UPS = [
+    "next source",
+    "show me Sahih Bukhari",
+    "all at once",
+]
+
+def chat(message, session_id=None):
+    """Source and response of one /chat message"""
+    payload = {"message": message}
+    if session_id:
+        payload["session_id"] = session_id
+    response = requests.post(CHAT_URL, json=payload, timeout=10)
+    response.raise_for_status()
+    data = response.json()
+    return data.get('source', 'Unknown'), data.get('response', '')
+
+def main():
+    """Ask new questions and follow-ups in a session that holds cached sources"""
+    print("🔁 DeenBot Follow-Up Session Test")
+    print("=" * 60)
+
+    session_id = f"follow-up-test-{uuid.uuid4().hex}"
+    passed = 0
+    failed = 0
+
+    try:
+        source, _ = chat(OPENING_QUESTION, session_id)
+        print(f"📖 {OPENING_QUESTION:40} -> {source}")
+
+        for question in NEW_QUESTIONS:
+            # The same question without a session is the routing it must keep
+            expected, _ = chat(question)
+            source, response = chat(question, session_id)
+            if source == expected and source != FOLLOW_UP_SOURCE:
+                print(f"✅ {question:40} -> {source}")
+                passed += 1
+            else:
+                print(f"❌ {question:40} -> {source} (expected {expected}) | {response[:80]}...")
+                failed += 1
+
+        for follow_up in FOLLOW_UPS:
+            source, response = chat(follow_up, session_id)
+            if source == FOLLOW_UP_SOURCE:
+                print(f"✅ {follow_up:40} -> {response.splitlines()[0]}")
+                passed += 1
+            else:
+                print(f"❌ {follow_up:40} -> {source} (expected {FOLLOW_UP_SOURCE})")
+                failed += 1
+    except requests.RequestException as e:
+        print(f"❌ Backend not reachable at {CHAT_URL}: {type(e).__name__}")
+        return False
+
+    print("")
+    print(f"📊 Results: {passed} passed, {failed} failed")
+    return failed == 0
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
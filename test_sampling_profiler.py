@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+DeenBot Sampling Profiler Test - Verify that busy threads dominate a profile and waiting threads do not appear
+"""
+
+import os
+import time
+import logging
+import tempfile
+import threading
+
+from deenbot_logging import setup_logging
+from sampling_profiler import SamplingProfiler
+
+PROFILE_SECONDS = 2.0
+
+# Share of samples the busy thread must account for
+MIN_BUSY_SHARE = 0.9
+
+def busy_loop(stop):
+    """Spin on the CPU until stopped"""
+    total = 0
+    while not stop.is_set():
+        total += sum(range(1000))
+    return total
+
+def occasional_logging(stop):
+    """Wake the log listener now and then, as request logging does"""
+    while not stop.is_set():
+        logging.warning("profiler test tick")
+        time.sleep(0.05)
+
+def main():
+    """Profile a busy-loop thread next to the queued log listener and a sleeping thread"""
+    print("🔬 DeenBot Sampling Profiler Test")
+    print("=" * 60)
+
+    profile_dir = tempfile.mkdtemp(prefix='deenbot-profile-test-')
+    # The listener is stopped and flushed at exit
+    setup_logging(log_file=os.path.join(profile_dir, 'test.log'), level=logging.WARNING)
+
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=busy_loop, args=(stop,), name='busy-loop', daemon=True),
+        threading.Thread(target=occasional_logging, args=(stop,), name='occasional-logging', daemon=True),
+        threading.Thread(target=stop.wait, name='sleeper', daemon=True)
+    ]
+    for thread in threads:
+        thread.start()
+
+    profiler = SamplingProfiler(profile_dir=profile_dir)
+    profiler.start(PROFILE_SECONDS)
+    profiler.thread.join()
+    stop.set()
+
+    result = profiler.last_result
+    with open(result['collapsed_file'], 'r', encoding='utf-8') as f:
+        lines = [line.rsplit(' ', 1) for line in f.read().splitlines()]
+    total = sum(int(count) for _, count in lines)
+    busy = sum(int(count) for stack, count in lines if 'busy_loop' in stack)
+    listener_stacks = [stack for stack, _ in lines if 'dequeue' in stack or '_monitor' in stack]
+
+    share = busy / max(total, 1)
+    print(f"📊 {total} samples, {result['idle_samples']} idle; busy loop {share * 100:.1f}%")
+    print(f"📊 Top self: {[entry['function'] for entry in result['top_self'][:3]]}")
+
+    passed = True
+    if share < MIN_BUSY_SHARE:
+        print(f"❌ Busy loop has {share * 100:.1f}% of samples, expected at least {MIN_BUSY_SHARE * 100:.0f}%")
+        passed = False
+    else:
+        print("✅ Busy loop dominates the collapsed stacks")
+    if listener_stacks:
+        print(f"❌ Log listener sampled as running: {listener_stacks[0]}")
+        passed = False
+    else:
+        print("✅ Log listener does not appear")
+    return passed
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
@@ -4,13 +4,31 @@ DeenBot Training Script - Improve AI responses through supervised learning
 This script helps train the DeenBot by collecting feedback and improving responses
 """
 
+import os
+import csv
+import sys
 import json
-import sqlite3
+import time
 import logging
+import argparse
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Tuple
 import random
 
+from learning_database import LearningDatabase
+
+# Rows per executemany() call during bulk imports
+IMPORT_BATCH_SIZE = 5000
+
+# Accepted field names for each training_examples column in import files
+IMPORT_FIELDS = {
+    "input_message": ("input_message", "input", "question"),
+    "expected_response": ("expected_response", "response", "answer"),
+    "response_type": ("response_type", "type"),
+    "category": ("category",),
+    "difficulty_level": ("difficulty_level", "difficulty"),
+}
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -22,53 +40,15 @@ class DeenBotTrainer:
     
     def __init__(self, db_path: str = "deenbot_learning.db"):
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        # Same tuned WAL connection setup as the backend, so training runs do not block live learning writes
+        self.db = LearningDatabase(db_path)
+        self.conn = self.db.connection()
         self.cursor = self.conn.cursor()
         self._create_training_tables()
     
     def _create_training_tables(self):
-        """Create tables for training data"""
-        # Training examples table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS training_examples (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                input_message TEXT NOT NULL,
-                expected_response TEXT NOT NULL,
-                response_type TEXT NOT NULL,
-                category TEXT NOT NULL,
-                difficulty_level INTEGER DEFAULT 1,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                usage_count INTEGER DEFAULT 0,
-                success_rate REAL DEFAULT 0.0
-            )
-        ''')
-        
-        # Feedback table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_feedback (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                conversation_id INTEGER,
-                user_rating INTEGER CHECK (user_rating >= 1 AND user_rating <= 5),
-                feedback_text TEXT,
-                improvement_suggestions TEXT,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (conversation_id) REFERENCES conversations (id)
-            )
-        ''')
-        
-        # Response improvements table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS response_improvements (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                original_response TEXT,
-                improved_response TEXT,
-                improvement_reason TEXT,
-                applied_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                effectiveness_improvement REAL
-            )
-        ''')
-        
-        self.conn.commit()
+        """Create tables for training data and the rollups reports read from"""
+        self.db.migrate()
         logging.info("✅ Training tables created")
     
     def add_training_example(self, input_message: str, expected_response: str, 
@@ -76,13 +56,16 @@ class DeenBotTrainer:
         """Add a new training example"""
         try:
             self.cursor.execute('''
-                INSERT INTO training_examples 
+                INSERT OR IGNORE INTO training_examples 
                 (input_message, expected_response, response_type, category, difficulty_level)
                 VALUES (?, ?, ?, ?, ?)
-            ''', (input_message, expected_response, response_type, category, difficulty_level))
+            ''', (normalize_input(input_message), expected_response, response_type, category, difficulty_level))
             
             self.conn.commit()
-            logging.info(f"✅ Added training example for category: {category}")
+            if self.cursor.rowcount == 0:
+                logging.info(f"ℹ️ Training example already exists: {input_message[:50]}")
+            else:
+                logging.info(f"✅ Added training example for category: {category}")
             return True
         except Exception as e:
             logging.error(f"❌ Failed to add training example: {e}")
@@ -151,43 +134,67 @@ class DeenBotTrainer:
             return []
     
     def get_feedback_analysis(self) -> Dict:
-        """Analyze user feedback to identify improvement areas"""
+        """Analyze user feedback to identify improvement areas
+        
+        Reads the trigger-maintained rating histogram and suggestion counts
+        rather than scanning user_feedback.
+        """
         try:
-            # Overall rating statistics
+            # Overall rating statistics (rating 0 counts feedback without a rating)
             self.cursor.execute('''
                 SELECT 
-                    AVG(user_rating) as avg_rating,
-                    COUNT(*) as total_feedback,
-                    COUNT(CASE WHEN user_rating >= 4 THEN 1 END) as positive_feedback,
-                    COUNT(CASE WHEN user_rating <= 2 THEN 1 END) as negative_feedback
-                FROM user_feedback
+                    SUM(feedback) as total_feedback,
+                    SUM(CASE WHEN rating > 0 THEN rating * feedback END) as rating_sum,
+                    SUM(CASE WHEN rating > 0 THEN feedback END) as rated_feedback,
+                    SUM(CASE WHEN rating >= 4 THEN feedback END) as positive_feedback,
+                    SUM(CASE WHEN rating BETWEEN 1 AND 2 THEN feedback END) as negative_feedback
+                FROM feedback_rating_daily
             ''')
             
-            rating_stats = self.cursor.fetchone()
+            total, rating_sum, rated, positive, negative = (value or 0 for value in self.cursor.fetchone())
             
             # Common improvement suggestions
             self.cursor.execute('''
-                SELECT improvement_suggestions, COUNT(*) as count
-                FROM user_feedback 
-                WHERE improvement_suggestions IS NOT NULL AND improvement_suggestions != ''
-                GROUP BY improvement_suggestions
-                ORDER BY count DESC
+                SELECT suggestion, feedback
+                FROM feedback_suggestions 
+                WHERE feedback > 0
+                ORDER BY feedback DESC
                 LIMIT 10
             ''')
             
             improvement_suggestions = self.cursor.fetchall()
             
             return {
-                "average_rating": round(rating_stats[0] or 0, 2),
-                "total_feedback": rating_stats[1],
-                "positive_feedback_percentage": round((rating_stats[2] / rating_stats[1] * 100) if rating_stats[1] > 0 else 0, 1),
-                "negative_feedback_percentage": round((rating_stats[3] / rating_stats[1] * 100) if rating_stats[1] > 0 else 0, 1),
+                "average_rating": round(rating_sum / rated if rated else 0, 2),
+                "total_feedback": total,
+                "positive_feedback_percentage": round((positive / total * 100) if total > 0 else 0, 1),
+                "negative_feedback_percentage": round((negative / total * 100) if total > 0 else 0, 1),
                 "top_improvement_suggestions": improvement_suggestions
             }
         except Exception as e:
             logging.error(f"❌ Failed to analyze feedback: {e}")
             return {"error": str(e)}
     
+    def get_daily_ratings(self, days: int = None) -> List[Dict]:
+        """Per-day rating histograms, newest day first"""
+        try:
+            query = 'SELECT day, rating, feedback FROM feedback_rating_daily WHERE feedback > 0'
+            params = ()
+            if days:
+                query += ' AND day >= ?'
+                params = ((datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d'),)
+            self.cursor.execute(query + ' ORDER BY day DESC, rating', params)
+            
+            daily = {}
+            for day, rating, count in self.cursor.fetchall():
+                entry = daily.setdefault(day, {"day": day or None, "total_feedback": 0, "ratings": {}})
+                entry["total_feedback"] += count
+                entry["ratings"][str(rating) if rating else "unrated"] = count
+            return list(daily.values())
+        except Exception as e:
+            logging.error(f"❌ Failed to get daily ratings: {e}")
+            return []
+    
     def generate_training_examples(self):
         """Generate comprehensive training examples for common scenarios"""
         training_data = [
@@ -247,55 +254,112 @@ class DeenBotTrainer:
             }
         ]
         
-        for example in training_data:
-            self.add_training_example(
-                example["input"],
-                example["response"],
-                example["type"],
-                example["category"],
-                example["difficulty"]
-            )
+        result = self.import_training_examples(training_data, progress=False)
+        
+        logging.info(f"✅ Generated {len(training_data)} training examples ({result['inserted']} new)")
+    
+    def import_training_examples(self, examples: Iterable[Dict], batch_size: int = IMPORT_BATCH_SIZE,
+                                 progress=True) -> Dict:
+        """Bulk-insert training examples in a single transaction
+        
+        examples is any iterable of dicts (see IMPORT_FIELDS for accepted
+        keys), consumed lazily in batches of executemany(). Inputs that already
+        exist, in the table or earlier in the same import, are skipped. progress
+        is True to log after every batch, a callable receiving the running
+        counts, or False. Nothing is written if the import fails.
+        """
+        counts = {"read": 0, "inserted": 0, "duplicates": 0, "invalid": 0}
+        started = time.perf_counter()
+        
+        def measure():
+            elapsed = time.perf_counter() - started
+            counts["seconds"] = round(elapsed, 3)
+            counts["rows_per_second"] = round(counts["read"] / elapsed) if elapsed > 0 else 0
+        
+        def report():
+            measure()
+            if callable(progress):
+                progress(dict(counts))
+            elif progress:
+                logging.info(f"📥 Imported {counts['inserted']:,} of {counts['read']:,} examples "
+                             f"({counts['duplicates']:,} duplicates, {counts['invalid']:,} invalid, "
+                             f"{counts['rows_per_second']:,} rows/s)")
         
-        logging.info(f"✅ Generated {len(training_data)} training examples")
+        def insert(batch):
+            changes = self.conn.total_changes
+            self.conn.executemany('''
+                INSERT OR IGNORE INTO training_examples 
+                (input_message, expected_response, response_type, category, difficulty_level)
+                VALUES (?, ?, ?, ?, ?)
+            ''', batch)
+            inserted = self.conn.total_changes - changes
+            counts["inserted"] += inserted
+            counts["duplicates"] += len(batch) - inserted
+            report()
+        
+        with self.db.transaction():
+            batch = []
+            for example in examples:
+                counts["read"] += 1
+                row = training_row(example)
+                if row is None:
+                    counts["invalid"] += 1
+                    continue
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    insert(batch)
+                    batch = []
+            if batch:
+                insert(batch)
+        measure()
+        return counts
+    
+    def import_training_file(self, path: str, batch_size: int = IMPORT_BATCH_SIZE, progress=True) -> Dict:
+        """Stream a JSON lines or CSV file of training examples into the database"""
+        logging.info(f"📂 Importing training examples from {path}")
+        counts = self.import_training_examples(read_training_file(path), batch_size, progress)
+        logging.info(f"✅ Imported {counts['inserted']:,} new training examples from {path} "
+                     f"in {counts['seconds']:.2f}s")
+        return counts
     
     def analyze_response_quality(self) -> Dict:
-        """Analyze the quality of responses based on training data"""
+        """Analyze the quality of responses based on training data
+        
+        Reads the trigger-maintained quality counters and per-response_type
+        pattern totals rather than scanning conversations and learned_patterns.
+        """
         try:
-            # Get response effectiveness from conversations
+            # Response effectiveness from conversations
             self.cursor.execute('''
-                SELECT 
-                    COUNT(*) as total_responses,
-                    AVG(effectiveness_score) as avg_effectiveness,
-                    COUNT(CASE WHEN effectiveness_score >= 0.8 THEN 1 END) as high_quality,
-                    COUNT(CASE WHEN effectiveness_score <= 0.5 THEN 1 END) as low_quality
-                FROM conversations 
-                WHERE effectiveness_score IS NOT NULL
+                SELECT responses, score_sum, high_quality, low_quality
+                FROM response_quality_stats 
+                WHERE id = 1
             ''')
             
-            quality_stats = self.cursor.fetchone()
+            total, score_sum, high_quality, low_quality = self.cursor.fetchone() or (0, 0.0, 0, 0)
             
-            # Get pattern usage statistics
+            # Pattern usage statistics
             self.cursor.execute('''
                 SELECT 
-                    response_type,
-                    AVG(effectiveness) as avg_effectiveness,
-                    COUNT(*) as usage_count
-                FROM learned_patterns 
-                GROUP BY response_type
+                    NULLIF(response_type, '') as response_type,
+                    effectiveness_sum / NULLIF(effectiveness_count, 0) as avg_effectiveness,
+                    patterns as usage_count
+                FROM pattern_type_stats 
+                WHERE patterns > 0
                 ORDER BY avg_effectiveness DESC
             ''')
             
             pattern_stats = self.cursor.fetchall()
             
             return {
-                "total_responses": quality_stats[0],
-                "average_effectiveness": round(quality_stats[1] or 0, 2),
-                "high_quality_percentage": round((quality_stats[2] / quality_stats[0] * 100) if quality_stats[0] > 0 else 0, 1),
-                "low_quality_percentage": round((quality_stats[3] / quality_stats[0] * 100) if quality_stats[0] > 0 else 0, 1),
+                "total_responses": total,
+                "average_effectiveness": round(score_sum / total if total else 0, 2),
+                "high_quality_percentage": round((high_quality / total * 100) if total > 0 else 0, 1),
+                "low_quality_percentage": round((low_quality / total * 100) if total > 0 else 0, 1),
                 "pattern_effectiveness": [
                     {
                         "type": row[0],
-                        "avg_effectiveness": round(row[1], 2),
+                        "avg_effectiveness": round(row[1] or 0, 2),
                         "usage_count": row[2]
                     }
                     for row in pattern_stats
@@ -305,39 +369,113 @@ class DeenBotTrainer:
             logging.error(f"❌ Failed to analyze response quality: {e}")
             return {"error": str(e)}
     
-    def export_training_data(self, filename: str = "deenbot_training_data.json"):
-        """Export training data for external analysis"""
+    def export_training_data(self, filename: str = "deenbot_training_data.jsonl", limit: int = None):
+        """Export training data for external analysis as JSON lines
+        
+        One object per line, each tagged with its "record" kind: an export
+        header, the feedback and quality analyses, per-day rating histograms,
+        then every training example (or the best `limit`). Examples are
+        streamed from the cursor, so memory use does not grow with the table.
+        """
+        temp_filename = f"{filename}.tmp"
         try:
-            training_data = self.get_training_data(limit=1000)
-            feedback_analysis = self.get_feedback_analysis()
-            quality_analysis = self.analyze_response_quality()
-            
-            export_data = {
-                "export_timestamp": datetime.now().isoformat(),
-                "training_examples": training_data,
-                "feedback_analysis": feedback_analysis,
-                "quality_analysis": quality_analysis
-            }
+            query = 'SELECT * FROM training_examples ORDER BY success_rate DESC, usage_count DESC'
+            params = ()
+            if limit:
+                query += ' LIMIT ?'
+                params = (limit,)
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
+            examples = 0
+            with open(temp_filename, 'w', encoding='utf-8') as f:
+                def write(record, data):
+                    f.write(json.dumps({"record": record, **data}, ensure_ascii=False))
+                    f.write('\n')
+                
+                write("export", {"export_timestamp": datetime.now().isoformat()})
+                write("feedback_analysis", self.get_feedback_analysis())
+                write("quality_analysis", self.analyze_response_quality())
+                for day in self.get_daily_ratings():
+                    write("daily_ratings", day)
+                
+                cursor = self.conn.execute(query, params)
+                columns = [description[0] for description in cursor.description]
+                for row in cursor:
+                    write("training_example", dict(zip(columns, row)))
+                    examples += 1
+            os.replace(temp_filename, filename)
             
-            logging.info(f"✅ Training data exported to {filename}")
+            logging.info(f"✅ Training data exported to {filename} ({examples} examples)")
             return True
         except Exception as e:
             logging.error(f"❌ Failed to export training data: {e}")
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
             return False
     
     def close(self):
         """Close database connection"""
-        self.conn.close()
+        self.db.close()
+
+def normalize_input(text: str) -> str:
+    """Input message with surrounding and repeated whitespace collapsed
+    
+    Duplicates are detected on lower(trim(input_message)) by a unique index,
+    so storing normalized text makes the match whitespace- and case-insensitive.
+    """
+    return ' '.join(str(text).split())
+
+def read_training_file(path: str) -> Iterator[Dict]:
+    """Stream training examples from a JSON lines (.jsonl) or CSV (.csv) file"""
+    with open(path, encoding='utf-8', newline='') as f:
+        if path.lower().endswith('.csv'):
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def training_row(example: Dict, default_type: str = "general", default_category: str = "general"):
+    """training_examples row tuple for an import record, or None if it is unusable"""
+    values = {}
+    for column, names in IMPORT_FIELDS.items():
+        values[column] = next((example[name] for name in names if example.get(name) not in (None, "")), None)
+    input_message = normalize_input(values["input_message"] or "")
+    expected_response = str(values["expected_response"] or "").strip()
+    if not input_message or not expected_response:
+        return None
+    try:
+        difficulty = int(values["difficulty_level"] or 1)
+    except (TypeError, ValueError):
+        difficulty = 1
+    return (input_message, expected_response, values["response_type"] or default_type,
+            values["category"] or default_category, difficulty)
 
 def main():
     """Main training function"""
+    parser = argparse.ArgumentParser(description="Train DeenBot from generated examples and user feedback")
+    parser.add_argument('--db', default="deenbot_learning.db", help="learning database")
+    parser.add_argument('--import', dest='import_files', nargs='+', metavar='FILE',
+                        help="bulk-import training examples from JSON lines (.jsonl) or CSV files and exit")
+    parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE, help="rows per insert batch")
+    args = parser.parse_args()
+    
     print("🚀 DeenBot Training System")
     print("=" * 50)
     
-    trainer = DeenBotTrainer()
+    trainer = DeenBotTrainer(args.db)
+    
+    if args.import_files:
+        try:
+            for path in args.import_files:
+                counts = trainer.import_training_file(path, max(args.batch_size, 1))
+                print(f"📥 {path}: {counts['inserted']:,} new, {counts['duplicates']:,} duplicates, "
+                      f"{counts['invalid']:,} invalid ({counts['rows_per_second']:,} rows/s)")
+            return 0
+        except Exception as e:
+            logging.error(f"❌ Import failed: {e}")
+            return 1
+        finally:
+            trainer.close()
     
     try:
         # Generate training examples
@@ -373,4 +511,4 @@ def main():
         trainer.close()
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
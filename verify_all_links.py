@@ -7,121 +7,22 @@ This script verifies that all links in the application work properly
 and lead to fully populated content with the correct design.
 """
 
-import os
-import re
-from pathlib import Path
-import requests
-from urllib.parse import urljoin, urlparse
+import argparse
+from link_graph import build_link_graph
+from external_link_checker import (add_external_check_arguments, external_check_options,
+                                   run_external_link_check, print_report_summary)
 
-def get_all_html_files():
-    """Get all HTML files in the current directory"""
-    html_files = []
-    for file in os.listdir('.'):
-        if file.endswith('.html'):
-            html_files.append(file)
-    return html_files
-
-def extract_links_from_file(filename):
-    """Extract all href links from an HTML file"""
-    links = []
-    try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        # Find all href attributes
-        href_pattern = r'href=["\']([^"\']+)["\']'
-        matches = re.findall(href_pattern, content)
-        
-        for match in matches:
-            if match.startswith('http'):
-                links.append(('external', match))
-            elif match.startswith('#'):
-                links.append(('anchor', match))
-            elif match.startswith('mailto:'):
-                links.append(('email', match))
-            elif match.startswith('tel:'):
-                links.append(('phone', match))
-            else:
-                links.append(('internal', match))
-                
-    except Exception as e:
-        print(f"Error reading {filename}: {e}")
-        
-    return links
-
-def verify_file_exists(filename):
-    """Verify if a file exists and has content"""
-    if not os.path.exists(filename):
-        return False, "File does not exist"
-    
-    try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        if len(content.strip()) == 0:
-            return False, "File is empty"
-            
-        # Check if file has proper HTML structure
-        if '<!DOCTYPE html>' not in content:
-            return False, "Not a valid HTML file"
-            
-        # Check if file has the correct design (CSS variables)
-        if '--bg-primary: #0a0f0f' not in content:
-            return False, "Does not have correct design (CSS variables missing)"
-            
-        # Check if file has content beyond just HTML structure
-        if len(content) < 1000:
-            return False, "File has minimal content"
-            
-        return True, "File exists and has proper content"
-        
-    except Exception as e:
-        return False, f"Error reading file: {e}"
-
-def verify_design_compliance(filename):
-    """Verify that a file follows the exact design policy"""
-    try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        # Check for required CSS variables
-        required_vars = [
-            '--bg-primary: #0a0f0f',
-            '--accent-primary: #10b981',
-            '--text-primary: #ffffff'
-        ]
-        
-        for var in required_vars:
-            if var not in content:
-                return False, f"Missing required CSS variable: {var}"
-        
-        # Check for correct font family
-        if "'Georgia', 'Times New Roman', serif" not in content:
-            return False, "Incorrect font family"
-            
-        # Check for theme toggle functionality
-        if 'toggleTheme()' not in content:
-            return False, "Missing theme toggle functionality"
-            
-        # Check for back link to main index (skip for main index page itself)
-        if filename != 'complete-islamic-study-guide-dark.html' and 'complete-islamic-study-guide-dark.html' not in content:
-            return False, "Missing back link to main index"
-            
-        return True, "Design compliance verified"
-        
-    except Exception as e:
-        return False, f"Error checking design compliance: {e}"
-
-def main():
+def main(external_options=None, report_path=None):
     """Main function to verify all links"""
     print("🔍 COMPREHENSIVE LINK VERIFICATION")
     print("Complete Islamic Study Guide Extended Edition")
     print("=" * 60)
     
-    # Get all HTML files
-    html_files = get_all_html_files()
+    # Index every page once; all checks below are answered from the graph
+    graph = build_link_graph()
+    html_files = list(graph.pages)
     
-    print(f"📊 Found {len(html_files)} HTML files to verify")
+    print(f"📊 Found {len(html_files)} HTML files to verify ({graph.files_read} read, rest cached)")
     print()
     
     # Track verification results
@@ -134,36 +35,34 @@ def main():
     for filename in html_files:
         print(f"🔍 Verifying: {filename}")
         
-        # Extract links from file
-        links = extract_links_from_file(filename)
-        total_links += len([l for l in links if l[0] == 'internal'])
+        # Links extracted during indexing
+        internal_links = graph.internal_links(filename)
+        total_links += len([l for l in graph.pages[filename]['links'] if l[0] == 'internal'])
         
         # Verify file exists and has content
-        exists, message = verify_file_exists(filename)
+        exists, message = graph.check_target(filename)
         if not exists:
             print(f"   ❌ File issue: {message}")
             broken_links += 1
             continue
             
         # Verify design compliance
-        design_ok, design_message = verify_design_compliance(filename)
-        if not design_ok:
-            print(f"   ⚠️  Design violation: {design_message}")
+        record = graph.pages[filename]
+        if not record['design_ok']:
+            print(f"   ⚠️  Design violation: {record['design_message']}")
             design_violations += 1
         else:
             print(f"   ✅ Design compliance: OK")
             
         # Verify internal links
-        internal_links = [l for l in links if l[0] == 'internal']
-        for link_type, link in internal_links:
-            if link.endswith('.html'):
-                target_exists, target_message = verify_file_exists(link)
-                if target_exists:
-                    working_links += 1
-                    print(f"      ✅ Link: {link} - Working")
-                else:
-                    broken_links += 1
-                    print(f"      ❌ Link: {link} - {target_message}")
+        for link in internal_links:
+            target_exists, target_message = graph.check_target(link)
+            if target_exists:
+                working_links += 1
+                print(f"      ✅ Link: {link} - Working")
+            else:
+                broken_links += 1
+                print(f"      ❌ Link: {link} - {target_message}")
         
         print()
     
@@ -187,8 +86,18 @@ def main():
         print("❌ Some links are broken or files have issues.")
         print("🔧 These need to be fixed before deployment.")
     
+    # Optional concurrent check of outbound references
+    if external_options is not None:
+        print()
+        print_report_summary(run_external_link_check('.', report_path, **external_options), report_path)
+    
     print()
     print("🔍 Verification complete!")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Verify all links in the application")
+    parser.add_argument('--external', action='store_true', help="also check external links concurrently")
+    add_external_check_arguments(parser)
+    args = parser.parse_args()
+    
+    main(external_check_options(args) if args.external else None, args.report)